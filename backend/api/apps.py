@@ -8,6 +8,8 @@ class YourAppConfig(AppConfig):
     name = "api"
 
     def ready(self):
+        from . import checks, signals  # noqa: F401  (registers checks and receivers)
+
         User = get_user_model()
         def create_default_admin(sender, **kwargs):
             if not User.objects.filter(email="alumni@karpagam.com").exists():
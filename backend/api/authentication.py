@@ -1,4 +1,47 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
 from rest_framework.authentication import TokenAuthentication
 
+from . import signed_tokens
+from .token_cache import token_cache, user_cache
+
+
+def resolve_signed_token(key):
+    """
+    Verify a signed token and load its user without a token lookup.
+
+    Returns:
+        ``(user, SignedToken)``
+
+    Raises:
+        SignedTokenError: if the token or its user must be rejected
+    """
+    token = signed_tokens.verify(key)
+    user = user_cache.get(token.user_id)
+    if user is None or not user.is_active:
+        raise signed_tokens.SignedTokenError("User inactive or deleted.")
+    if user.role != token.role:
+        # Role changes force a fresh login.
+        raise signed_tokens.SignedTokenError("Token revoked.")
+    return user, token
+
+
 class CustomTokenAuthentication(TokenAuthentication):
-    keyword = 'Token'
\ No newline at end of file
+    keyword = 'Token'
+
+    def authenticate_credentials(self, key):
+        """Accept signed tokens, or resolve DB tokens through the token cache."""
+        if signed_tokens.is_signed(key):
+            try:
+                return resolve_signed_token(key)
+            except signed_tokens.SignedTokenError as exc:
+                raise exceptions.AuthenticationFailed(str(exc))
+
+        token = token_cache.get(key)
+        if token is None:
+            raise exceptions.AuthenticationFailed(_('Invalid token.'))
+
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+
+        return (token.user, token)
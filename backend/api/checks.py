@@ -0,0 +1,62 @@
+"""
+System checks.
+
+The token cache (``api.token_cache``), signup codes (``api.otp``) and the
+throttles keep state that every worker must see, so their cache aliases must
+not point at a per-process backend. Outside DEBUG they must not use the
+database cache either: it culls entries once ``MAX_ENTRIES`` is reached and
+costs several queries per access, which is the load the cache is there to
+take off the database.
+"""
+
+from django.conf import settings
+from django.core.checks import Error, Tags, Warning, register
+
+PROCESS_LOCAL_BACKENDS = {
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+}
+
+DATABASE_BACKENDS = {
+    "django.core.cache.backends.db.DatabaseCache",
+}
+
+
+def is_shared(alias):
+    """Whether cache ``alias`` is visible to every worker process."""
+    return settings.CACHES.get(alias, {}).get("BACKEND") not in PROCESS_LOCAL_BACKENDS
+
+
+def shared_aliases():
+    from . import otp, token_cache
+
+    return [
+        (token_cache.get_setting("CACHE_ALIAS"), "AUTH_TOKEN_CACHE"),
+        (otp.get_setting("CACHE_ALIAS"), "SIGNUP_OTP"),
+        ("default", "throttling"),
+    ]
+
+
+def uses_database(alias):
+    """Whether cache ``alias`` is the database cache."""
+    return settings.CACHES.get(alias, {}).get("BACKEND") in DATABASE_BACKENDS
+
+
+@register(Tags.caches)
+def check_shared_caches(app_configs, **kwargs):
+    problem = Warning if settings.DEBUG else Error
+    errors = []
+    for alias, user in shared_aliases():
+        if not is_shared(alias):
+            errors.append(problem(
+                f"Cache '{alias}' (used by {user}) is local to each process.",
+                hint="Set REDIS_URL so every worker shares it.",
+                id="api.E001",
+            ))
+        elif uses_database(alias) and not settings.DEBUG:
+            errors.append(Error(
+                f"Cache '{alias}' (used by {user}) is the database cache.",
+                hint="Set REDIS_URL; the database cache is only meant for development.",
+                id="api.E001",
+            ))
+    return errors
@@ -0,0 +1,310 @@
+"""
+Dedupe
+======
+Finds ``CustomUser`` records that are probably the same person. members.csv,
+admin sheets and approved self-signups each create users keyed by email, so
+one alumnus can end up with several accounts under different addresses.
+
+Comparing every pair of 200k members means 2e10 comparisons. Instead, each
+member gets a few blocking keys, and only members that share a key are
+compared:
+
+- ``roll``: roll number and course
+- ``dob_last`` / ``dob_first``: date of birth and the Soundex code of the
+  last / first name
+- ``name_year``: Soundex codes of the first and last names and the course
+  end year
+
+A block larger than ``MAX_BLOCK_SIZE`` (a placeholder roll number, a very
+common name in a large year) carries no signal and would add quadratic
+pairs, so it is skipped and counted.
+
+Candidate pairs are scored in bulk with numpy. The name score is the cosine
+similarity of hashed character-trigram vectors of the full names. It is
+combined with agreement on date of birth, roll number, course and end year
+(a field missing on either side counts as half agreement). Pairs scoring at
+least ``THRESHOLD`` are stored as ``DuplicateCandidate`` rows for review.
+Re-runs refresh pending pairs and keep decided ones.
+"""
+
+import re
+import time
+import unicodedata
+import zlib
+
+import numpy as np
+import pandas as pd
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+
+from .models import DuplicateCandidate
+
+DEFAULTS = {
+    "THRESHOLD": 0.8,
+    "MAX_BLOCK_SIZE": 200,
+    "NGRAM_DIMENSIONS": 256,
+    "BATCH_SIZE": 100_000,
+}
+
+# field -> weight in the final score (sums to 1)
+WEIGHTS = {
+    "name": 0.45,
+    "date_of_birth": 0.25,
+    "roll_no": 0.15,
+    "course": 0.10,
+    "course_end_year": 0.05,
+}
+
+# Order matters: a pair's shared keys are stored as a bit mask over this list.
+BLOCKING_KEYS = ["roll", "dob_last", "dob_first", "name_year"]
+
+HONORIFICS = {"mr", "mrs", "ms", "miss", "dr", "prof", "shri", "smt", "sri"}
+
+USER_FIELDS = ["id", "first_name", "last_name", "name", "date_of_birth", "roll_no", "course", "course_end_year"]
+
+_SOUNDEX_CODES = {
+    **dict.fromkeys("bfpv", "1"), **dict.fromkeys("cgjkqsxz", "2"), **dict.fromkeys("dt", "3"),
+    "l": "4", **dict.fromkeys("mn", "5"), "r": "6",
+}
+
+
+def get_setting(name):
+    return getattr(settings, "DEDUPE", {}).get(name, DEFAULTS[name])
+
+
+def normalize_name(value):
+    """Lowercase ASCII letters only, honorifics dropped: ``"Dr. Émile  O'Neil"`` -> ``"emile o neil"``."""
+    value = unicodedata.normalize("NFKD", value or "").encode("ascii", "ignore").decode().lower()
+    return " ".join(token for token in re.sub(r"[^a-z]+", " ", value).split() if token not in HONORIFICS)
+
+
+def soundex(token):
+    """American Soundex code of one lowercase ASCII word (``""`` for an empty one)."""
+    if not token:
+        return ""
+    code, last = token[0].upper(), _SOUNDEX_CODES.get(token[0], "")
+    for char in token[1:]:
+        digit = _SOUNDEX_CODES.get(char, "")
+        if digit and digit != last:
+            code += digit
+            if len(code) == 4:
+                break
+        # h and w do not separate letters with the same code; vowels do.
+        if char not in "hw":
+            last = digit
+    return code.ljust(4, "0")
+
+
+def load_members(queryset=None):
+    """Read the comparison fields of every user in ``queryset`` into a prepared DataFrame."""
+    queryset = get_user_model().objects.all() if queryset is None else queryset
+    rows = queryset.order_by().values_list(*USER_FIELDS).iterator(chunk_size=5000)
+    return prepare(pd.DataFrame.from_records(rows, columns=USER_FIELDS))
+
+
+def prepare(df):
+    """Add ``full_name``, the normalized comparison columns and one column per blocking key."""
+    df = df.copy()
+    for column in ("first_name", "last_name", "name"):
+        df[column] = df[column].fillna("").astype(str)
+    full = df["name"].where(df["name"].str.strip() != "", df["first_name"] + " " + df["last_name"])
+    df["full_name"] = _map_unique(full, normalize_name)
+
+    tokens = df["full_name"].str.split()
+    first = _map_unique(tokens.str[0].fillna(""), soundex)
+    last = _map_unique(tokens.str[-1].fillna(""), soundex)
+    has_first = first != ""
+    has_last = has_first & (tokens.str.len() > 1)
+
+    for column in ("roll_no", "course", "course_end_year"):
+        text = df[column].fillna("").astype(str).str.strip().str.lower()
+        df[column] = text.where(text != "", None)
+    dob = df["date_of_birth"].astype(str).where(df["date_of_birth"].notna(), None)
+
+    df["roll"] = (df["roll_no"] + "|" + df["course"].fillna("")).where(df["roll_no"].notna(), None)
+    df["dob_last"] = (dob + "|" + last).where(dob.notna() & has_last, None)
+    df["dob_first"] = (dob + "|" + first).where(dob.notna() & has_first, None)
+    df["name_year"] = (first + last + "|" + df["course_end_year"].fillna("")).where(
+        has_last & df["course_end_year"].notna(), None
+    )
+    return df
+
+
+def candidate_pairs(df, max_block_size=None):
+    """
+    Pairs of members sharing at least one blocking key.
+
+    Returns:
+        ``(pairs, skipped_blocks)``: a DataFrame of ``id_a < id_b`` with a
+        ``keys`` bit mask over ``BLOCKING_KEYS``, and the number of oversized
+        blocks left out
+    """
+    max_block_size = max_block_size or get_setting("MAX_BLOCK_SIZE")
+    frames, skipped = [], 0
+    for bit, key in enumerate(BLOCKING_KEYS):
+        block = df.loc[df[key].notna(), ["id", key]]
+        sizes = block[key].map(block[key].value_counts())
+        skipped += int(block.loc[sizes > max_block_size, key].nunique())
+        block = block[(sizes > 1) & (sizes <= max_block_size)]
+        pairs = block.merge(block, on=key, suffixes=("_a", "_b"))
+        pairs = pairs.loc[pairs["id_a"] < pairs["id_b"], ["id_a", "id_b"]]
+        pairs["keys"] = 1 << bit
+        frames.append(pairs)
+
+    pairs = pd.concat(frames, ignore_index=True)
+    if pairs.empty:
+        return pairs, skipped
+    # Each key sets its own bit, so the sum over a pair's rows is its mask.
+    return pairs.groupby(["id_a", "id_b"], as_index=False, sort=False)["keys"].sum(), skipped
+
+
+def score_pairs(df, pairs):
+    """
+    Score ``pairs`` in numpy batches.
+
+    Returns:
+        ``pairs`` with a ``score`` column and one similarity column per
+        ``WEIGHTS`` field
+    """
+    pairs = pairs.copy()
+    positions = pd.Index(df["id"])
+    ia = positions.get_indexer(pairs["id_a"])
+    ib = positions.get_indexer(pairs["id_b"])
+
+    pairs["name"] = _name_similarity(df["full_name"].to_numpy(object), ia, ib)
+    for field in ("date_of_birth", "roll_no", "course", "course_end_year"):
+        values = df[field].to_numpy(object)
+        a, b = values[ia], values[ib]
+        present = pd.notna(a) & pd.notna(b)
+        pairs[field] = np.where(present, (a == b).astype(float), 0.5)
+
+    pairs["score"] = sum(pairs[field] * weight for field, weight in WEIGHTS.items())
+    return pairs
+
+
+def find_duplicates(queryset=None, threshold=None):
+    """
+    Run blocking and scoring over ``queryset`` (all users by default).
+
+    Returns:
+        ``(candidates, stats)``: the scored pairs at or above ``threshold``,
+        best first, and counts and timings for each phase
+    """
+    threshold = get_setting("THRESHOLD") if threshold is None else threshold
+    timings = {}
+
+    started = time.perf_counter()
+    df = load_members(queryset)
+    timings["load"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    pairs, skipped = candidate_pairs(df)
+    timings["blocking"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    scored = score_pairs(df, pairs) if len(pairs) else pairs.assign(score=pd.Series(dtype=float))
+    candidates = scored[scored["score"] >= threshold].sort_values("score", ascending=False)
+    timings["scoring"] = time.perf_counter() - started
+
+    stats = {
+        "members": len(df),
+        "pairs_compared": len(pairs),
+        "skipped_blocks": skipped,
+        "candidates": len(candidates),
+        "seconds": {phase: round(seconds, 2) for phase, seconds in timings.items()},
+    }
+    return candidates, stats
+
+
+def reasons(row):
+    """JSON-ready explanation of one candidate row."""
+    return {
+        "keys": [key for bit, key in enumerate(BLOCKING_KEYS) if int(row.keys) & (1 << bit)],
+        **{field: round(float(getattr(row, field)), 3) for field in WEIGHTS},
+    }
+
+
+def save_candidates(candidates):
+    """
+    Sync the review queue with a ``find_duplicates`` result.
+
+    New pairs are added and pending pairs get their new score. Pending
+    pairs that no longer qualify are removed. Confirmed and dismissed pairs
+    are left as reviewed.
+
+    Returns:
+        ``{"created", "updated", "removed"}`` counts
+    """
+    existing = {
+        (c.user_a_id, c.user_b_id): c
+        for c in DuplicateCandidate.objects.only("id", "user_a_id", "user_b_id", "status")
+    }
+    now = timezone.now()
+    to_create, to_update, found = [], [], set()
+    for row in candidates.itertuples(index=False):
+        pair = (int(row.id_a), int(row.id_b))
+        found.add(pair)
+        candidate = existing.get(pair)
+        if candidate is None:
+            to_create.append(DuplicateCandidate(
+                user_a_id=pair[0], user_b_id=pair[1], score=float(row.score), reasons=reasons(row),
+            ))
+        elif candidate.status == DuplicateCandidate.STATUS_PENDING:
+            candidate.score, candidate.reasons, candidate.updated_at = float(row.score), reasons(row), now
+            to_update.append(candidate)
+    stale = [
+        c.pk for pair, c in existing.items()
+        if pair not in found and c.status == DuplicateCandidate.STATUS_PENDING
+    ]
+
+    with transaction.atomic():
+        DuplicateCandidate.objects.bulk_create(to_create, batch_size=1000)
+        DuplicateCandidate.objects.bulk_update(to_update, ["score", "reasons", "updated_at"], batch_size=1000)
+        for start in range(0, len(stale), 1000):
+            DuplicateCandidate.objects.filter(pk__in=stale[start:start + 1000]).delete()
+    return {"created": len(to_create), "updated": len(to_update), "removed": len(stale)}
+
+
+def _map_unique(series, func):
+    """``series.map(func)``, calling ``func`` once per distinct value."""
+    codes, uniques = pd.factorize(series)
+    mapped = np.array([func(value) for value in uniques], dtype=object)
+    return pd.Series(mapped[codes] if len(uniques) else [], index=series.index, dtype=object)
+
+
+def _trigram_vectors(names):
+    """Hashed character-trigram counts (uint8) and L2 norms for ``names``."""
+    dimensions = get_setting("NGRAM_DIMENSIONS")
+    rows, cols = [], []
+    for row, name in enumerate(names):
+        padded = f"  {name} "
+        for i in range(len(padded) - 2):
+            rows.append(row)
+            cols.append(zlib.crc32(padded[i:i + 3].encode()) % dimensions)
+    counts = np.zeros((len(names), dimensions), dtype=np.uint8)
+    np.add.at(counts, (np.array(rows, dtype=np.int64), np.array(cols, dtype=np.int64)), 1)
+    norms = np.sqrt((counts.astype(np.float32) ** 2).sum(axis=1))
+    return counts, norms
+
+
+def _name_similarity(full_names, ia, ib):
+    """Cosine similarity of the trigram vectors of ``full_names[ia]`` and ``full_names[ib]``."""
+    # Only the names that occur in a pair need a vector.
+    codes, uniques = pd.factorize(np.concatenate([full_names[ia], full_names[ib]]))
+    vectors, norms = _trigram_vectors(uniques)
+    ca, cb = codes[:len(ia)], codes[len(ia):]
+
+    similarity = np.zeros(len(ia), dtype=np.float32)
+    batch_size = get_setting("BATCH_SIZE")
+    for start in range(0, len(ia), batch_size):
+        a = vectors[ca[start:start + batch_size]].astype(np.float32)
+        b = vectors[cb[start:start + batch_size]].astype(np.float32)
+        denominator = norms[ca[start:start + batch_size]] * norms[cb[start:start + batch_size]]
+        dot = np.einsum("ij,ij->i", a, b)
+        similarity[start:start + batch_size] = np.divide(
+            dot, denominator, out=np.zeros_like(dot), where=denominator > 0
+        )
+    # float32 rounding can push identical names just past 1.
+    return np.minimum(similarity, 1.0).astype(np.float64)
@@ -0,0 +1,94 @@
+"""
+Hashing
+=======
+Parallel ``make_password`` for bulk paths (sheet imports, members.csv sync
+and signup approval).
+
+A PBKDF2 hash costs about half a second of one core, which dominates those
+paths. ``hash_passwords`` fans a batch out over a process pool, sized to the
+available cores, and returns the hashes in input order. Batches smaller than
+``PASSWORD_HASHING['INLINE_THRESHOLD']`` are hashed inline, since starting
+or waking the pool would cost more than it saves.
+
+Workers are spawned, not forked, so they never inherit the parent's database
+connections or threads. They only import this module. The parent resolves
+the hasher class, so the workers need no Django settings and honour
+``override_settings`` in tests.
+"""
+
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+from django.conf import settings
+from django.contrib.auth.hashers import get_hasher, make_password
+from django.utils.module_loading import import_string
+
+DEFAULTS = {
+    "WORKERS": None,          # None: one per available core
+    "INLINE_THRESHOLD": 32,
+    "CHUNKSIZE": 8,
+}
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_setting(name):
+    return getattr(settings, "PASSWORD_HASHING", {}).get(name, DEFAULTS[name])
+
+
+def available_cores():
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def create_executor(workers):
+    return ProcessPoolExecutor(max_workers=workers, mp_context=get_context("spawn"))
+
+
+def get_executor():
+    """Return the shared pool, starting it on first use."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = create_executor(get_setting("WORKERS") or available_cores())
+        return _executor
+
+
+def _encode(args):
+    hasher_path, password = args
+    hasher = import_string(hasher_path)()
+    return hasher.encode(password, hasher.salt())
+
+
+def hash_passwords(passwords, executor=None):
+    """
+    Hash every password in ``passwords`` with the default hasher.
+
+    ``executor`` overrides the shared pool (the benchmark sizes its own).
+
+    Returns:
+        A list of encoded hashes, in input order. ``None`` entries get an
+        unusable password, as with ``make_password(None)``.
+    """
+    passwords = list(passwords)
+    single_core = executor is None and (get_setting("WORKERS") or available_cores()) <= 1
+    if single_core or len(passwords) < get_setting("INLINE_THRESHOLD"):
+        return [make_password(password) for password in passwords]
+
+    hasher = get_hasher("default")
+    hasher_path = f"{type(hasher).__module__}.{type(hasher).__qualname__}"
+    indexes = [i for i, password in enumerate(passwords) if password is not None]
+    hashes = [make_password(None) if password is None else None for password in passwords]
+
+    executor = executor or get_executor()
+    encoded = executor.map(
+        _encode, [(hasher_path, passwords[i]) for i in indexes], chunksize=get_setting("CHUNKSIZE")
+    )
+    for i, value in zip(indexes, encoded):
+        hashes[i] = value
+    return hashes
@@ -0,0 +1,208 @@
+"""
+Import Jobs
+===========
+Background runs of the bulk import engines in ``api.importers``.
+
+The upload endpoint only stores the file and an ``ImportJob`` row. The
+``run_import_jobs`` worker claims queued jobs and feeds them to the engine in
+chunks. Each chunk is written in the same transaction that advances
+``ImportJob.checkpoint``, so a crashed run resumes from the last committed
+chunk. A running job whose heartbeat is older than ``STALE_AFTER`` is
+considered abandoned and is picked up again. A run that hits a transient
+database error goes back to the queue, up to ``MAX_RETRIES`` times, and
+resumes the same way; any other error fails the job.
+
+Sheets are streamed (``api.ingest``), never loaded whole. ``result["batches"]``
+records each user-import batch's size in memory and the worker's peak RSS,
+which should stay flat as the file grows.
+"""
+
+import csv
+import io
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import InterfaceError, OperationalError, close_old_connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from . import importers, ingest
+from .models import ImportJob
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    "STALE_AFTER": 30 * 60,
+    "MAX_STORED_ERRORS": 1000,
+    "MAX_RETRIES": 5,
+}
+
+# Lost connections, deadlocks, serialization failures: worth running again.
+TRANSIENT_ERRORS = (OperationalError, InterfaceError)
+
+
+def get_setting(name):
+    return getattr(settings, "IMPORT_JOBS", {}).get(name, DEFAULTS[name])
+
+
+class ImportJobError(Exception):
+    """Raised when a job's file cannot be imported at all."""
+
+
+def create_job(kind, uploaded_file, user=None):
+    return ImportJob.objects.create(kind=kind, file=uploaded_file, created_by=user)
+
+
+def claim_next_job():
+    """Mark the oldest queued (or abandoned) job as running and return it, or None."""
+    stale = timezone.now() - timedelta(seconds=get_setting("STALE_AFTER"))
+    with transaction.atomic():
+        job = (
+            ImportJob.objects
+            .select_for_update(skip_locked=True)
+            .filter(
+                Q(status=ImportJob.STATUS_QUEUED)
+                | Q(status=ImportJob.STATUS_RUNNING, heartbeat_at__lt=stale)
+            )
+            .order_by("created_at", "id")
+            .first()
+        )
+        if job is None:
+            return None
+        now = timezone.now()
+        job.status = ImportJob.STATUS_RUNNING
+        job.started_at = now
+        job.heartbeat_at = now
+        # Throughput is measured over this run only.
+        job.result = dict(job.result, run_started_checkpoint=job.checkpoint)
+        job.save(update_fields=["status", "started_at", "heartbeat_at", "result"])
+    return job
+
+
+def run_job(job):
+    """Process ``job`` from its checkpoint to the end, committing chunk by chunk."""
+    try:
+        if job.kind == ImportJob.KIND_USERS:
+            _run_user_import(job)
+        else:
+            _run_member_sync(job)
+    except Exception as exc:
+        if isinstance(exc, TRANSIENT_ERRORS) and job.result.get("retries", 0) < get_setting("MAX_RETRIES"):
+            _requeue(job, exc)
+        else:
+            logger.exception("Import job %s failed", job.pk)
+            job.status = ImportJob.STATUS_FAILED
+            job.last_error = str(exc)
+            job.finished_at = timezone.now()
+            job.save(update_fields=["status", "last_error", "finished_at"])
+        return
+
+    job.status = ImportJob.STATUS_DONE
+    job.missing_count = importers.count_missing(job.kind, _run_id(job))
+    job.finished_at = timezone.now()
+    job.save(update_fields=["status", "missing_count", "finished_at"])
+
+
+def _requeue(job, exc):
+    """Put ``job`` back in the queue; the next run resumes from its checkpoint."""
+    logger.warning("Import job %s hit a transient error; requeued", job.pk, exc_info=True)
+    close_old_connections()
+    # The failed chunk was rolled back; drop what it left on the instance.
+    job.refresh_from_db()
+    job.status = ImportJob.STATUS_QUEUED
+    job.last_error = str(exc)
+    job.result = dict(job.result, retries=job.result.get("retries", 0) + 1)
+    job.save(update_fields=["status", "last_error", "result"])
+
+
+def _run_id(job):
+    # Stable across resumes, so rows committed before a crash still count as seen.
+    return f"job-{job.pk}"
+
+
+def _commit_chunk(job, rows, created=0, updated=0, unchanged=0, errors=()):
+    """Advance the checkpoint; call inside the chunk's transaction."""
+    job.checkpoint += rows
+    job.created_count += created
+    job.updated_count += updated
+    job.unchanged_count += unchanged
+    job.error_count += len(errors)
+    room = get_setting("MAX_STORED_ERRORS") - len(job.errors)
+    if room > 0:
+        job.errors = job.errors + list(errors)[:room]
+    job.heartbeat_at = timezone.now()
+    job.save(update_fields=[
+        "checkpoint", "created_count", "updated_count", "unchanged_count", "error_count", "errors", "result",
+        "heartbeat_at",
+    ])
+
+
+def _run_user_import(job):
+    extension = job.file.name.rsplit(".", 1)[-1].lower()
+    with job.file.open("rb") as fh:
+        missing = importers.missing_columns(ingest.read_header(fh, extension))
+        if missing:
+            raise ImportJobError(f"Missing required columns: {', '.join(missing)}")
+        job.rows_total = ingest.count_rows(fh, extension)
+        job.save(update_fields=["rows_total"])
+
+        # Rows committed before a crash still claim their email and username.
+        claimed_emails, claimed_usernames = importers.claimed_by_run(importers.SOURCE_USERS, _run_id(job))
+        batches = ingest.iter_batches(fh, extension, importers.get_setting("CHUNK_SIZE"), skip=job.checkpoint)
+        for batch in batches:
+            with transaction.atomic():
+                created, updated, unchanged, errors = importers.import_user_chunk(
+                    batch, job.checkpoint, claimed_emails, claimed_usernames, _run_id(job)
+                )
+                job.result = dict(job.result, batches=job.result.get("batches", []) + [ingest.batch_memory(batch)])
+                _commit_chunk(job, len(batch), created=created, updated=updated, unchanged=unchanged, errors=errors)
+
+
+def _run_member_sync(job):
+    with job.file.open("rb") as fh:
+        text = io.TextIOWrapper(fh, encoding="utf-8", newline="")
+        job.rows_total = sum(1 for _ in csv.DictReader(text))
+        job.save(update_fields=["rows_total"])
+        text.seek(0)
+        for chunk in importers.iter_member_chunks(text, skip=job.checkpoint):
+            created, updated, skipped = [], [], []
+            with transaction.atomic():
+                unchanged = importers.sync_member_chunk(chunk, created, updated, skipped, _run_id(job))
+                _commit_chunk(
+                    job, len(chunk), created=len(created), updated=len(updated), unchanged=unchanged, errors=skipped
+                )
+        text.detach()
+
+
+def progress(job):
+    """Status payload for the import-jobs endpoints."""
+    run_rows = job.checkpoint - job.result.get("run_started_checkpoint", 0)
+    elapsed = None
+    if job.started_at and job.heartbeat_at:
+        end = job.finished_at or job.heartbeat_at
+        elapsed = max((end - job.started_at).total_seconds(), 0)
+    throughput = round(run_rows / elapsed, 2) if elapsed else None
+    eta = None
+    if throughput and job.rows_total is not None and job.status == ImportJob.STATUS_RUNNING:
+        eta = round((job.rows_total - job.checkpoint) / throughput)
+    return {
+        "job_id": job.pk,
+        "kind": job.kind,
+        "status": job.status,
+        "rows_total": job.rows_total,
+        "rows_done": job.checkpoint,
+        "created": job.created_count,
+        "updated": job.updated_count,
+        "unchanged": job.unchanged_count,
+        "missing": job.missing_count,
+        "error_count": job.error_count,
+        "errors": job.errors,
+        "last_error": job.last_error,
+        "rows_per_second": throughput,
+        "eta_seconds": eta,
+        "result": {k: v for k, v in job.result.items() if k != "run_started_checkpoint"},
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+    }
@@ -0,0 +1,660 @@
+"""
+Importers
+=========
+Bulk engines behind ``UserBulkImportView`` and ``ImportMembersAPIView``.
+
+``import_users`` (uploaded sheets)
+----------------------------------
+The sheet arrives as a stream of batches of ``USER_IMPORT['CHUNK_SIZE']``
+rows (``api.ingest``). Instead of walking each batch with ``iterrows()``,
+every column is normalized and validated with vectorized pandas operations
+(one ``to_datetime`` pass per accepted date format). Each batch then runs
+one ``IN`` query for existing emails, one for existing usernames, and a
+``bulk_create``.
+
+The per-row error report matches the old row-by-row import: the same
+messages, one per rejected row, in sheet order, with rows numbered from 1.
+
+``sync_members`` (members.csv)
+------------------------------
+A chunked upsert keyed by email. Each chunk prefetches its existing users
+with one ``in_bulk`` query and splits the rows into creates and updates.
+Creates go through ``bulk_create`` (an ``ON CONFLICT`` upsert where the
+backend supports one), updates through ``bulk_update``. A password is only
+re-hashed when the date of birth it is derived from has changed.
+
+Both engines hash a chunk's passwords together through ``api.hashing``, and
+refresh the full-text documents (``api.search``) of the users a chunk wrote
+with one ``UPDATE``.
+
+Fingerprints
+------------
+Each imported row stores a SHA-256 of its normalized values in
+``ImportFingerprint``, keyed by source and email. When the same sheet is
+uploaded again, rows with a matching fingerprint are counted as unchanged
+and never written or re-hashed. A sheet row whose user was created by an
+earlier sheet import is updated when its fingerprint changed (its password
+is left alone); any other existing email is still rejected. Every row present in the file is stamped
+with the run id, and rows imported earlier but absent from this run are
+reported as missing (they are not deleted).
+"""
+
+import csv
+import hashlib
+import json
+import uuid
+from itertools import islice
+
+import pandas as pd
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.contrib.auth import get_user_model
+from django.db import DataError, IntegrityError, connection, transaction
+from django.utils import timezone
+
+from . import search
+from .hashing import hash_passwords
+from .models import ImportFingerprint, ImportJob, normalize_tags
+
+DEFAULTS = {
+    "CHUNK_SIZE": 1000,
+}
+
+EXPECTED_COLUMNS = [
+    'username', 'email', 'first_name', 'last_name', 'salutation', 'gender', 'date_of_birth',
+    'current_work', 'Roles Played', 'experience', 'chapter', 'college_name', 'phone', 'Address',
+    'city', 'State', 'Country', 'zip_code', 'role', 'Course End Year', 'worked_In'
+]
+
+# model field -> sheet column, for plain stripped text
+TEXT_COLUMNS = {
+    'first_name': 'first_name',
+    'last_name': 'last_name',
+    'salutation': 'salutation',
+    'gender': 'gender',
+    'current_work': 'current_work',
+    'chapter': 'chapter',
+    'college_name': 'college_name',
+    'phone': 'phone',
+    'Address': 'Address',
+    'city': 'city',
+    'state': 'State',
+    'country': 'Country',
+    'zip_code': 'zip_code',
+    'role': 'role',
+    'course_end_year': 'Course End Year',
+}
+
+# model field -> sheet column, for comma-separated lists
+LIST_COLUMNS = {
+    'roles_played': 'Roles Played',
+    'Worked_in': 'worked_In',
+}
+
+# Normalized values hashed into a sheet row's fingerprint (the username is
+# only used when the row creates its user).
+USER_FINGERPRINT_FIELDS = [*TEXT_COLUMNS, *LIST_COLUMNS, 'date_of_birth', 'experience']
+
+SOURCE_USERS = ImportJob.KIND_USERS
+SOURCE_MEMBERS = ImportJob.KIND_MEMBERS
+
+DOB_FORMATS = ["%m/%d/%Y", "%m/%d/%y"]
+DEFAULT_PASSWORD = "defaultpassword123"
+
+# Errors a single bad row can cause. Anything else (a lost connection, a lock
+# timeout) fails every row alike, so it propagates instead of being retried
+# row by row; import jobs requeue those (see api.import_jobs).
+ROW_ERRORS = (IntegrityError, DataError)
+
+
+def get_setting(name):
+    return getattr(settings, "USER_IMPORT", {}).get(name, DEFAULTS[name])
+
+
+def new_run():
+    return uuid.uuid4().hex
+
+
+def fingerprint(values):
+    """SHA-256 of a row's normalized model values."""
+    raw = json.dumps(values, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def load_fingerprints(source, emails):
+    """Return ``{email: ImportFingerprint}`` for the given emails of ``source``."""
+    rows = ImportFingerprint.objects.filter(source=source, email__in=list(emails)).only("email", "digest", "user_id")
+    return {fp.email: fp for fp in rows}
+
+
+def save_fingerprints(source, run, pairs, existing):
+    """
+    Record ``(user, digest)`` pairs written by ``run``; ``existing`` is the
+    ``load_fingerprints`` result for the chunk.
+    """
+    User = get_user_model()
+    # bulk_create only sets primary keys on some backends.
+    missing_ids = [user.email for user, _ in pairs if user.pk is None]
+    ids = dict(User.objects.filter(email__in=missing_ids).values_list("email", "id")) if missing_ids else {}
+
+    to_create, to_update = [], []
+    for user, digest in pairs:
+        fp = existing.get(user.email)
+        if fp is None:
+            to_create.append(ImportFingerprint(
+                source=source, email=user.email, user_id=user.pk or ids[user.email], digest=digest, run=run,
+            ))
+        else:
+            fp.digest, fp.run, fp.updated_at = digest, run, timezone.now()
+            to_update.append(fp)
+    ImportFingerprint.objects.bulk_create(to_create, batch_size=500)
+    ImportFingerprint.objects.bulk_update(to_update, ["digest", "run", "updated_at"], batch_size=500)
+
+
+def mark_seen(source, run, emails):
+    """Stamp ``run`` on unchanged rows, so they are not counted as missing."""
+    if emails:
+        ImportFingerprint.objects.filter(source=source, email__in=list(emails)).update(run=run)
+
+
+def count_missing(source, run):
+    """Rows imported from ``source`` before that ``run``'s file no longer contains."""
+    return ImportFingerprint.objects.filter(source=source).exclude(run=run).count()
+
+
+def claimed_by_run(source, run):
+    """
+    Emails and usernames of the users whose rows ``run`` has committed, to
+    rebuild the ``claimed_*`` sets of a resumed run.
+    """
+    emails, usernames = set(), set()
+    rows = ImportFingerprint.objects.filter(source=source, run=run).values_list("email", "user__username")
+    for email, username in rows.iterator():
+        emails.add(email)
+        usernames.add(username)
+    return emails, usernames
+
+
+def missing_columns(columns):
+    return [col for col in EXPECTED_COLUMNS if col not in columns]
+
+
+def _text(series):
+    """``str(value).strip()`` for present cells, ``""`` for missing ones."""
+    present = series.notna()
+    return series.where(present, "").astype(object).map(str).str.strip()
+
+
+def _split_list(series):
+    """Comma-separated cell -> normalized list of parts (see ``normalize_tags``); empty cells -> []."""
+    present = series.notna() & (series.astype(object).map(str) != "")
+    parts = series.where(present, "").astype(object).map(str).str.split(",")
+    return parts.where(present, None).map(lambda values: normalize_tags(values) if values else [])
+
+
+def _parse_dates(series):
+    """
+    Parse ``date_of_birth`` in bulk.
+
+    Strings must match one of ``DOB_FORMATS``; other values (Excel dates)
+    go through ``to_datetime`` as-is.
+
+    Returns:
+        ``(parsed, invalid)``: a datetime series (NaT where absent) and a mask
+        of present values that failed to parse
+    """
+    present = series.notna() & (series.astype(object).map(str) != "")
+    is_text = series.map(lambda value: isinstance(value, str))
+    parsed = pd.Series(pd.NaT, index=series.index, dtype="datetime64[ns]")
+
+    remaining = present & is_text
+    for fmt in DOB_FORMATS:
+        if not remaining.any():
+            break
+        attempt = pd.to_datetime(series[remaining], format=fmt, errors="coerce")
+        parsed[attempt.index] = parsed[attempt.index].fillna(attempt)
+        remaining &= parsed.isna()
+
+    others = present & ~is_text
+    if others.any():
+        parsed[others] = pd.to_datetime(series[others], errors="coerce")
+
+    return parsed, present & parsed.isna()
+
+
+def normalize(df):
+    """
+    Build the columnar view of the sheet.
+
+    Returns:
+        A DataFrame indexed like ``df`` holding cleaned model values plus the
+        ``password``, ``dob_raw``, ``dob_invalid``, ``experience_raw`` and
+        ``experience_invalid`` helper columns
+    """
+    out = pd.DataFrame(index=df.index)
+    out['email'] = _text(df['email']).str.lower()
+    out['email_invalid'] = (out['email'] == "") | ~out['email'].str.contains("@", regex=False)
+
+    local_part = out['email'].str.split("@").str[0]
+    out['username'] = _text(df['username']).where(df['username'].notna(), local_part)
+
+    for field, column in TEXT_COLUMNS.items():
+        out[field] = _text(df[column])
+    for field, column in LIST_COLUMNS.items():
+        out[field] = _split_list(df[column])
+
+    parsed, out['dob_invalid'] = _parse_dates(df['date_of_birth'])
+    out['dob_raw'] = df['date_of_birth']
+    out['date_of_birth'] = parsed.dt.date.where(parsed.notna(), None)
+    out['password'] = parsed.dt.strftime("%Y%m%d").where(parsed.notna(), DEFAULT_PASSWORD)
+
+    experience = pd.to_numeric(df['experience'], errors="coerce")
+    out['experience_raw'] = df['experience']
+    out['experience_invalid'] = df['experience'].notna() & experience.isna()
+    out['experience'] = experience.fillna(0).astype(float)
+    return out
+
+
+def import_users(batches, run=None):
+    """
+    Import every row of ``batches``, DataFrames in sheet order (see
+    ``api.ingest.iter_batches``).
+
+    ``run`` identifies this import for the missing-row count; a fresh one is
+    used when omitted.
+
+    Returns:
+        A summary dict: ``created``, ``updated``, ``unchanged`` and ``missing``
+        counts, ``errors`` (``"Row N: ..."`` strings) and ``total_rows``
+    """
+    run = run or new_run()
+    claimed_emails, claimed_usernames = set(), set()
+    summary = {"created": 0, "updated": 0, "unchanged": 0, "errors": [], "total_rows": 0}
+
+    for batch in batches:
+        created, updated, unchanged, errors = import_user_chunk(
+            batch, summary["total_rows"], claimed_emails, claimed_usernames, run
+        )
+        summary["created"] += created
+        summary["updated"] += updated
+        summary["unchanged"] += unchanged
+        summary["errors"] += errors
+        summary["total_rows"] += len(batch)
+    summary["missing"] = count_missing(SOURCE_USERS, run)
+    return summary
+
+
+def import_user_chunk(df, offset, claimed_emails, claimed_usernames, run):
+    """
+    Import one slice of the sheet whose first row is sheet row ``offset + 1``.
+
+    ``claimed_emails``/``claimed_usernames`` carry the values taken by earlier
+    chunks of the same run; rows committed by an earlier run are found in
+    the database instead.
+
+    Returns:
+        ``(created, updated, unchanged, errors)``
+    """
+    return _import_chunk(normalize(df), offset, claimed_emails, claimed_usernames, run)
+
+
+def _import_chunk(chunk, offset, claimed_emails, claimed_usernames, run):
+    User = get_user_model()
+    candidates = chunk[~chunk['email_invalid'] & ~chunk['dob_invalid']]
+    candidate_emails = candidates['email'].unique().tolist()
+    existing_emails = set(
+        User.objects.filter(email__in=candidate_emails).values_list('email', flat=True)
+    )
+    existing_usernames = set(
+        User.objects.filter(username__in=candidates['username'].unique().tolist()).values_list('username', flat=True)
+    )
+    # Users this sheet created earlier; other existing emails are rejected.
+    fingerprints = load_fingerprints(SOURCE_USERS, chunk.loc[~chunk['email_invalid'], 'email'].unique().tolist())
+
+    errors = {}
+    users, passwords = [], []
+    # email -> (row number, digest, new values) for previously imported rows that changed
+    changed = {}
+    unchanged = 0
+    for position, row in enumerate(chunk.itertuples(index=False)):
+        row_number = offset + position + 1
+        if row.email_invalid:
+            errors[row_number] = f"Row {row_number}: Invalid or missing email"
+            continue
+        if row.dob_invalid:
+            errors[row_number] = f"Row {row_number}: Invalid date_of_birth format: {row.dob_raw}"
+            continue
+        reimport = row.email in fingerprints and row.email not in claimed_emails
+        if not reimport and (row.email in existing_emails or row.email in claimed_emails):
+            errors[row_number] = f"Row {row_number}: Email '{row.email}' already exists"
+            continue
+        if row.experience_invalid:
+            errors[row_number] = f"Row {row_number}: could not convert string to float: '{row.experience_raw}'"
+            continue
+
+        values = {field: getattr(row, field) for field in USER_FINGERPRINT_FIELDS}
+        digest = fingerprint(values)
+        if reimport:
+            claimed_emails.add(row.email)
+            if fingerprints[row.email].digest == digest:
+                unchanged += 1
+            else:
+                changed[row.email] = (row_number, digest, values)
+            continue
+
+        username = User.normalize_username(row.username)
+        if username in existing_usernames or username in claimed_usernames:
+            errors[row_number] = f"Row {row_number}: Username '{username}' already exists"
+            continue
+
+        claimed_emails.add(row.email)
+        claimed_usernames.add(username)
+        user = User(username=username, email=row.email, **values)
+        # bulk_create skips CustomUser.save(), which derives is_staff from role.
+        user.update_is_staff()
+        users.append((row_number, user, digest))
+        passwords.append(row.password)
+
+    for (_, user, _), hashed in zip(users, hash_passwords(passwords)):
+        user.password = hashed
+    created = _bulk_insert([(row_number, user) for row_number, user, _ in users], errors)
+    updated = _update_changed(changed, fingerprints, errors)
+
+    written = [
+        (user, digest) for row_number, user, digest in users if row_number not in errors
+    ] + [
+        (fingerprints[email].user, digest) for email, (row_number, digest, _) in changed.items()
+        if row_number not in errors
+    ]
+    if written:
+        search.refresh_documents(User.objects.filter(email__in=[user.email for user, _ in written]))
+    save_fingerprints(SOURCE_USERS, run, written, fingerprints)
+    mark_seen(SOURCE_USERS, run, [email for email in fingerprints if email not in changed])
+    return created, updated, unchanged, [errors[number] for number in sorted(errors)]
+
+
+def _update_changed(changed, fingerprints, errors):
+    """
+    Write sheet rows that changed since this sheet created their user; returns
+    the count.
+
+    The password is never touched: it belongs to the member once their account
+    exists, and a sheet must not be able to reset it through the date of birth.
+    """
+    if not changed:
+        return 0
+    User = get_user_model()
+    users = User.objects.in_bulk([fingerprints[email].user_id for email in changed])
+    for email, (row_number, digest, values) in changed.items():
+        user = users[fingerprints[email].user_id]
+        fingerprints[email].user = user
+        for field, value in values.items():
+            setattr(user, field, value)
+        user.update_is_staff()
+
+    fields = [*USER_FINGERPRINT_FIELDS, "is_staff"]
+    try:
+        with transaction.atomic():
+            User.objects.bulk_update(list(users.values()), fields, batch_size=500)
+        return len(users)
+    except ROW_ERRORS:
+        pass
+
+    updated = 0
+    for email, (row_number, _, _) in changed.items():
+        try:
+            with transaction.atomic():
+                fingerprints[email].user.save(update_fields=fields)
+            updated += 1
+        except ROW_ERRORS as exc:
+            errors[row_number] = f"Row {row_number}: {exc}"
+    return updated
+
+
+def _bulk_insert(users, errors):
+    """Insert the chunk at once; on a row error, retry row by row to report it."""
+    User = get_user_model()
+    try:
+        with transaction.atomic():
+            User.objects.bulk_create([user for _, user in users])
+        return len(users)
+    except ROW_ERRORS:
+        pass
+
+    created = 0
+    for row_number, user in users:
+        try:
+            with transaction.atomic():
+                user.save()
+            created += 1
+        except ROW_ERRORS as exc:
+            errors[row_number] = f"Row {row_number}: {exc}"
+    return created
+
+
+# model field -> members.csv column
+MEMBER_COLUMNS = {
+    "salutation": "Salutation",
+    "first_name": "Name",
+    "gender": "Gender",
+    "label": "Label",
+    "secondary_email": "Secondary Email",
+    "registered": "Registered",
+    "registered_on": "Registered On",
+    "approved_on": "Approved On",
+    "profile_updated_on": "Profile Updated On",
+    "profile_type": "Profile Type",
+    "roll_no": "Roll No",
+    "course": "Course",
+    "stream": "Stream",
+    "course_start_year": "Course Start Year",
+    "course_end_year": "Course End Year",
+    "faculty_job_title": "Faculty: Job Title",
+    "faculty_institute": "Faculty: Institute",
+    "faculty_department": "Faculty: Department",
+    "faculty_start_year": "Faculty: Start Year",
+    "faculty_start_month": "Faculty: Start Month",
+    "faculty_end_year": "Faculty: End Year",
+    "faculty_end_month": "Faculty: End Month",
+    "home_phone_no": "Home Phone No.",
+    "office_phone_no": "Office Phone No.",
+    "current_location": "Current Location",
+    "home_town": "Home Town",
+    "correspondence_address": "Correspondence Address",
+    "correspondence_city": "Correspondence City",
+    "correspondence_state": "Correspondence State",
+    "correspondence_country": "Correspondence Country",
+    "correspondence_pincode": "Correspondence Pincode",
+    "company": "Company",
+    "position": "Position",
+    "member_roles": "Member Roles",
+    "educational_course": "Educational Course",
+    "educational_institute": "Educational Institute",
+    "start_year": "Start Year",
+    "end_year": "End Year",
+    "facebook_link": "Facebook Link",
+    "linkedin_link": "LinkedIn Link",
+    "website_link": "Website Link",
+    "chapter": "chapter",
+}
+
+MEMBER_LIST_COLUMNS = {
+    "professional_skills": "Professional Skills",
+    "industries_worked_in": "Industries Worked In",
+    "roles_played": "Roles Played",
+}
+
+# Written on every upserted row; "password" is added per row when it changes.
+MEMBER_UPDATE_FIELDS = [
+    "username", "date_of_birth", "work_experience", "social_links", "role", "is_staff",
+    *MEMBER_COLUMNS, *MEMBER_LIST_COLUMNS,
+]
+
+DEFAULT_MEMBER_PASSWORD = "defaultpassword"
+
+
+def member_values(row):
+    """
+    Map one members.csv row to model values.
+
+    Raises:
+        ValidationError / ValueError: for an unparseable date or number
+    """
+    User = get_user_model()
+    get = lambda column: (row.get(column) or "").strip()
+
+    values = {field: get(column) for field, column in MEMBER_COLUMNS.items()}
+    for field, column in MEMBER_LIST_COLUMNS.items():
+        raw = get(column)
+        values[field] = normalize_tags(raw.split(",")) if raw else []
+    values["social_links"] = {
+        "Facebook": get("Facebook Link"),
+        "LinkedIn": get("LinkedIn Link"),
+        "Twitter": get("Twitter Link"),
+        "Website": get("Website Link"),
+    }
+    values["date_of_birth"] = User._meta.get_field("date_of_birth").to_python(get("Date of Birth") or None)
+    values["work_experience"] = float(get("Work Experience(in years)") or 0)
+    if values["profile_type"].lower() == "faculty" or values["label"].lower() == "faculty":
+        values["role"] = "Staff"
+    return values
+
+
+def iter_member_chunks(csvfile, skip=0):
+    """Yield lists of up to ``CHUNK_SIZE`` DictReader rows, after skipping ``skip`` rows."""
+    reader = csv.DictReader(csvfile)
+    for _ in islice(reader, skip):
+        pass
+    while True:
+        chunk = list(islice(reader, get_setting("CHUNK_SIZE")))
+        if not chunk:
+            return
+        yield chunk
+
+
+def sync_members(csv_path, run=None):
+    """
+    Upsert every row of ``csv_path`` by email, skipping rows whose fingerprint
+    matches the last sync.
+
+    Returns:
+        ``(created, updated, skipped, unchanged, missing)``: the first three
+        are lists as reported by the view, ``unchanged``/``missing`` counts
+    """
+    run = run or new_run()
+    created, updated, skipped = [], [], []
+    unchanged = 0
+    with open(csv_path, newline="", encoding="utf-8") as csvfile:
+        for chunk in iter_member_chunks(csvfile):
+            unchanged += sync_member_chunk(chunk, created, updated, skipped, run)
+    return created, updated, skipped, unchanged, count_missing(SOURCE_MEMBERS, run)
+
+
+def sync_member_chunk(chunk, created, updated, skipped, run):
+    """
+    Upsert one list of DictReader rows, appending emails/messages to the three
+    lists.
+
+    Returns:
+        The number of rows left untouched because their fingerprint matched
+    """
+    User = get_user_model()
+    parsed = []
+    for row in chunk:
+        email = (row.get("email_id") or "").strip().lower()
+        if not email:
+            skipped.append("No email in row")
+            continue
+        try:
+            parsed.append((email, member_values(row)))
+        except (ValidationError, ValueError) as e:
+            skipped.append(f"{email} ({str(e)})")
+
+    fingerprints = load_fingerprints(SOURCE_MEMBERS, {email for email, _ in parsed})
+    digests = {}
+    unchanged = 0
+    changed = []
+    for email, values in parsed:
+        digest = fingerprint(values)
+        if email not in digests and email in fingerprints and fingerprints[email].digest == digest:
+            unchanged += 1
+            continue
+        # A repeated email takes the digest of its last row, like the user does.
+        digests[email] = digest
+        changed.append((email, values))
+
+    existing = User.objects.in_bulk([email for email, _ in changed], field_name="email")
+    to_create, to_update = {}, {}
+    # email -> (user, raw password) for users whose password must be (re)set
+    new_passwords = {}
+    for email, values in changed:
+        # A repeated email in the same chunk updates the user its first row created.
+        user = to_create.get(email) or to_update.get(email) or existing.get(email)
+        if user is None:
+            user = User(username=email, email=email, **values)
+            new_passwords[email] = (user, _member_password(values["date_of_birth"]))
+            user.update_is_staff()
+            to_create[email] = user
+            created.append(email)
+            continue
+
+        dob_changed = user.date_of_birth != values["date_of_birth"]
+        for field, value in values.items():
+            setattr(user, field, value)
+        user.username = email
+        if dob_changed:
+            new_passwords[email] = (user, _member_password(values["date_of_birth"]))
+        user.update_is_staff()
+        if user.pk is not None:
+            to_update[email] = user
+        updated.append(email)
+
+    pending = list(new_passwords.values())
+    for (user, _), hashed in zip(pending, hash_passwords(raw for _, raw in pending)):
+        user.password = hashed
+
+    failed = _write_members(list(to_create.values()), list(to_update.values()))
+    for email, error in failed.items():
+        for bucket in (created, updated):
+            if email in bucket:
+                bucket.remove(email)
+        skipped.append(f"{email} ({error})")
+
+    written = {**to_update, **to_create}
+    if written:
+        search.refresh_documents(User.objects.filter(email__in=[email for email in written if email not in failed]))
+    save_fingerprints(SOURCE_MEMBERS, run, [
+        (written[email], digest) for email, digest in digests.items() if email not in failed
+    ], fingerprints)
+    mark_seen(SOURCE_MEMBERS, run, [email for email in fingerprints if email not in digests])
+    return unchanged
+
+
+def _member_password(date_of_birth):
+    return date_of_birth.isoformat() if date_of_birth else DEFAULT_MEMBER_PASSWORD
+
+
+def _write_members(to_create, to_update):
+    """Write the chunk; on a row error, retry row by row. Returns ``{email: error}``."""
+    User = get_user_model()
+    fields = MEMBER_UPDATE_FIELDS + ["password"]
+    upsert = {}
+    if connection.features.supports_update_conflicts_with_target:
+        # A concurrent import may have created the email since the prefetch.
+        upsert = {"update_conflicts": True, "unique_fields": ["email"], "update_fields": fields}
+    try:
+        with transaction.atomic():
+            User.objects.bulk_create(to_create, batch_size=500, **upsert)
+            User.objects.bulk_update(to_update, fields, batch_size=500)
+        return {}
+    except ROW_ERRORS:
+        pass
+
+    failed = {}
+    for user in to_create + to_update:
+        try:
+            with transaction.atomic():
+                user.save()
+        except ROW_ERRORS as exc:
+            failed[user.email] = str(exc)
+    return failed
@@ -0,0 +1,168 @@
+"""
+Ingest
+======
+Streaming readers for bulk import uploads.
+
+``pd.read_excel``/``pd.read_csv`` materialise the whole sheet before the
+first row is imported, so peak memory grows with the file. ``iter_batches``
+reads instead:
+
+- xlsx in openpyxl read-only mode, one row at a time;
+- CSV through ``pd.read_csv(chunksize=...)``;
+
+and yields DataFrames of at most ``batch_size`` rows, so the import engine
+only ever holds one batch.
+
+Every batch is built the same way whatever its neighbours contain. CSV
+cells are read as text, and xlsx cells keep the Python value openpyxl gives
+them (integral floats become ints, as ``pd.read_excel`` does). Per-chunk
+dtype inference would otherwise turn ``98765`` into ``98765.0`` in any
+batch where the column has a blank.
+
+Legacy ``.xls`` files cannot be streamed (openpyxl only reads OOXML) and are
+read whole and sliced.
+"""
+
+import csv
+import io
+from itertools import islice
+
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+class IngestError(ValueError):
+    """Raised when an upload has no header row."""
+
+
+def iter_batches(file_obj, extension, batch_size, skip=0):
+    """
+    Yield DataFrames of up to ``batch_size`` data rows, after skipping ``skip``.
+
+    ``file_obj`` must be a binary file opened at the start of the upload.
+    """
+    if extension == "xlsx":
+        yield from _iter_xlsx(file_obj, batch_size, skip)
+    elif extension == "xls":
+        df = pd.read_excel(file_obj)
+        for start in range(skip, len(df), batch_size):
+            yield df.iloc[start:start + batch_size]
+    else:
+        reader = pd.read_csv(
+            file_obj, dtype=str, chunksize=batch_size,
+            skiprows=(lambda i: 0 < i <= skip) if skip else None,
+        )
+        with reader:
+            yield from reader
+
+
+def read_header(file_obj, extension):
+    """Column names of the upload, without reading its rows; rewinds ``file_obj``."""
+    try:
+        if extension == "xlsx":
+            workbook = _open_xlsx(file_obj)
+            try:
+                return [_header(value) for value in next(workbook.active.iter_rows(values_only=True))]
+            except StopIteration:
+                raise IngestError("The sheet is empty.")
+            finally:
+                workbook.close()
+        if extension == "xls":
+            return list(pd.read_excel(file_obj, nrows=0).columns)
+        try:
+            return list(pd.read_csv(file_obj, nrows=0).columns)
+        except pd.errors.EmptyDataError:
+            raise IngestError("The sheet is empty.")
+    finally:
+        file_obj.seek(0)
+
+
+def count_rows(file_obj, extension):
+    """Number of data rows, read in a streaming pass; rewinds ``file_obj``."""
+    try:
+        if extension == "xlsx":
+            workbook = _open_xlsx(file_obj)
+            try:
+                rows = _without_trailing_blanks(workbook.active.iter_rows(values_only=True))
+                return max(sum(1 for _ in rows) - 1, 0)
+            finally:
+                workbook.close()
+        if extension == "xls":
+            return len(pd.read_excel(file_obj))
+        text = io.TextIOWrapper(file_obj, encoding="utf-8", newline="")
+        try:
+            return sum(1 for _ in csv.DictReader(text))
+        finally:
+            text.detach()
+    finally:
+        file_obj.seek(0)
+
+
+def batch_memory(df):
+    """
+    Memory figures for one batch, for the import job's result.
+
+    Returns:
+        ``{"rows", "batch_bytes", "peak_rss_kb"}``; ``peak_rss_kb`` is the
+        process high-water mark (``None`` where ``resource`` is unavailable)
+    """
+    return {
+        "rows": len(df),
+        "batch_bytes": int(df.memory_usage(index=True, deep=True).sum()),
+        "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss if resource else None,
+    }
+
+
+def _open_xlsx(file_obj):
+    from openpyxl import load_workbook
+
+    return load_workbook(file_obj, read_only=True, data_only=True)
+
+
+def _header(value):
+    return "" if value is None else str(value)
+
+
+def _cell(value):
+    # pd.read_excel turns integral floats back into ints.
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def _without_trailing_blanks(rows):
+    """Drop empty rows at the end of the sheet, as ``pd.read_excel`` does."""
+    blanks = []
+    for row in rows:
+        if all(value is None for value in row):
+            blanks.append(row)
+            continue
+        yield from blanks
+        blanks.clear()
+        yield row
+
+
+def _iter_xlsx(file_obj, batch_size, skip):
+    workbook = _open_xlsx(file_obj)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = [_header(value) for value in header]
+        width = len(columns)
+        rows = islice(_without_trailing_blanks(rows), skip, None)
+        while True:
+            batch = [
+                [_cell(value) for value in row[:width]] + [None] * (width - len(row))
+                for row in islice(rows, batch_size)
+            ]
+            if not batch:
+                return
+            yield pd.DataFrame(batch, columns=columns, dtype=object)
+    finally:
+        workbook.close()
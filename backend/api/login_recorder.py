@@ -0,0 +1,165 @@
+"""
+Login Recorder
+==============
+Write-behind buffer for ``LoginLog`` rows.
+
+Login views call ``login_recorder.record(...)`` instead of inserting a row
+inside the request. Events are held in memory and written with one
+``bulk_create`` (plus one ``bulk_update`` for ``last_login``) when the buffer
+reaches ``MAX_BATCH`` events or ``FLUSH_INTERVAL`` seconds have passed. The
+buffer is also flushed when the worker process exits. Users whose
+``last_login`` changed are dropped from the auth caches (``api.token_cache``).
+"""
+
+import atexit
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, connections, transaction
+from django.utils import timezone
+
+from .models import LoginLog
+from .token_cache import invalidate_users
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    "ENABLED": True,
+    "MAX_BATCH": 200,
+    "FLUSH_INTERVAL": 5,
+    "MAX_BUFFER": 10000,
+}
+
+USER_AGENT_MAX_LENGTH = LoginLog._meta.get_field("user_agent").max_length
+
+
+def get_setting(name):
+    return getattr(settings, "LOGIN_LOG_BUFFER", {}).get(name, DEFAULTS[name])
+
+
+class LoginLogRecorder:
+    """Batch login events in memory and flush them in bulk."""
+
+    def __init__(self):
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self._timer = None
+        self.flushed = 0
+        self.dropped = 0
+
+    def record(self, user, user_agent=None, update_last_login=False, timestamp=None):
+        """
+        Queue a login event for ``user``.
+
+        With ``update_last_login`` the user's ``last_login`` is written in the
+        same flush instead of a separate ``save()`` in the request.
+        """
+        timestamp = timestamp or timezone.now()
+        if user_agent:
+            user_agent = user_agent[:USER_AGENT_MAX_LENGTH]
+        if update_last_login:
+            # Keep the in-memory instance consistent for the rest of the request.
+            user.last_login = timestamp
+        event = (user.pk, user_agent, timestamp, update_last_login)
+
+        if not get_setting("ENABLED"):
+            self._write([event])
+            return
+
+        with self._lock:
+            if len(self._buffer) >= get_setting("MAX_BUFFER"):
+                self.dropped += 1
+                logger.warning("Login log buffer full; dropping event for user %s", user.pk)
+                return
+            self._buffer.append(event)
+            due = (
+                len(self._buffer) >= get_setting("MAX_BATCH")
+                or time.monotonic() - self._last_flush >= get_setting("FLUSH_INTERVAL")
+            )
+        if due:
+            self.flush()
+        else:
+            self._schedule()
+
+    def flush(self):
+        """Write every buffered event. Safe to call from any thread."""
+        with self._flush_lock:
+            with self._lock:
+                events, self._buffer = self._buffer, []
+                self._last_flush = time.monotonic()
+            if events:
+                self._write(events)
+
+    def _write(self, events, retry=True):
+        User = get_user_model()
+        logs = [
+            LoginLog(user_id=user_id, user_agent=user_agent, timestamp=timestamp)
+            for user_id, user_agent, timestamp, _ in events
+        ]
+        last_login = {}
+        for user_id, _, timestamp, update_last_login in events:
+            if update_last_login and (user_id not in last_login or timestamp > last_login[user_id]):
+                last_login[user_id] = timestamp
+        try:
+            with transaction.atomic():
+                LoginLog.objects.bulk_create(logs, batch_size=get_setting("MAX_BATCH"))
+                if last_login:
+                    User.objects.bulk_update(
+                        [User(pk=user_id, last_login=ts) for user_id, ts in last_login.items()],
+                        ["last_login"],
+                        batch_size=get_setting("MAX_BATCH"),
+                    )
+            if last_login:
+                # bulk_update sends no signals; drop the cached users ourselves.
+                invalidate_users(list(last_login))
+            self.flushed += len(logs)
+        except IntegrityError:
+            if retry:
+                # A user was deleted between login and flush; keep everyone else's events.
+                existing = set(User.objects.filter(pk__in={e[0] for e in events}).values_list("pk", flat=True))
+                self.dropped += sum(1 for e in events if e[0] not in existing)
+                self._write([e for e in events if e[0] in existing], retry=False)
+                return
+            self.dropped += len(logs)
+            logger.exception("Failed to flush %d login log events", len(logs))
+        except Exception:
+            self.dropped += len(logs)
+            logger.exception("Failed to flush %d login log events", len(logs))
+
+    def _schedule(self):
+        # One pending timer per process guarantees quiet periods still flush.
+        with self._lock:
+            if self._timer is not None and self._timer.is_alive():
+                return
+            self._timer = threading.Timer(get_setting("FLUSH_INTERVAL"), self._timed_flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _timed_flush(self):
+        try:
+            self.flush()
+        finally:
+            # The timer thread owns its own DB connection; don't leak it.
+            connections.close_all()
+            with self._lock:
+                self._timer = None
+                pending = bool(self._buffer)
+            if pending:
+                self._schedule()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "buffered": len(self._buffer),
+                "flushed": self.flushed,
+                "dropped": self.dropped,
+            }
+
+
+login_recorder = LoginLogRecorder()
+atexit.register(login_recorder.flush)
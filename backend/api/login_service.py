@@ -0,0 +1,96 @@
+"""
+Login Service
+=============
+Shared username-or-email login used by the admin, staff and user login views.
+
+The user and their token are loaded in a single indexed query
+(``select_related('auth_token')``) and the password is checked against that
+already-loaded row, so a warm login costs one SELECT. The ``LoginLog`` row
+and ``last_login`` update go through the buffered login recorder.
+"""
+
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError
+from rest_framework.authtoken.models import Token
+
+from . import signed_tokens
+from .login_recorder import login_recorder
+from .token_cache import token_cache, user_cache
+
+User = get_user_model()
+
+# role -> (gate, error message returned when the gate rejects the user)
+ROLE_GATES = {
+    "admin": (lambda user: user.is_superuser, "Invalid credentials or not admin"),
+    "staff": (lambda user: user.is_staff, "Invalid credentials or not staff"),
+    "user": (lambda user: True, "Invalid credentials"),
+}
+
+
+class LoginError(Exception):
+    """Raised when credentials are wrong or the role gate rejects the user."""
+
+
+def resolve_user(identifier):
+    """
+    Load the user for a username or email in one query, with their token.
+
+    Identifiers containing "@" or "." are treated as emails, matching the
+    behaviour of the original login views. Both columns are unique-indexed.
+    """
+    if not identifier:
+        return None
+    lookup = "email" if ("@" in identifier or "." in identifier) else "username"
+    try:
+        return User.objects.select_related("auth_token").get(**{lookup: identifier})
+    except User.DoesNotExist:
+        return None
+
+
+def get_or_create_token(user):
+    """Return the user's token, reusing the one loaded by ``resolve_user``."""
+    try:
+        return user.auth_token
+    except Token.DoesNotExist:
+        pass
+    try:
+        return Token.objects.create(user=user)
+    except IntegrityError:
+        # A concurrent login created it first.
+        token = Token.objects.get(user=user)
+        token.user = user
+        return token
+
+
+def login(identifier, password, role="user", user_agent=None, signed=False):
+    """
+    Authenticate ``identifier``/``password`` and apply the ``role`` gate.
+
+    With ``signed`` (and signed tokens enabled) a stateless signed token is
+    issued instead of the DB-backed DRF token.
+
+    Returns:
+        A ``(user, token_key)`` tuple
+
+    Raises:
+        LoginError: with the role-specific error message
+    """
+    gate, error_message = ROLE_GATES[role]
+    user = resolve_user(identifier)
+
+    if user is None:
+        # Run the hasher anyway so response time doesn't reveal unknown users.
+        User().set_password(password)
+        raise LoginError(error_message)
+
+    if not user.check_password(password) or not user.is_active or not gate(user):
+        raise LoginError(error_message)
+
+    login_recorder.record(user, user_agent=user_agent, update_last_login=True)
+    if signed and signed_tokens.get_setting("ENABLED"):
+        user_cache.set(user.pk, user)
+        return user, signed_tokens.issue(user)
+
+    token = get_or_create_token(user)
+    token_cache.set(token.key, token)
+    return user, token.key
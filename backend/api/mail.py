@@ -0,0 +1,154 @@
+"""
+Mail
+====
+Transactional email outbox.
+
+Request handlers call ``enqueue_mail``/``enqueue_many``, which only insert
+``OutboundEmail`` rows. The ``send_outbox`` management command delivers them
+in batches over one reused backend connection (``EMAIL_BACKEND``, so the
+locmem and file backends work as stand-ins for SMTP). Failed messages are
+retried with exponential backoff until ``MAX_ATTEMPTS`` is reached.
+
+Bodies hold one-time codes and reset links, so a message's body is blanked
+once it is sent or has failed for good, and ``purge_outbox`` deletes those
+rows after ``RETENTION_DAYS``.
+"""
+
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from .models import OutboundEmail
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    "BATCH_SIZE": 50,
+    "MAX_ATTEMPTS": 6,
+    "BACKOFF_BASE": 60,
+    "BACKOFF_MAX": 60 * 60,
+    "CLAIM_TIMEOUT": 10 * 60,
+    "RETENTION_DAYS": 30,
+}
+
+
+def get_setting(name):
+    return getattr(settings, "EMAIL_OUTBOX", {}).get(name, DEFAULTS[name])
+
+
+def _build(subject, message, recipient_list, from_email=None):
+    return OutboundEmail(
+        subject=subject,
+        body=message,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        to=list(recipient_list),
+    )
+
+
+def enqueue_mail(subject, message, recipient_list, from_email=None):
+    """Queue one message; same arguments as ``send_mail``."""
+    email = _build(subject, message, recipient_list, from_email)
+    email.save()
+    return email
+
+
+def enqueue_many(messages, from_email=None):
+    """Queue ``(subject, message, recipient_list)`` tuples with one INSERT."""
+    return OutboundEmail.objects.bulk_create(
+        [_build(subject, message, recipients, from_email) for subject, message, recipients in messages],
+        batch_size=500,
+    )
+
+
+def backoff(attempts):
+    """Seconds to wait before attempt number ``attempts + 1``."""
+    return min(get_setting("BACKOFF_BASE") * 2 ** (attempts - 1), get_setting("BACKOFF_MAX"))
+
+
+def claim_batch(batch_size):
+    """
+    Lease up to ``batch_size`` due messages to the calling worker.
+
+    Rows are claimed with ``SELECT ... FOR UPDATE SKIP LOCKED`` in a short
+    transaction that counts the attempt and moves ``next_attempt_at`` past
+    ``CLAIM_TIMEOUT``, so other workers skip them without holding any lock
+    while mail is sent. Messages of a worker that dies mid-batch become due
+    again when the lease runs out.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        batch = list(
+            OutboundEmail.objects
+            .select_for_update(skip_locked=True)
+            .filter(status=OutboundEmail.STATUS_PENDING, next_attempt_at__lte=now)
+            .order_by("next_attempt_at", "id")[:batch_size]
+        )
+        for email in batch:
+            email.attempts += 1
+            email.next_attempt_at = now + timedelta(seconds=get_setting("CLAIM_TIMEOUT"))
+        OutboundEmail.objects.bulk_update(batch, ["attempts", "next_attempt_at"])
+    return batch
+
+
+def send_batch(connection=None, batch_size=None):
+    """
+    Deliver up to ``batch_size`` due messages over ``connection``.
+
+    The batch is claimed first (see ``claim_batch``), then sent outside any
+    transaction, and the results are written back with one UPDATE. Several
+    workers can run side by side without sending a message twice.
+
+    Returns:
+        ``(sent, failed)`` counts for this batch
+    """
+    connection = connection or get_connection()
+    batch_size = batch_size or get_setting("BATCH_SIZE")
+    sent = failed = 0
+
+    batch = claim_batch(batch_size)
+    for email in batch:
+        message = EmailMessage(
+            email.subject, email.body, email.from_email, email.to, connection=connection
+        )
+        try:
+            # No-op while the connection is up, so one session serves the batch.
+            connection.open()
+            message.send()
+        except Exception as exc:
+            failed += 1
+            logger.warning("Sending outbound email %s failed: %s", email.pk, exc)
+            email.last_error = f"{type(exc).__name__}: {exc}"
+            if email.attempts >= get_setting("MAX_ATTEMPTS"):
+                email.status = OutboundEmail.STATUS_FAILED
+                email.body = ""
+            else:
+                email.next_attempt_at = timezone.now() + timedelta(seconds=backoff(email.attempts))
+            # The connection may be half-open now; the next message reopens it.
+            connection.close()
+        else:
+            sent += 1
+            email.status = OutboundEmail.STATUS_SENT
+            email.sent_at = timezone.now()
+            email.last_error = ""
+            email.body = ""
+
+    OutboundEmail.objects.bulk_update(batch, ["status", "body", "next_attempt_at", "last_error", "sent_at"])
+    return sent, failed
+
+
+def purge_finished():
+    """
+    Delete sent and failed messages older than ``RETENTION_DAYS``.
+
+    Returns:
+        The number of rows removed
+    """
+    cutoff = timezone.now() - timedelta(days=get_setting("RETENTION_DAYS"))
+    deleted, _ = OutboundEmail.objects.filter(
+        status__in=[OutboundEmail.STATUS_SENT, OutboundEmail.STATUS_FAILED], created_at__lt=cutoff
+    ).delete()
+    return deleted
@@ -0,0 +1,70 @@
+import random
+import time
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api import hashing
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure password hashing throughput for an import-sized batch (20k "
+        "DOB-derived passwords by default) inline and across process pools of "
+        "increasing size."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=20_000,
+                            help="Passwords to hash per run (default: 20000).")
+        parser.add_argument("--workers", default=None,
+                            help="Comma-separated pool sizes (default: 1, 2, 4, ... up to the core count).")
+
+    def handle(self, *args, **options):
+        cores = hashing.available_cores()
+        if options["workers"]:
+            try:
+                pool_sizes = [int(n) for n in options["workers"].split(",")]
+            except ValueError:
+                raise CommandError("--workers must be comma-separated integers.")
+        else:
+            pool_sizes, n = [], 1
+            while n < cores:
+                pool_sizes.append(n)
+                n *= 2
+            pool_sizes.append(cores)
+
+        # Same shape as the sheets: passwords are dates of birth as YYYYMMDD.
+        rng = random.Random(0)
+        passwords = [
+            (date(1950, 1, 1) + timedelta(days=rng.randrange(20_000))).strftime("%Y%m%d")
+            for _ in range(options["rows"])
+        ]
+        self.stdout.write(f"{len(passwords)} passwords, {cores} cores available\n")
+
+        started = time.perf_counter()
+        hashing.hash_passwords(passwords[:hashing.get_setting("INLINE_THRESHOLD") - 1])
+        per_hash = (time.perf_counter() - started) / max(1, hashing.get_setting("INLINE_THRESHOLD") - 1)
+        self.stdout.write(f"Inline: {per_hash * 1000:.1f} ms per hash, "
+                          f"~{per_hash * len(passwords):.0f}s for the batch on one core\n")
+
+        baseline = None
+        for workers in pool_sizes:
+            executor = hashing.create_executor(workers)
+            try:
+                # Spawn the workers before timing.
+                list(executor.map(hashing._encode, [
+                    ("django.contrib.auth.hashers.MD5PasswordHasher", "warmup")
+                ] * workers))
+                started = time.perf_counter()
+                hashes = hashing.hash_passwords(passwords, executor=executor)
+                elapsed = time.perf_counter() - started
+            finally:
+                executor.shutdown()
+            assert len(hashes) == len(passwords)
+
+            rate = len(passwords) / elapsed
+            baseline = baseline or rate
+            self.stdout.write(
+                f"{workers:>3} workers: {elapsed:8.1f}s  {rate:8.1f} hashes/s  x{rate / baseline:.2f}"
+            )
@@ -0,0 +1,263 @@
+import json
+import os
+import platform
+import random
+import resource
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+from multiprocessing import get_context
+from unittest import mock
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+# Generated users all use this domain so they can be removed afterwards.
+BENCH_DOMAIN = "bench.invalid"
+FAST_HASHER = "django.contrib.auth.hashers.MD5PasswordHasher"
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the bulk import engines on synthetic alumni sheets. Each "
+        "case imports a generated sheet and then re-imports it unchanged, and "
+        "reports rows/s, queries per row, peak RSS and time spent hashing. "
+        "Writes and then deletes users on the configured database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", default="1000,10000,100000",
+                            help="Comma-separated row counts (default: 1000,10000,100000).")
+        parser.add_argument("--formats", default="csv,xlsx",
+                            help="Sheet formats for the users path (default: csv,xlsx). "
+                                 "members.csv is always CSV.")
+        parser.add_argument("--paths", default="users,members",
+                            help="Import paths: users (users/bulk-import), members (members/import).")
+        parser.add_argument("--fast-hash", action="store_true",
+                            help="Hash with MD5 to measure the engine without PBKDF2 cost.")
+        parser.add_argument("--output", default=None,
+                            help="JSON results file (default: bench_imports-<timestamp>.json).")
+
+    def handle(self, *args, **options):
+        try:
+            sizes = [int(n) for n in options["sizes"].split(",")]
+        except ValueError:
+            raise CommandError("--sizes must be comma-separated integers.")
+        formats = options["formats"].split(",")
+        paths = options["paths"].split(",")
+        if not set(formats) <= {"csv", "xlsx"} or not set(paths) <= {"users", "members"}:
+            raise CommandError("Unknown format or path.")
+
+        from django.contrib.auth import get_user_model
+        from django.db import connection
+        from api import hashing
+
+        User = get_user_model()
+        if User.objects.filter(email__endswith=f"@{BENCH_DOMAIN}").exists():
+            raise CommandError(f"Users @{BENCH_DOMAIN} already exist; remove them first.")
+
+        hasher = FAST_HASHER if options["fast_hash"] else settings.PASSWORD_HASHERS[0]
+        report = {
+            "started_at": timezone.now().isoformat(),
+            "database": connection.vendor,
+            "hasher": hasher,
+            "cores": hashing.available_cores(),
+            "python": platform.python_version(),
+            "chunk_size": _chunk_size(),
+            "cases": [],
+        }
+        workdir = tempfile.mkdtemp(prefix="bench_imports-")
+        try:
+            for path in paths:
+                for fmt in (formats if path == "users" else ["csv"]):
+                    for rows in sizes:
+                        sheet = os.path.join(workdir, f"{path}-{rows}.{fmt}")
+                        started = time.perf_counter()
+                        _write_sheet(path, fmt, rows, sheet)
+                        self.stdout.write(f"{path} {fmt} {rows} rows (generated in {time.perf_counter() - started:.1f}s)")
+                        try:
+                            for phase in ("initial", "reimport"):
+                                result = _in_fresh_process(dict(
+                                    path=path, format=fmt, rows=rows, phase=phase, file=sheet, hasher=hasher,
+                                ))
+                                report["cases"].append(result)
+                                self.stdout.write(
+                                    f"  {phase:<8} {result['seconds']:8.1f}s  {result['rows_per_second']:9.1f} rows/s  "
+                                    f"{result['queries_per_row']:6.3f} q/row  hashing {result['hashing_seconds']:7.1f}s  "
+                                    f"peak {result['peak_rss_kb'] // 1024} MB"
+                                )
+                        finally:
+                            # Fingerprints go with their users.
+                            User.objects.filter(email__endswith=f"@{BENCH_DOMAIN}").delete()
+                        os.remove(sheet)
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+        output = options["output"] or f"bench_imports-{timezone.now():%Y%m%d-%H%M%S}.json"
+        with open(output, "w") as fh:
+            json.dump(report, fh, indent=2)
+        self.stdout.write(self.style.SUCCESS(f"Results written to {output}"))
+
+
+def _chunk_size():
+    from api import importers
+    return importers.get_setting("CHUNK_SIZE")
+
+
+def _in_fresh_process(spec):
+    # A new process per run, so peak RSS belongs to that run alone.
+    with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as executor:
+        return executor.submit(_run_case, spec).result()
+
+
+def _run_case(spec):
+    """Import ``spec['file']`` once; runs in its own spawned process."""
+    import django
+    django.setup()
+    from django.db import connection
+    from django.test.utils import override_settings
+    from api import importers, ingest
+
+    queries = 0
+
+    def count_queries(execute, sql, params, many, context):
+        nonlocal queries
+        queries += 1
+        return execute(sql, params, many, context)
+
+    hashing_seconds = 0.0
+    hash_passwords = importers.hash_passwords
+
+    def timed_hash(passwords, *args, **kwargs):
+        nonlocal hashing_seconds
+        started = time.perf_counter()
+        try:
+            return hash_passwords(passwords, *args, **kwargs)
+        finally:
+            hashing_seconds += time.perf_counter() - started
+
+    baseline_rss = _peak_rss_kb()
+    with override_settings(PASSWORD_HASHERS=[spec["hasher"]]), \
+            mock.patch.object(importers, "hash_passwords", timed_hash), \
+            connection.execute_wrapper(count_queries):
+        started = time.perf_counter()
+        if spec["path"] == "users":
+            with open(spec["file"], "rb") as fh:
+                summary = importers.import_users(
+                    ingest.iter_batches(fh, spec["format"], importers.get_setting("CHUNK_SIZE"))
+                )
+            counts = {key: summary[key] for key in ("created", "updated", "unchanged", "missing")}
+            counts["errors"] = len(summary["errors"])
+        else:
+            created, updated, skipped, unchanged, missing = importers.sync_members(spec["file"])
+            counts = {
+                "created": len(created), "updated": len(updated), "unchanged": unchanged,
+                "missing": missing, "errors": len(skipped),
+            }
+        seconds = time.perf_counter() - started
+
+    rows = spec["rows"]
+    return {
+        "path": spec["path"],
+        "format": spec["format"],
+        "rows": rows,
+        "phase": spec["phase"],
+        "seconds": round(seconds, 3),
+        "rows_per_second": round(rows / seconds, 1) if seconds else None,
+        "queries": queries,
+        "queries_per_row": round(queries / rows, 4) if rows else None,
+        "hashing_seconds": round(hashing_seconds, 3),
+        "peak_rss_kb": _peak_rss_kb(),
+        "baseline_rss_kb": baseline_rss,
+        **counts,
+    }
+
+
+def _peak_rss_kb():
+    # ru_maxrss survives exec on Linux, so a spawned child would report its
+    # parent's high-water mark; VmHWM is per address space.
+    try:
+        with open("/proc/self/status") as fh:
+            for line in fh:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _write_sheet(path, fmt, rows, filename):
+    import pandas as pd
+
+    rng = random.Random(rows)
+    df = pd.DataFrame(_user_rows(rng, rows) if path == "users" else _member_rows(rng, rows))
+    if fmt == "xlsx":
+        df.to_excel(filename, index=False)
+    else:
+        df.to_csv(filename, index=False)
+
+
+def _dob(rng):
+    return date(1955, 1, 1) + timedelta(days=rng.randrange(18_000))
+
+
+def _user_rows(rng, rows):
+    """Rows with the columns UserBulkImportView expects."""
+    for i in range(rows):
+        dob = _dob(rng)
+        yield {
+            "username": f"bench{i}",
+            "email": f"bench{i}@{BENCH_DOMAIN}",
+            "first_name": f"First{i % 997}",
+            "last_name": f"Last{i % 1009}",
+            "salutation": rng.choice(["Mr", "Ms", "Dr"]),
+            "gender": rng.choice(["M", "F"]),
+            "date_of_birth": dob.strftime("%m/%d/%Y"),
+            "current_work": rng.choice(["Engineer", "Manager", "Founder", ""]),
+            "Roles Played": "Mentor, Speaker" if i % 3 else "",
+            "experience": rng.randrange(0, 35),
+            "chapter": rng.choice(["Chennai", "Bengaluru", "Mumbai", "Delhi"]),
+            "college_name": "Institute of Technology",
+            "phone": f"9{rng.randrange(10**8, 10**9)}",
+            "Address": f"{i} Main Road",
+            "city": rng.choice(["Chennai", "Pune", "Hyderabad"]),
+            "State": "TN",
+            "Country": "India",
+            "zip_code": f"6000{i % 100:02d}",
+            "role": "Student" if i % 10 else "Staff",
+            "Course End Year": str(dob.year + 22),
+            "worked_In": "IT, Finance" if i % 2 else "",
+        }
+
+
+def _member_rows(rng, rows):
+    """Rows with the members.csv columns ImportMembersAPIView reads."""
+    for i in range(rows):
+        dob = _dob(rng)
+        yield {
+            "email_id": f"member{i}@{BENCH_DOMAIN}",
+            "Salutation": rng.choice(["Mr", "Ms", "Dr"]),
+            "Name": f"Member {i}",
+            "Gender": rng.choice(["M", "F"]),
+            "Date of Birth": dob.isoformat(),
+            "Label": "faculty" if i % 25 == 0 else "",
+            "Profile Type": "",
+            "Roll No": str(i),
+            "Course": rng.choice(["BE", "ME", "MBA"]),
+            "Stream": rng.choice(["CSE", "ECE", "MECH"]),
+            "Course Start Year": str(dob.year + 18),
+            "Course End Year": str(dob.year + 22),
+            "Current Location": rng.choice(["Chennai", "Pune", "Singapore"]),
+            "Company": rng.choice(["Acme", "Globex", "Initech"]),
+            "Position": rng.choice(["Engineer", "Director", "Analyst"]),
+            "Work Experience(in years)": str(rng.randrange(0, 35)),
+            "Professional Skills": "Python, SQL",
+            "Industries Worked In": "IT",
+            "Roles Played": "Mentor",
+            "Facebook Link": "",
+            "LinkedIn Link": f"https://linkedin.com/in/member{i}",
+            "chapter": rng.choice(["Chennai", "Bengaluru"]),
+        }
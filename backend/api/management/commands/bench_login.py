@@ -0,0 +1,71 @@
+import time
+
+from django.contrib.auth import authenticate, get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from api import login_service
+from api.login_recorder import login_recorder
+from api.models import LoginLog
+
+User = get_user_model()
+
+
+def legacy_login(identifier, password):
+    """The login flow the views used before ``api.login_service``."""
+    if "@" in identifier or "." in identifier:
+        try:
+            user_obj = User.objects.get(email=identifier)
+            user = authenticate(username=user_obj.username, password=password)
+        except User.DoesNotExist:
+            user = None
+    else:
+        user = authenticate(username=identifier, password=password)
+    token, _ = Token.objects.get_or_create(user=user)
+    user.last_login = timezone.now()
+    user.save(update_fields=["last_login"])
+    LoginLog.objects.create(user=user)
+    return user, token
+
+
+class Command(BaseCommand):
+    help = "Compare queries and latency per login for the legacy views and the login service."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=20)
+
+    def handle(self, *args, **options):
+        iterations = options["iterations"]
+        password = "bench-password"
+
+        # Everything runs in a transaction that is rolled back at the end, and
+        # the login buffer is only flushed explicitly (once per flow).
+        buffer_settings = {"MAX_BATCH": 10 ** 6, "FLUSH_INTERVAL": 10 ** 6}
+        with override_settings(LOGIN_LOG_BUFFER=buffer_settings), transaction.atomic():
+            user = User.objects.create_user(
+                "bench_login_user", "bench_login_user@example.com", password, role="Student"
+            )
+            Token.objects.create(user=user)
+
+            flows = [
+                ("legacy (email)", lambda: legacy_login(user.email, password)),
+                ("legacy (username)", lambda: legacy_login(user.username, password)),
+                ("service (email)", lambda: login_service.login(user.email, password)),
+                ("service (username)", lambda: login_service.login(user.username, password)),
+            ]
+            self.stdout.write(f"{'flow':<20} {'queries/login':>14} {'ms/login':>10}")
+            for name, flow in flows:
+                with CaptureQueriesContext(connection) as queries:
+                    started = time.perf_counter()
+                    for _ in range(iterations):
+                        flow()
+                    elapsed = time.perf_counter() - started
+                    # Count the amortised cost of the buffered LoginLog writes too.
+                    login_recorder.flush()
+                self.stdout.write(
+                    f"{name:<20} {len(queries) / iterations:>14.2f} {elapsed * 1000 / iterations:>10.1f}"
+                )
+            transaction.set_rollback(True)
@@ -0,0 +1,78 @@
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Q
+
+from api.models import LoginLog
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Load synthetic LoginLog rows (10M by default) and EXPLAIN ANALYZE the "
+        "login-history and retention queries. PostgreSQL only; rolled back "
+        "unless --keep is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=10_000_000)
+        parser.add_argument("--users", type=int, default=50_000,
+                            help="Spread rows over at most this many existing users.")
+        parser.add_argument("--page-size", type=int, default=50)
+        parser.add_argument("--keep", action="store_true",
+                            help="Commit the synthetic rows instead of rolling back.")
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("This benchmark needs PostgreSQL.")
+
+        users = min(options["users"], options["rows"])
+        user_ids = list(User.objects.order_by("id").values_list("id", flat=True)[:users])
+        if not user_ids:
+            raise CommandError("Create some users first.")
+
+        with transaction.atomic():
+            started = time.perf_counter()
+            with connection.cursor() as cursor:
+                # One row per second going back in time, round-robin over users.
+                cursor.execute(
+                    """
+                    INSERT INTO api_loginlog (user_id, user_agent, "timestamp")
+                    SELECT (%s::bigint[])[1 + (g %% %s)], 'bench', now() - g * interval '1 second'
+                    FROM generate_series(1, %s) AS g
+                    """,
+                    [user_ids, len(user_ids), options["rows"]],
+                )
+                cursor.execute("ANALYZE api_loginlog")
+            self.stdout.write(f"Inserted {options['rows']} rows in {time.perf_counter() - started:.1f}s\n")
+
+            # generate_series starts at 1, so the second user gets the first row.
+            user_id = user_ids[1 % len(user_ids)]
+            history = LoginLog.objects.filter(user_id=user_id)
+            count = history.count()
+            middle = history.order_by("-timestamp", "-id")[count // 2]
+            page_size = options["page_size"]
+
+            queries = {
+                "legacy: full history, unpaginated": history.order_by("-timestamp"),
+                "keyset: first page": history.order_by("-timestamp", "-id")[:page_size],
+                "keyset: page in the middle of the history": history.filter(
+                    Q(timestamp__lte=middle.timestamp)
+                    & (Q(timestamp__lt=middle.timestamp) | Q(id__lt=middle.id))
+                ).order_by("-timestamp", "-id")[:page_size],
+                "retention: one day's rows (BRIN)": LoginLog.objects.filter(
+                    timestamp__gte=middle.timestamp - timedelta(days=1),
+                    timestamp__lt=middle.timestamp,
+                ).values("user_id"),
+            }
+            for name, queryset in queries.items():
+                self.stdout.write(self.style.MIGRATE_HEADING(f"== {name} ({count} rows for user {user_id})"))
+                self.stdout.write(queryset.explain(analyze=True, buffers=True))
+                self.stdout.write("")
+
+            if not options["keep"]:
+                transaction.set_rollback(True)
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+
+from api import dedupe
+
+
+class Command(BaseCommand):
+    help = (
+        "Find users that are probably the same person (blocking on roll number, "
+        "date of birth and phonetic name codes) and refresh the duplicate review "
+        "queue served at members/duplicates/."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threshold", type=float, default=None,
+                            help="Minimum score to queue a pair (default: DEDUPE['THRESHOLD']).")
+        parser.add_argument("--dry-run", action="store_true",
+                            help="Print the best candidates instead of saving them.")
+        parser.add_argument("--show", type=int, default=20,
+                            help="Candidates to print with --dry-run (default: 20).")
+
+    def handle(self, *args, **options):
+        candidates, stats = dedupe.find_duplicates(threshold=options["threshold"])
+        seconds = stats["seconds"]
+        self.stdout.write(
+            f"{stats['members']} members, {stats['pairs_compared']} pairs compared, "
+            f"{stats['skipped_blocks']} oversized blocks skipped, {stats['candidates']} candidates "
+            f"(load {seconds['load']}s, blocking {seconds['blocking']}s, scoring {seconds['scoring']}s)"
+        )
+
+        if options["dry_run"]:
+            for row in candidates.head(options["show"]).itertuples(index=False):
+                self.stdout.write(f"{row.id_a:>8} {row.id_b:>8}  {row.score:.3f}  {dedupe.reasons(row)}")
+            return
+
+        result = dedupe.save_candidates(candidates)
+        self.stdout.write(self.style.SUCCESS(
+            f"Review queue: {result['created']} added, {result['updated']} refreshed, "
+            f"{result['removed']} no longer matching."
+        ))
@@ -0,0 +1,31 @@
+import zipfile
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api import photos
+
+
+class Command(BaseCommand):
+    help = (
+        "Set profile photos from a zip archive whose entries are named by email "
+        "or roll number (e.g. 1234.jpg, jane@example.com.png)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("archive", help="Path to the zip archive.")
+
+    def handle(self, *args, **options):
+        try:
+            report = photos.import_photos(options["archive"])
+        except (OSError, zipfile.BadZipFile) as exc:
+            raise CommandError(f"Cannot read {options['archive']}: {exc}")
+
+        self.stdout.write(self.style.SUCCESS(f"{report['updated']} profile photos updated."))
+        for label in ("unmatched", "ambiguous"):
+            if report[label]:
+                self.stdout.write(f"{len(report[label])} {label}: {', '.join(report[label][:20])}"
+                                  + (" ..." if len(report[label]) > 20 else ""))
+        for entry in report["skipped"]:
+            self.stdout.write(f"skipped {entry['file']}: {entry['reason']}")
+        for entry in report["failed"]:
+            self.stdout.write(f"failed {entry['file']}: {entry['error']}")
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from api import mail
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete sent and failed OutboundEmail rows older than "
+        "EMAIL_OUTBOX['RETENTION_DAYS']. Schedule this alongside other cron jobs."
+    )
+
+    def handle(self, *args, **options):
+        deleted = mail.purge_finished()
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} finished outbound emails."))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from api import otp
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete expired signup codes from the SignupOTP fallback table. Codes in "
+        "the cache expire on their own; schedule this alongside other cron jobs."
+    )
+
+    def handle(self, *args, **options):
+        deleted = otp.purge_expired()
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} expired signup codes."))
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from api import search
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild every member's full-text search document (api.search). Run "
+        "once after adding the column, and after changing MEMBER_SEARCH['CONFIG']."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=None,
+                            help="Users per UPDATE (default: MEMBER_SEARCH['BATCH_SIZE']).")
+
+    def handle(self, *args, **options):
+        if not search.is_supported():
+            raise CommandError("Full-text member search needs PostgreSQL.")
+        total = search.rebuild_all(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"{total} search documents rebuilt."))
@@ -0,0 +1,97 @@
+from datetime import datetime, time, timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Max, Min
+from django.utils import timezone
+
+from api.models import LoginLog, LoginLogDaily
+
+
+class Command(BaseCommand):
+    help = (
+        "Roll LoginLog rows older than the retention window into per-user daily "
+        "LoginLogDaily aggregates and delete the raw rows. Safe to re-run."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--retain-days", type=int, default=90,
+            help="Keep raw rows for this many days (default: 90).",
+        )
+        parser.add_argument(
+            "--max-days", type=int, default=None,
+            help="Stop after rolling up this many days (default: all eligible days).",
+        )
+
+    def handle(self, *args, **options):
+        tz = timezone.get_current_timezone()
+        today = timezone.localdate()
+        cutoff = timezone.make_aware(
+            datetime.combine(today - timedelta(days=options["retain_days"]), time.min), tz
+        )
+
+        oldest = LoginLog.objects.filter(timestamp__lt=cutoff).aggregate(oldest=Min("timestamp"))["oldest"]
+        if oldest is None:
+            self.stdout.write("Nothing to roll up.")
+            return
+
+        day = timezone.localtime(oldest, tz).date()
+        processed_days = total_rows = 0
+        while True:
+            start = timezone.make_aware(datetime.combine(day, time.min), tz)
+            if start >= cutoff:
+                break
+            if options["max_days"] is not None and processed_days >= options["max_days"]:
+                break
+            end = start + timedelta(days=1)
+            rows = self.roll_up_day(day, start, end)
+            total_rows += rows
+            processed_days += 1
+            if rows and options["verbosity"] > 1:
+                self.stdout.write(f"{day}: rolled up {rows} rows")
+            day += timedelta(days=1)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Rolled up {total_rows} login rows across {processed_days} days."
+        ))
+
+    def roll_up_day(self, day, start, end):
+        """Aggregate and delete one day of raw rows in a single transaction."""
+        raw = LoginLog.objects.filter(timestamp__gte=start, timestamp__lt=end)
+        with transaction.atomic():
+            aggregates = list(
+                raw.values("user_id").annotate(
+                    count=Count("id"), first=Min("timestamp"), last=Max("timestamp")
+                )
+            )
+            if not aggregates:
+                return 0
+
+            # Merge into rollups left by an earlier, interrupted run.
+            existing = {
+                rollup.user_id: rollup
+                for rollup in LoginLogDaily.objects.select_for_update().filter(
+                    day=day, user_id__in=[row["user_id"] for row in aggregates]
+                )
+            }
+            to_create, to_update = [], []
+            for row in aggregates:
+                rollup = existing.get(row["user_id"])
+                if rollup is None:
+                    to_create.append(LoginLogDaily(
+                        user_id=row["user_id"], day=day, login_count=row["count"],
+                        first_login=row["first"], last_login=row["last"],
+                    ))
+                else:
+                    rollup.login_count += row["count"]
+                    rollup.first_login = min(rollup.first_login, row["first"])
+                    rollup.last_login = max(rollup.last_login, row["last"])
+                    to_update.append(rollup)
+
+            LoginLogDaily.objects.bulk_create(to_create, batch_size=1000)
+            LoginLogDaily.objects.bulk_update(
+                to_update, ["login_count", "first_login", "last_login"], batch_size=1000
+            )
+            deleted, _ = raw.delete()
+        return deleted
@@ -0,0 +1,38 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from api import import_jobs
+
+
+class Command(BaseCommand):
+    help = (
+        "Process queued ImportJob uploads in committed chunks. Jobs abandoned by "
+        "a crashed worker resume from their last checkpoint. Runs until stopped "
+        "unless --once is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true",
+                            help="Exit once no jobs are waiting instead of polling.")
+        parser.add_argument("--interval", type=float, default=5,
+                            help="Seconds to sleep when no job is waiting (default: 5).")
+
+    def handle(self, *args, **options):
+        try:
+            while True:
+                job = import_jobs.claim_next_job()
+                if job is None:
+                    if options["once"]:
+                        break
+                    time.sleep(options["interval"])
+                    continue
+
+                self.stdout.write(f"Import job {job.pk} ({job.kind}) from row {job.checkpoint}...")
+                import_jobs.run_job(job)
+                self.stdout.write(
+                    f"Import job {job.pk} {job.status}: {job.checkpoint} rows, "
+                    f"{job.created_count} created, {job.updated_count} updated, {job.error_count} errors."
+                )
+        except KeyboardInterrupt:
+            pass
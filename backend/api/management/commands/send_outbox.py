@@ -0,0 +1,41 @@
+import time
+
+from django.core.mail import get_connection
+from django.core.management.base import BaseCommand
+
+from api import mail
+
+
+class Command(BaseCommand):
+    help = (
+        "Deliver queued OutboundEmail rows in batches over one reused mail "
+        "connection. Runs until stopped unless --once is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true",
+                            help="Exit once no messages are due instead of polling.")
+        parser.add_argument("--interval", type=float, default=5,
+                            help="Seconds to sleep when the outbox is empty (default: 5).")
+        parser.add_argument("--batch-size", type=int, default=None,
+                            help="Messages per batch (default: EMAIL_OUTBOX['BATCH_SIZE']).")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"] or mail.get_setting("BATCH_SIZE")
+        connection = get_connection()
+        try:
+            while True:
+                sent, failed = mail.send_batch(connection, batch_size)
+                if sent or failed:
+                    self.stdout.write(f"Sent {sent}, failed {failed}.")
+                if sent + failed == batch_size:
+                    continue
+                if options["once"]:
+                    break
+                # Don't hold an idle SMTP session open between polls.
+                connection.close()
+                time.sleep(options["interval"])
+        except KeyboardInterrupt:
+            pass
+        finally:
+            connection.close()
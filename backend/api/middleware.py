@@ -0,0 +1,20 @@
+from django.utils.functional import SimpleLazyObject
+
+from .user_agents import get_user_agent
+
+
+class UserAgentMiddleware:
+    """
+    Attach ``request.user_agent`` without parsing it up front.
+
+    Drop-in replacement for ``django_user_agents``' middleware: the header is
+    only parsed when a view touches the attribute, and repeat UA strings come
+    from the per-process LRU in ``api.user_agents``.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.user_agent = SimpleLazyObject(lambda: get_user_agent(request))
+        return self.get_response(request)
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:47
+
+import django.contrib.postgres.indexes
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0022_customuser_token_generation'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LoginLogDaily',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('login_count', models.PositiveIntegerField(default=0)),
+                ('first_login', models.DateTimeField()),
+                ('last_login', models.DateTimeField()),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='loginlog',
+            index=models.Index(fields=['user', '-timestamp', '-id'], name='loginlog_user_ts_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='loginlog',
+            index=django.contrib.postgres.indexes.BrinIndex(fields=['timestamp'], name='loginlog_ts_brin_idx'),
+        ),
+        migrations.AlterField(
+            model_name='loginlog',
+            name='user',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='loginlogdaily',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='login_rollups', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddConstraint(
+            model_name='loginlogdaily',
+            constraint=models.UniqueConstraint(fields=('user', 'day'), name='loginlogdaily_user_day_uniq'),
+        ),
+    ]
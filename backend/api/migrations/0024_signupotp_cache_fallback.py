@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:20
+
+from django.db import migrations, models
+
+
+def delete_plaintext_codes(apps, schema_editor):
+    # Rows written before codes were hashed can no longer be verified.
+    apps.get_model('api', 'SignupOTP').objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0023_loginlog_retention'),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_plaintext_codes, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='signupotp',
+            name='code',
+        ),
+        migrations.AddField(
+            model_name='signupotp',
+            name='code_hash',
+            field=models.CharField(default='', max_length=64),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='signupotp',
+            name='attempts',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='signupotp',
+            index=models.Index(fields=['email', '-created_at'], name='signupotp_email_created_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0025_outboundemail'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='pendingsignup',
+            index=models.Index(fields=['is_approved', 'created_at', 'id'], name='pending_queue_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0029_duplicatecandidate'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='businessdirectory',
+            index=models.Index(fields=['is_active', 'created_at', 'id'], name='business_active_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='events',
+            index=models.Index(fields=['uploaded_on', 'id'], name='events_uploaded_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobs',
+            index=models.Index(fields=['posted_on', 'id'], name='jobs_posted_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='newsroom',
+            index=models.Index(fields=['status', 'published_on', 'id'], name='news_status_published_idx'),
+        ),
+    ]
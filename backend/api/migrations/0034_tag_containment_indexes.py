@@ -0,0 +1,66 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:45
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+TAG_FIELDS = ('professional_skills', 'industries_worked_in', 'roles_played', 'Worked_in')
+
+
+def _normalize(values):
+    # Frozen copy of api.models.normalize_tags.
+    if not isinstance(values, list):
+        return values
+    tags = []
+    for value in values:
+        if isinstance(value, str):
+            value = value.strip().lower()
+        if value not in ('', None) and value not in tags:
+            tags.append(value)
+    return tags
+
+
+def normalize_existing_tags(apps, schema_editor):
+    # Containment filters match exact, lower-cased entries.
+    User = apps.get_model('api', 'CustomUser')
+    last_pk = 0
+    while True:
+        users = list(User.objects.filter(pk__gt=last_pk).order_by('pk').only('pk', *TAG_FIELDS)[:2000])
+        if not users:
+            return
+        changed = []
+        for user in users:
+            values = {field: _normalize(getattr(user, field)) for field in TAG_FIELDS}
+            if any(values[field] != getattr(user, field) for field in TAG_FIELDS):
+                for field, value in values.items():
+                    setattr(user, field, value)
+                changed.append(user)
+        User.objects.bulk_update(changed, TAG_FIELDS, batch_size=500)
+        last_pk = users[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0033_name_trigram_indexes'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.RunPython(normalize_existing_tags, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='customuser',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['professional_skills'], name='user_skills_gin', opclasses=['jsonb_path_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='customuser',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['industries_worked_in'], name='user_industries_gin', opclasses=['jsonb_path_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='customuser',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['roles_played'], name='user_roles_gin', opclasses=['jsonb_path_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='customuser',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['Worked_in'], name='user_worked_in_gin', opclasses=['jsonb_path_ops']),
+        ),
+    ]
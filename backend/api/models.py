@@ -1,4 +1,8 @@
 from django.db import models
+from django.db.models.functions import Lower
+from django.utils import timezone
+from django.contrib.postgres.indexes import BrinIndex, GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.contrib.auth import get_user_model
 from phonenumber_field.modelfields import PhoneNumberField
 from django.contrib.auth.models import AbstractUser, Group, Permission
@@ -10,6 +14,22 @@ def default_reaction():
 def get_default_social_links():
     return {}
 
+def normalize_tags(values):
+    """
+    Stripped, lower-cased, de-duplicated entries of a JSON list field, in
+    first-seen order, so exact containment (``@>``) finds them whatever the
+    original case. Non-list values are returned unchanged.
+    """
+    if not isinstance(values, list):
+        return values
+    tags = []
+    for value in values:
+        if isinstance(value, str):
+            value = value.strip().lower()
+        if value not in ("", None) and value not in tags:
+            tags.append(value)
+    return tags
+
 class CustomUser(AbstractUser):
     # Basic Info
     salutation = models.CharField(max_length=20, blank=True)
@@ -80,6 +100,10 @@ class CustomUser(AbstractUser):
     Worked_in = models.JSONField(default=list, blank=True)
     experience = models.JSONField(default=list, blank=True)
     is_entrepreneur = models.BooleanField(default=False)
+    # Bumped to revoke every signed auth token issued so far (api.signed_tokens)
+    token_generation = models.PositiveIntegerField(default=0)
+    # Weighted full-text document, maintained by api.search
+    search_document = SearchVectorField(null=True, editable=False)
 
     # Django auth fields
     groups = models.ManyToManyField(
@@ -97,12 +121,41 @@ class CustomUser(AbstractUser):
         verbose_name="user permissions"
     )
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # Alumni directory orderings (AlumniAdminFilterView.orderings).
+            models.Index(fields=['first_name', 'last_name', 'username'], name='user_first_last_idx'),
+            models.Index(fields=['last_name', 'first_name', 'username'], name='user_last_first_idx'),
+            models.Index(fields=['date_joined', 'id'], name='user_joined_id_idx'),
+            # Case-insensitive email lookup (api.photos).
+            models.Index(Lower('email'), name='user_email_lower_idx'),
+            GinIndex(fields=['search_document'], name='user_search_document_gin'),
+            # Trigram indexes for fuzzy name lookup (api.search.fuzzy_search).
+            GinIndex(fields=['username'], opclasses=['gin_trgm_ops'], name='user_username_trgm'),
+            GinIndex(fields=['first_name'], opclasses=['gin_trgm_ops'], name='user_first_name_trgm'),
+            GinIndex(fields=['last_name'], opclasses=['gin_trgm_ops'], name='user_last_name_trgm'),
+            # Containment (@>) filters on the tag lists (AlumniAdminFilter).
+            GinIndex(fields=['professional_skills'], opclasses=['jsonb_path_ops'], name='user_skills_gin'),
+            GinIndex(fields=['industries_worked_in'], opclasses=['jsonb_path_ops'], name='user_industries_gin'),
+            GinIndex(fields=['roles_played'], opclasses=['jsonb_path_ops'], name='user_roles_gin'),
+            GinIndex(fields=['Worked_in'], opclasses=['jsonb_path_ops'], name='user_worked_in_gin'),
+        ]
+
+    # JSON lists filtered by exact element (see AlumniAdminFilter).
+    TAG_FIELDS = ('professional_skills', 'industries_worked_in', 'roles_played', 'Worked_in')
+
     def update_is_staff(self):
         """Set is_staff flag based on the user's role."""
         self.is_staff = self.role != "Student"
 
+    def normalize_tag_fields(self):
+        """Case-normalize the TAG_FIELDS lists (see normalize_tags)."""
+        for field in self.TAG_FIELDS:
+            setattr(self, field, normalize_tags(getattr(self, field)))
+
     def save(self, *args, **kwargs):
         self.update_is_staff()
+        self.normalize_tag_fields()
         super().save(*args, **kwargs)
 
     def __str__(self):
@@ -111,12 +164,152 @@ class CustomUser(AbstractUser):
 User = get_user_model()
 
 class SignupOTP(models.Model):
+    # Fallback store for api.otp while the cache is unavailable.
     email = models.EmailField()
-    code = models.CharField(max_length=6)
+    code_hash = models.CharField(max_length=64)
+    attempts = models.PositiveSmallIntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['email', '-created_at'], name='signupotp_email_created_idx'),
+        ]
+
     def __str__(self):
-        return f"Signup OTP for {self.email}: {self.code}"
+        return f"Signup OTP for {self.email}"
+
+class OutboundEmail(models.Model):
+    # Transactional mail queued by api.mail and delivered by `manage.py send_outbox`.
+    STATUS_PENDING = 'pending'
+    STATUS_SENT = 'sent'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_SENT, 'Sent'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=254, blank=True)
+    to = models.JSONField(default=list)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='outbound_status_next_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} -> {', '.join(self.to)} ({self.status})"
+
+class ImportJob(models.Model):
+    # Uploaded sheet processed in the background by `manage.py run_import_jobs`.
+    KIND_USERS = 'users'
+    KIND_MEMBERS = 'members'
+    KIND_CHOICES = [
+        (KIND_USERS, 'User sheet (users/bulk-import)'),
+        (KIND_MEMBERS, 'Members CSV sync (members/import)'),
+    ]
+    STATUS_QUEUED = 'queued'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, 'Queued'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_DONE, 'Done'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    file = models.FileField(upload_to='imports/')
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='import_jobs')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_QUEUED)
+    # Source rows committed so far; a resumed run starts after this row.
+    checkpoint = models.PositiveIntegerField(default=0)
+    rows_total = models.PositiveIntegerField(null=True, blank=True)
+    created_count = models.PositiveIntegerField(default=0)
+    updated_count = models.PositiveIntegerField(default=0)
+    unchanged_count = models.PositiveIntegerField(default=0)
+    # Previously imported rows absent from this file; set when the job is done.
+    missing_count = models.PositiveIntegerField(null=True, blank=True)
+    error_count = models.PositiveIntegerField(default=0)
+    errors = models.JSONField(default=list, blank=True)
+    result = models.JSONField(default=dict, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='importjob_status_created_idx'),
+        ]
+
+    def __str__(self):
+        return f"ImportJob {self.pk} ({self.kind}, {self.status})"
+
+class ImportFingerprint(models.Model):
+    # Hash of the normalized source row a user was last imported from, so
+    # re-imports can skip unchanged rows (see api.importers).
+    source = models.CharField(max_length=10, choices=ImportJob.KIND_CHOICES)
+    email = models.EmailField()
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='import_fingerprints')
+    digest = models.CharField(max_length=64)
+    # Last import run whose file contained the row; rows of other runs are "missing".
+    run = models.CharField(max_length=40, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['source', 'email'], name='importfp_source_email_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['source', 'run'], name='importfp_source_run_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.source}:{self.email}"
+
+class DuplicateCandidate(models.Model):
+    # Pair of users api.dedupe scored as likely the same person (user_a.id < user_b.id).
+    STATUS_PENDING = 'pending'
+    STATUS_CONFIRMED = 'confirmed'
+    STATUS_DISMISSED = 'dismissed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending review'),
+        (STATUS_CONFIRMED, 'Confirmed duplicate'),
+        (STATUS_DISMISSED, 'Not a duplicate'),
+    ]
+
+    user_a = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    user_b = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    score = models.FloatField()
+    # Blocking keys the pair shared and the per-field similarities behind the score
+    reasons = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    reviewed_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    reviewed_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user_a', 'user_b'], name='dupcandidate_pair_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['status', '-score', 'id'], name='dupcandidate_queue_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_a_id} ~ {self.user_b_id} ({self.score:.2f}, {self.status})"
 
 class PendingSignup(models.Model):
     # Basic Info
@@ -189,19 +382,53 @@ class PendingSignup(models.Model):
     username = models.CharField(max_length=150, unique=True)
     password = models.CharField(max_length=128)
 
+    class Meta:
+        indexes = [
+            # Approval queue: oldest first, keyset-paginated on (created_at, id).
+            models.Index(fields=['is_approved', 'created_at', 'id'], name='pending_queue_idx'),
+        ]
+
     def __str__(self):
         return f"PendingSignup: {self.email}"
 
 
 
 class LoginLog(models.Model):
-    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    # The (user, -timestamp, -id) index below covers user lookups, so the FK
+    # doesn't need its own index on this write-heavy table.
+    user = models.ForeignKey(User, on_delete=models.CASCADE, db_index=False)
     user_agent = models.CharField(max_length=255, null=True)
-    timestamp = models.DateTimeField(auto_now_add=True)
+    # Set by the caller (not auto_now_add) so buffered events keep their real time.
+    timestamp = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            # Keyset pagination of one user's history, newest first.
+            models.Index(fields=['user', '-timestamp', '-id'], name='loginlog_user_ts_id_idx'),
+            # Tiny index for the retention job's time-range scans; rows are
+            # appended in time order, which is what BRIN needs.
+            BrinIndex(fields=['timestamp'], name='loginlog_ts_brin_idx'),
+        ]
     
     def __str__(self):
         return f"LoginLog for {self.user.username} at {self.timestamp}"
 
+class LoginLogDaily(models.Model):
+    """Per-user daily rollup of LoginLog rows older than the retention window."""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='login_rollups')
+    day = models.DateField()
+    login_count = models.PositiveIntegerField(default=0)
+    first_login = models.DateTimeField()
+    last_login = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'day'], name='loginlogdaily_user_day_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.login_count} logins for {self.user.username} on {self.day}"
+
 class Events(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='events')
     uploaded_on = models.DateTimeField(auto_now_add=True)
@@ -217,6 +444,12 @@ class Events(models.Model):
         default='Alumni'
     )
 
+    class Meta:
+        indexes = [
+            # List endpoints seek on (uploaded_on, id), newest first.
+            models.Index(fields=['uploaded_on', 'id'], name='events_uploaded_id_idx'),
+        ]
+
     def __str__(self):
         return f"{self.title} at {self.venue}, created by {self.user.username}"
 
@@ -241,6 +474,12 @@ class Jobs(models.Model):
     # Only tracking likes with a serializable default
     reaction = models.JSONField(default=default_reaction)  
 
+    class Meta:
+        indexes = [
+            # List endpoints seek on (posted_on, id), newest first.
+            models.Index(fields=['posted_on', 'id'], name='jobs_posted_id_idx'),
+        ]
+
     def __str__(self):
         return f"{self.company_name} - {self.role} by {self.user.username}"
 
@@ -328,6 +567,9 @@ class BusinessDirectory(models.Model):
         verbose_name = 'Business'
         verbose_name_plural = 'Business Directory'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['is_active', 'created_at', 'id'], name='business_active_created_idx'),
+        ]
 
 class BusinessImage(models.Model):
     business = models.ForeignKey(BusinessDirectory, on_delete=models.CASCADE, related_name='images')
@@ -356,6 +598,9 @@ class NewsRoom(models.Model):
         ordering = ['-published_on']
         verbose_name = 'News Article'
         verbose_name_plural = 'News Room'
+        indexes = [
+            models.Index(fields=['status', 'published_on', 'id'], name='news_status_published_idx'),
+        ]
     
     def __str__(self):
         return self.title
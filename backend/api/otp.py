@@ -0,0 +1,149 @@
+"""
+Signup OTP
+==========
+One-time signup codes kept in the cache with a native TTL.
+
+Only an HMAC of the code is stored, and codes are compared in constant time.
+Each code allows ``MAX_ATTEMPTS`` wrong guesses before it is burned. Send
+throttling lives in ``api.throttling``.
+
+If the cache is unreachable, or is local to each process (a code issued by
+one worker must verify on another), codes are written to ``SignupOTP``
+instead and verification checks both stores. Those rows are removed when the signup
+completes or by the ``purge_signup_otps`` command.
+"""
+
+import hashlib
+import logging
+import secrets
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import F
+from django.utils import timezone
+from django.utils.crypto import constant_time_compare, salted_hmac
+
+from .checks import is_shared
+from .models import SignupOTP
+
+logger = logging.getLogger(__name__)
+
+SALT = "api.otp"
+
+DEFAULTS = {
+    "CACHE_ALIAS": "default",
+    "TTL": 30 * 60,
+    "MAX_ATTEMPTS": 5,
+}
+
+
+def get_setting(name):
+    return getattr(settings, "SIGNUP_OTP", {}).get(name, DEFAULTS[name])
+
+
+def normalize_email(email):
+    return (email or "").strip().lower()
+
+
+def _cache():
+    return caches[get_setting("CACHE_ALIAS")]
+
+
+def _use_cache():
+    return is_shared(get_setting("CACHE_ALIAS"))
+
+
+def _cache_key(email, kind="code"):
+    return f"signup_otp:{kind}:{hashlib.sha256(email.encode()).hexdigest()}"
+
+
+def _digest(email, code):
+    return salted_hmac(SALT, f"{email}:{code}").hexdigest()
+
+
+def ttl_minutes():
+    return get_setting("TTL") // 60
+
+
+def issue(email):
+    """Create a fresh code for ``email``, replacing any earlier one, and return it."""
+    email = normalize_email(email)
+    code = f"{secrets.randbelow(900000) + 100000}"
+    digest = _digest(email, code)
+    ttl = get_setting("TTL")
+    if not _use_cache():
+        SignupOTP.objects.create(email=email, code_hash=digest)
+        return code
+    try:
+        _cache().set_many({_cache_key(email): digest, _cache_key(email, "attempts"): 0}, ttl)
+    except Exception:
+        logger.warning("OTP cache unavailable; storing signup code in the database", exc_info=True)
+        SignupOTP.objects.create(email=email, code_hash=digest)
+    return code
+
+
+def verify(email, code):
+    """Return True if ``code`` is the live code for ``email``. Wrong guesses count."""
+    email = normalize_email(email)
+    if not email or not code:
+        return False
+    digest = _digest(email, str(code).strip())
+
+    if _use_cache():
+        try:
+            if _verify_cached(email, digest):
+                return True
+        except Exception:
+            logger.warning("OTP cache unavailable; checking the database", exc_info=True)
+    return _verify_db(email, digest)
+
+
+def _verify_cached(email, digest):
+    cache = _cache()
+    stored = cache.get(_cache_key(email))
+    if stored is None:
+        return False
+    if constant_time_compare(stored, digest):
+        return True
+    try:
+        attempts = cache.incr(_cache_key(email, "attempts"))
+    except ValueError:
+        # The counter expired between the two reads.
+        attempts = get_setting("MAX_ATTEMPTS")
+    if attempts >= get_setting("MAX_ATTEMPTS"):
+        cache.delete_many([_cache_key(email), _cache_key(email, "attempts")])
+    return False
+
+
+def _verify_db(email, digest):
+    # Served by the (email, -created_at) index.
+    entry = (
+        SignupOTP.objects
+        .filter(email=email, created_at__gte=timezone.now() - timedelta(seconds=get_setting("TTL")))
+        .order_by("-created_at")
+        .first()
+    )
+    if entry is None or entry.attempts >= get_setting("MAX_ATTEMPTS"):
+        return False
+    if constant_time_compare(entry.code_hash, digest):
+        return True
+    SignupOTP.objects.filter(pk=entry.pk).update(attempts=F("attempts") + 1)
+    return False
+
+
+def consume(email):
+    """Burn every code for ``email`` once the signup went through."""
+    email = normalize_email(email)
+    try:
+        _cache().delete_many([_cache_key(email), _cache_key(email, "attempts")])
+    except Exception:
+        logger.warning("OTP cache unavailable; could not delete signup code", exc_info=True)
+    SignupOTP.objects.filter(email=email).delete()
+
+
+def purge_expired():
+    """Delete database codes older than the TTL. Returns the number of rows removed."""
+    cutoff = timezone.now() - timedelta(seconds=get_setting("TTL"))
+    deleted, _ = SignupOTP.objects.filter(created_at__lt=cutoff).delete()
+    return deleted
@@ -0,0 +1,187 @@
+"""
+Photos
+======
+Bulk profile-photo import from a zip archive.
+
+Each entry is named after the user it belongs to: ``<email>.jpg`` or
+``<roll_no>.png`` (folders inside the archive are ignored). Entries are read
+straight from the archive in batches of ``PHOTO_IMPORT['BATCH_SIZE']``; the
+archive is never extracted. Each batch:
+
+1. looks its users up with one query (emails, case-insensitively, and roll
+   numbers together);
+2. decodes, orients and downsizes the images to ``MAX_SIZE`` pixels in a
+   process pool (inline on a single core, as in ``api.hashing``);
+3. writes the JPEGs to ``profile_pics/`` through the default storage and
+   sets ``profile_photo`` with one ``bulk_update``, then drops those users
+   from the token and user caches (``bulk_update`` sends no signals).
+
+Entries that match no user, match several users (by roll number, or by
+emails differing only in case), are not images, or fail to decode are listed
+in the report instead.
+"""
+
+import io
+import os
+import threading
+import zipfile
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.db.models import Q
+from django.db.models.functions import Lower
+
+from .hashing import available_cores, create_executor
+from .token_cache import invalidate_users
+
+DEFAULTS = {
+    "MAX_SIZE": 512,                      # longest side, in pixels
+    "QUALITY": 85,                        # JPEG quality
+    "BATCH_SIZE": 64,                     # entries read and matched together
+    "MAX_ENTRY_BYTES": 20 * 1024 * 1024,  # larger entries are skipped unread
+    "WORKERS": None,                      # None: one per available core
+}
+
+IMAGE_EXTENSIONS = {"jpg", "jpeg", "png", "gif", "webp", "bmp", "tif", "tiff"}
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_setting(name):
+    return getattr(settings, "PHOTO_IMPORT", {}).get(name, DEFAULTS[name])
+
+
+def get_executor():
+    """Return the shared pool, starting it on first use."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = create_executor(get_setting("WORKERS") or available_cores())
+        return _executor
+
+
+def render(args):
+    """
+    Decode one image and re-encode it as a downsized JPEG. Runs in the pool.
+
+    Returns:
+        ``(jpeg_bytes, None)`` or ``(None, error message)``
+    """
+    data, max_size, quality = args
+    from PIL import Image, ImageOps, UnidentifiedImageError
+
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            image = ImageOps.exif_transpose(image)
+            image.thumbnail((max_size, max_size))
+            if image.mode != "RGB":
+                image = image.convert("RGB")
+            out = io.BytesIO()
+            image.save(out, "JPEG", quality=quality, optimize=True)
+        return out.getvalue(), None
+    except UnidentifiedImageError:
+        return None, "not a readable image"
+    except Exception as exc:  # Pillow raises a range of types for bad input
+        return None, str(exc) or type(exc).__name__
+
+
+def import_photos(archive, executor=None):
+    """
+    Import every photo in ``archive`` (a path or a seekable binary file).
+
+    Raises:
+        zipfile.BadZipFile: when ``archive`` is not a zip file
+
+    Returns:
+        ``{"updated", "unmatched", "ambiguous", "skipped", "failed"}``: the
+        number of users given a new photo, then entry names (and errors)
+        that were not applied
+    """
+    report = {"updated": 0, "unmatched": [], "ambiguous": [], "skipped": [], "failed": []}
+    # Users already given a photo from this archive; later entries are duplicates.
+    done = set()
+    batch_size = get_setting("BATCH_SIZE")
+    with zipfile.ZipFile(archive) as zf:
+        entries = [info for info in zf.infolist() if not info.is_dir() and not _is_metadata(info.filename)]
+        for start in range(0, len(entries), batch_size):
+            _import_batch(zf, entries[start:start + batch_size], report, done, executor)
+    return report
+
+
+def _is_metadata(name):
+    base = os.path.basename(name)
+    return name.startswith("__MACOSX/") or base.startswith(".") or base.lower() == "thumbs.db"
+
+
+def _key(info):
+    """``("email" | "roll_no", value)`` for an entry, or ``None`` if it is not an image."""
+    stem, ext = os.path.splitext(os.path.basename(info.filename))
+    if ext.lstrip(".").lower() not in IMAGE_EXTENSIONS or not stem.strip():
+        return None
+    stem = stem.strip()
+    return ("email", stem.lower()) if "@" in stem else ("roll_no", stem)
+
+
+def _import_batch(zf, entries, report, done, executor):
+    User = get_user_model()
+    keyed = []
+    for info in entries:
+        key = _key(info)
+        if key is None:
+            report["skipped"].append({"file": info.filename, "reason": "not an image"})
+        elif info.file_size > get_setting("MAX_ENTRY_BYTES"):
+            report["skipped"].append({"file": info.filename, "reason": "file too large"})
+        else:
+            keyed.append((info, key))
+    if not keyed:
+        return
+
+    emails = {value for (kind, value) in (key for _, key in keyed) if kind == "email"}
+    rolls = {value for (kind, value) in (key for _, key in keyed) if kind == "roll_no"}
+    by_email, by_roll = {}, {}
+    users = (
+        User.objects.annotate(email_lower=Lower("email"))
+        .filter(Q(email_lower__in=emails) | Q(roll_no__in=rolls))
+        .only("id", "email", "roll_no", "profile_photo")
+    )
+    for user in users:
+        if user.email_lower in emails:
+            by_email.setdefault(user.email_lower, []).append(user)
+        if user.roll_no in rolls:
+            by_roll.setdefault(user.roll_no, []).append(user)
+
+    matched = []
+    for info, (kind, value) in keyed:
+        candidates = (by_email if kind == "email" else by_roll).get(value, [])
+        if not candidates:
+            report["unmatched"].append(info.filename)
+        elif len(candidates) > 1:
+            report["ambiguous"].append(info.filename)
+        elif candidates[0].pk in done:
+            report["skipped"].append({"file": info.filename, "reason": "duplicate photo for this user"})
+        else:
+            done.add(candidates[0].pk)
+            matched.append((info, candidates[0]))
+    if not matched:
+        return
+
+    jobs = [(zf.read(info), get_setting("MAX_SIZE"), get_setting("QUALITY")) for info, _ in matched]
+    single_core = executor is None and (get_setting("WORKERS") or available_cores()) <= 1
+    if single_core or len(jobs) == 1:
+        results = map(render, jobs)
+    else:
+        results = (executor or get_executor()).map(render, jobs)
+
+    to_update = []
+    for (info, user), (data, error) in zip(matched, results):
+        if error:
+            report["failed"].append({"file": info.filename, "error": error})
+            continue
+        # Named by id: entry names may be email addresses.
+        user.profile_photo.save(f"{user.pk}.jpg", ContentFile(data), save=False)
+        to_update.append(user)
+    User.objects.bulk_update(to_update, ["profile_photo"])
+    invalidate_users([user.pk for user in to_update])
+    report["updated"] += len(to_update)
@@ -0,0 +1,152 @@
+"""
+Search
+======
+Full-text member search on PostgreSQL.
+
+Each ``CustomUser`` keeps a weighted ``tsvector`` in ``search_document``,
+built in the database by ``document()``:
+
+- A: names (first, last, full name, username)
+- B: company, position, current work
+- C: skills, industries, roles played, worked in
+- D: city, chapter, college
+
+``refresh_documents`` rebuilds it with a single ``UPDATE`` per call. A
+``post_save`` receiver (``api.signals``) covers single saves, and the import
+engines refresh each chunk they write (``bulk_create``/``bulk_update`` send
+no signals). ``rebuild_search_documents`` backfills the whole table.
+
+The column has a GIN index, so ``search_members`` matches a query without
+scanning the table, and ranks the matches with ``ts_rank``. On other
+databases the document is left empty and nothing is searchable.
+
+Contact lookup
+--------------
+``fuzzy_search`` serves the search-as-you-type boxes (chat contacts, user
+locations). It matches names by trigram word similarity (pg_trgm's ``%>``,
+backed by GIN trigram indexes on username, first and last name), so a typo
+or a partial word still finds the person. It ranks by the best similarity
+across the fields and stops at ``FUZZY_LIMIT`` rows, all in one query.
+Matching is as loose as ``pg_trgm.word_similarity_threshold`` allows
+(0.6 by default).
+"""
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connections
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db.models import F, FloatField, Q, TextField
+from django.db.models.functions import Cast, Greatest
+
+DEFAULTS = {
+    "CONFIG": "simple",   # text search configuration; "simple" does not stem names
+    "BATCH_SIZE": 5000,   # users per UPDATE in rebuild_search_documents
+    "FUZZY_LIMIT": 40,    # rows returned by fuzzy_search
+}
+
+NAME_FIELDS = ("username", "first_name", "last_name")
+
+# weight -> fields; JSON list fields are indexed as their JSON text
+DOCUMENT_FIELDS = {
+    "A": ["first_name", "last_name", "name", "username"],
+    "B": ["company", "position", "current_work"],
+    "C": ["professional_skills", "industries_worked_in", "roles_played", "Worked_in"],
+    "D": ["city", "chapter", "college_name"],
+}
+JSON_FIELDS = {"professional_skills", "industries_worked_in", "roles_played", "Worked_in"}
+
+# Saving only these fields leaves the document as it was.
+INDEXED_FIELDS = {field for fields in DOCUMENT_FIELDS.values() for field in fields}
+
+
+def get_setting(name):
+    return getattr(settings, "MEMBER_SEARCH", {}).get(name, DEFAULTS[name])
+
+
+def is_supported(using="default"):
+    return connections[using].vendor == "postgresql"
+
+
+def document():
+    """The weighted ``SearchVector`` expression for a user row."""
+    config = get_setting("CONFIG")
+    vector = None
+    for weight, fields in DOCUMENT_FIELDS.items():
+        expressions = [Cast(F(field), TextField()) if field in JSON_FIELDS else F(field) for field in fields]
+        part = SearchVector(*expressions, weight=weight, config=config)
+        vector = part if vector is None else vector + part
+    return vector
+
+
+def refresh_documents(queryset):
+    """
+    Rebuild ``search_document`` for every user in ``queryset``.
+
+    Returns:
+        The number of rows updated (0 on databases without full-text search)
+    """
+    if not is_supported(queryset.db):
+        return 0
+    return queryset.order_by().update(search_document=document())
+
+
+def search_members(queryset, text):
+    """
+    Users in ``queryset`` matching ``text``, annotated with ``rank``.
+
+    ``text`` uses web search syntax: words, ``"quoted phrases"``, ``or``
+    and ``-excluded`` words.
+    """
+    query = SearchQuery(text, search_type="websearch", config=get_setting("CONFIG"))
+    return queryset.filter(search_document=query).annotate(
+        # ts_rank is a float4; as float8 the rank a cursor carries compares
+        # equal to the rank in the table, so tied rows are not repeated.
+        rank=Cast(SearchRank(F("search_document"), query), FloatField()),
+    )
+
+
+def rebuild_all(batch_size=None):
+    """Refresh every user's document in primary-key batches; returns the count."""
+    User = get_user_model()
+    batch_size = batch_size or get_setting("BATCH_SIZE")
+    total, last_pk = 0, 0
+    while True:
+        pks = list(
+            User.objects.filter(pk__gt=last_pk).order_by("pk").values_list("pk", flat=True)[:batch_size]
+        )
+        if not pks:
+            return total
+        total += refresh_documents(User.objects.filter(pk__in=pks))
+        last_pk = pks[-1]
+
+
+def fuzzy_search(queryset, text, fields=NAME_FIELDS, limit=None):
+    """
+    The rows of ``queryset`` whose ``fields`` best match ``text``, best first.
+
+    ``fields`` may follow relations (``"user__first_name"``). On PostgreSQL
+    matches are typo-tolerant and ranked by similarity; elsewhere they are
+    case-insensitive substring matches in id order.
+
+    Returns:
+        A sliced queryset of at most ``limit`` (default ``FUZZY_LIMIT``) rows;
+        the first rows by id when ``text`` is blank
+    """
+    limit = limit or get_setting("FUZZY_LIMIT")
+    text = text.strip()
+    if not text:
+        return queryset.order_by("pk")[:limit]
+    if not is_supported(queryset.db) or len(text) < 2:
+        # One letter shares too few trigrams to match; a prefix is what the user means.
+        lookup = "icontains" if len(text) > 1 else "istartswith"
+        match = Q()
+        for field in fields:
+            match |= Q(**{f"{field}__{lookup}": text})
+        return queryset.filter(match).order_by("pk")[:limit]
+
+    match = Q()
+    for field in fields:
+        match |= Q(**{f"{field}__trigram_word_similar": text})
+    score = Greatest(*(TrigramWordSimilarity(text, field) for field in fields))
+    return queryset.filter(match).annotate(match_score=score).order_by("-match_score", "pk")[:limit]
@@ -8,9 +8,67 @@ User = get_user_model()
 class PendingSignupSerializer(serializers.ModelSerializer):
     class Meta:
         model = models.PendingSignup
-        fields = '__all__'
+        # The raw password waits here until approval; never send it out.
+        exclude = ['password']
 
-class UserSerializer(serializers.ModelSerializer):
+class PendingSignupListSerializer(serializers.ModelSerializer):
+    """Compact row for the approval queue table."""
+    class Meta:
+        model = models.PendingSignup
+        fields = [
+            'id', 'username', 'email', 'first_name', 'last_name', 'role',
+            'college_name', 'course', 'passed_out_year', 'phone', 'created_at',
+        ]
+
+class SparseFieldsMixin:
+    """
+    Lets a ``ModelSerializer`` emit only some of its fields.
+
+    ``Meta.views`` names field subsets (``None`` meaning every field). A
+    client picks one with ``?view=`` or lists fields with ``?fields=a,b``;
+    ``fields_from_request`` turns that into the ``fields=`` kwarg, and
+    ``project`` narrows the queryset's SQL column list to match.
+    """
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+    @classmethod
+    def fields_from_request(cls, request, default_view='full'):
+        """
+        Field names selected by ``?fields=`` or ``?view=``.
+
+        Raises:
+            serializers.ValidationError: on an unknown view or field name
+
+        Returns:
+            A list of field names, or ``None`` for every field
+        """
+        requested = request.query_params.get('fields') if request else None
+        if requested:
+            fields = [name.strip() for name in requested.split(',') if name.strip()]
+            unknown = set(fields) - set(cls.Meta.fields)
+            if unknown:
+                raise serializers.ValidationError({"error": f"Unknown fields: {', '.join(sorted(unknown))}."})
+            return fields
+        view = (request.query_params.get('view') if request else None) or default_view
+        if view not in cls.Meta.views:
+            raise serializers.ValidationError({"error": f"view must be one of: {', '.join(cls.Meta.views)}."})
+        return cls.Meta.views[view]
+
+    @classmethod
+    def project(cls, queryset, fields, extra=()):
+        """``queryset`` loading only the columns behind ``fields`` (plus ``extra``)."""
+        if fields is None:
+            fields = cls.Meta.fields
+        concrete = {field.name for field in cls.Meta.model._meta.concrete_fields}
+        return queryset.only(*({'id', *fields, *extra} & concrete))
+
+
+class UserSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = User
         fields = [
@@ -28,12 +86,48 @@ class UserSerializer(serializers.ModelSerializer):
             'cover_photo', 'bio', 'passed_out_year', 'current_work',
             'Worked_in', 'experience'
         ]
+        views = {
+            # Avatar, name and where they work.
+            'card': [
+                'id', 'username', 'first_name', 'last_name', 'salutation', 'profile_photo',
+                'company', 'position', 'current_work',
+            ],
+            # A directory row.
+            'list': [
+                'id', 'username', 'email', 'first_name', 'last_name', 'salutation', 'profile_photo',
+                'company', 'position', 'current_work', 'role', 'course', 'stream', 'course_end_year',
+                'passed_out_year', 'college_name', 'chapter', 'city', 'country', 'phone',
+            ],
+            'full': None,
+        }
         extra_kwargs = {'password': {'write_only': True}}
 
+class DuplicateMemberSerializer(serializers.ModelSerializer):
+    """The fields a reviewer compares side by side."""
+    class Meta:
+        model = User
+        fields = [
+            'id', 'username', 'email', 'first_name', 'last_name', 'name', 'date_of_birth',
+            'roll_no', 'course', 'course_end_year', 'college_name', 'date_joined', 'last_login',
+        ]
+
+class DuplicateCandidateSerializer(serializers.ModelSerializer):
+    user_a = DuplicateMemberSerializer(read_only=True)
+    user_b = DuplicateMemberSerializer(read_only=True)
+
+    class Meta:
+        model = models.DuplicateCandidate
+        fields = ['id', 'score', 'reasons', 'status', 'user_a', 'user_b', 'reviewed_at', 'created_at']
+
 class LoginLogSerializer(serializers.ModelSerializer):
     class Meta:
         model = models.LoginLog
         fields = ['id', 'user', 'user_agent', 'timestamp']
+
+class LoginLogDailySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = models.LoginLogDaily
+        fields = ['id', 'user', 'day', 'login_count', 'first_login', 'last_login']
 class memberSerializer(serializers.ModelSerializer):
     class Meta:
         model = models.CustomUser
@@ -149,7 +243,7 @@ class UserLocationSerializer(serializers.ModelSerializer):
     def get_user_details(self, obj):
         user = obj.user
         if user:
-            return UserSerializer(user).data
+            return UserSerializer(user, fields=self.context.get('user_fields')).data
         return None
     
     def create(self, validated_data):
@@ -0,0 +1,32 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from . import search
+from .token_cache import invalidate_users, token_cache
+
+User = get_user_model()
+
+
+@receiver(post_delete, sender=Token)
+def invalidate_deleted_token(sender, instance, **kwargs):
+    """Logout (and admin token deletion) must stop the token resolving."""
+    token_cache.invalidate(instance.key)
+    # A worker loading the token right now must not cache it again.
+    token_cache.bump_generations([instance.user_id])
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_tokens(sender, instance, **kwargs):
+    """Password changes, deactivation and profile edits refresh the cached user."""
+    invalidate_users([instance.pk])
+
+
+@receiver(post_save, sender=User)
+def refresh_search_document(sender, instance, update_fields=None, **kwargs):
+    """Keep the member's full-text document in step with the profile."""
+    if update_fields is not None and not search.INDEXED_FIELDS & set(update_fields):
+        return
+    search.refresh_documents(User.objects.filter(pk=instance.pk))
@@ -0,0 +1,127 @@
+"""
+Signups
+=======
+Turning ``PendingSignup`` rows into users, one at a time or in bulk.
+
+``approve`` builds every user in memory, hashes all passwords in one
+``api.hashing`` batch (each exactly once), inserts them with one ``bulk_create``, deletes the pending rows with one
+DELETE, builds their search documents with one UPDATE and queues all
+notifications with one INSERT into the mail outbox. Everything happens in a
+single transaction.
+"""
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Q
+
+from . import search
+from .hashing import hash_passwords
+from .mail import enqueue_many
+from .models import PendingSignup
+
+User = get_user_model()
+
+# Fields that are never copied from the pending row.
+SKIP_FIELDS = {"id", "password", "last_login", "date_joined", "is_superuser", "is_staff", "is_active"}
+
+# User columns that also exist on PendingSignup, resolved once.
+COPIED_FIELDS = [
+    field for field in User._meta.concrete_fields
+    if field.name not in SKIP_FIELDS and field.name in {f.name for f in PendingSignup._meta.concrete_fields}
+]
+
+APPROVED_MAIL = ('Your Account Has Been Approved', 'Your account has been approved.\nUsername: {username}')
+DENIED_MAIL = ('Signup Request Denied', 'Your signup request has been denied by the administrator.')
+
+
+def user_from_pending(pending):
+    """Build an unsaved, active user from ``pending``; the caller sets the password."""
+    user = User(is_superuser=False, is_active=True)
+    for field in COPIED_FIELDS:
+        value = getattr(pending, field.name)
+        if value is None and not field.null:
+            value = field.get_default()
+        setattr(user, field.name, value)
+    # bulk_create skips CustomUser.save(), which normally derives is_staff
+    # and normalizes the tag lists.
+    user.update_is_staff()
+    user.normalize_tag_fields()
+    return user
+
+
+def pending_queryset(emails=(), ids=()):
+    """Unapproved signups matching any of ``emails`` or ``ids``."""
+    return PendingSignup.objects.filter(is_approved=False).filter(
+        Q(email__in=list(emails)) | Q(pk__in=list(ids))
+    )
+
+
+def find_conflicts(pendings):
+    """
+    Return ``{pending.pk: reason}`` for signups whose username or email is
+    already a user, or is also used by an older signup in ``pendings``.
+    """
+    emails = {p.email for p in pendings}
+    usernames = {p.username for p in pendings}
+    taken = list(
+        User.objects.filter(Q(email__in=emails) | Q(username__in=usernames)).values_list("email", "username")
+    )
+    taken_emails = {email for email, _ in taken}
+    taken_usernames = {username for _, username in taken}
+
+    conflicts = {}
+    batch_emails, batch_usernames = set(), set()
+    for pending in sorted(pendings, key=lambda p: p.pk):
+        if pending.email in taken_emails:
+            conflicts[pending.pk] = "Email already taken."
+        elif pending.username in taken_usernames:
+            conflicts[pending.pk] = "Username already taken."
+        elif pending.email in batch_emails:
+            conflicts[pending.pk] = "Email used by another signup in this batch."
+        elif pending.username in batch_usernames:
+            conflicts[pending.pk] = "Username used by another signup in this batch."
+        else:
+            batch_emails.add(pending.email)
+            batch_usernames.add(pending.username)
+    return conflicts
+
+
+def approve(pendings, from_email=None):
+    """
+    Create users for ``pendings`` and remove the pending rows.
+
+    Signups that clash with an existing user, or with an older signup in the
+    same batch, are left pending.
+
+    Returns:
+        ``(users, conflicts)`` where ``conflicts`` maps pending id to a reason
+    """
+    pendings = list(pendings)
+    conflicts = find_conflicts(pendings)
+    approved = [p for p in pendings if p.pk not in conflicts]
+    users = [user_from_pending(p) for p in approved]
+    # PendingSignup keeps the raw password until approval.
+    for user, hashed in zip(users, hash_passwords(p.password for p in approved)):
+        user.password = hashed
+
+    with transaction.atomic():
+        users = User.objects.bulk_create(users, batch_size=500)
+        PendingSignup.objects.filter(pk__in=[p.pk for p in approved]).delete()
+        # bulk_create sends no post_save, so the search receiver never ran.
+        search.refresh_documents(User.objects.filter(email__in=[user.email for user in users]))
+        subject, body = APPROVED_MAIL
+        enqueue_many(
+            [(subject, body.format(username=p.username), [p.email]) for p in approved],
+            from_email=from_email,
+        )
+    return users, conflicts
+
+
+def deny(pendings, from_email=None):
+    """Delete ``pendings`` and queue a denial notice for each. Returns the count."""
+    pendings = list(pendings)
+    with transaction.atomic():
+        PendingSignup.objects.filter(pk__in=[p.pk for p in pendings]).delete()
+        subject, body = DENIED_MAIL
+        enqueue_many([(subject, body, [p.email]) for p in pendings], from_email=from_email)
+    return len(pendings)
@@ -1,3 +1,1216 @@
-from django.test import TestCase
+import csv
+import io
+import os
+import shutil
+import tempfile
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from smtplib import SMTPException
+from unittest import mock, skipIf, skipUnless
 
-# Create your tests here.
+import pandas as pd
+from PIL import Image
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import check_password, is_password_usable
+from django.core import mail
+from django.core.cache import caches
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import IntegrityError, OperationalError, connection
+from django.test import RequestFactory, TestCase, override_settings
+from django.utils import timezone
+from openpyxl import Workbook
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from . import (
+    dedupe, hashing, import_jobs, importers, ingest, login_service, otp, photos, signed_tokens, signups, user_agents,
+)
+from .checks import check_shared_caches
+from .login_recorder import LoginLogRecorder, login_recorder
+from .mail import backoff, claim_batch, enqueue_mail, enqueue_many, send_batch
+from .middleware import UserAgentMiddleware
+from .models import (
+    DuplicateCandidate, Events, ImportJob, LoginLog, OutboundEmail, PendingSignup, SignupOTP, normalize_tags,
+)
+from .pagination import encode_cursor
+from .serializers import PendingSignupListSerializer, UserSerializer
+from .token_cache import generation_key, invalidate_users, token_cache, user_cache
+
+
+User = get_user_model()
+
+LOCMEM_CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+DATABASE_CACHES = {"default": {"BACKEND": "django.core.cache.backends.db.DatabaseCache", "LOCATION": "django_cache"}}
+
+
+def sheet_row(i, **changes):
+    row = {
+        "username": f"sheet{i}", "email": f"sheet{i}@example.com", "first_name": "Asha", "last_name": f"L{i}",
+        "salutation": "Ms", "gender": "F", "date_of_birth": "1/2/1990", "current_work": "Engineer",
+        "Roles Played": "Mentor", "experience": 3, "chapter": "Chennai", "college_name": "KCE", "phone": "9000000000",
+        "Address": "1 Main St", "city": "Coimbatore", "State": "TN", "Country": "IN", "zip_code": "641021",
+        "role": "Student", "Course End Year": "2012", "worked_In": "Acme",
+    }
+    row.update(changes)
+    return row
+
+
+def sheet(rows, name="users.csv"):
+    return SimpleUploadedFile(name, pd.DataFrame(rows).to_csv(index=False).encode())
+
+
+def workbook(rows):
+    """An in-memory xlsx file holding ``rows`` (the first one is the header)."""
+    book = Workbook()
+    for row in rows:
+        book.active.append(row)
+    out = io.BytesIO()
+    book.save(out)
+    out.seek(0)
+    return out
+
+
+def image_bytes(fmt="JPEG", size=(800, 600)):
+    out = io.BytesIO()
+    Image.new("RGB", size, "teal").save(out, fmt)
+    return out.getvalue()
+
+
+def zip_archive(entries):
+    out = io.BytesIO()
+    with zipfile.ZipFile(out, "w") as archive:
+        for name, data in entries.items():
+            archive.writestr(name, data)
+    out.seek(0)
+    return out
+
+
+class CacheIsolationMixin:
+    """Cache entries outlive each test's transaction, so every test starts with empty caches."""
+
+    def setUp(self):
+        super().setUp()
+        for cache in caches.all():
+            cache.clear()
+        token_cache.clear_local()
+        user_cache.clear_local()
+        self.addCleanup(token_cache.clear_local)
+        self.addCleanup(user_cache.clear_local)
+
+
+class TempMediaRootMixin:
+    """Uploads and generated files go to a throwaway MEDIA_ROOT."""
+
+    def setUp(self):
+        super().setUp()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+
+####################################
+# Login and token authentication
+####################################
+
+class TokenAuthTests(CacheIsolationMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user("asha", "asha@example.com", "s3cret-pw", role="Student")
+        self.client = APIClient()
+
+    def login(self, **extra):
+        response = self.client.post("/login/user/", {"username": "asha", "password": "s3cret-pw", **extra})
+        self.assertEqual(response.status_code, 200)
+        login_recorder.flush()
+        return response.data["token"]
+
+    def test_login_and_logout(self):
+        key = self.login()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {key}")
+        self.assertEqual(self.client.get("/profile/").status_code, 200)
+        self.assertEqual(self.client.post("/logout/").status_code, 200)
+        self.assertEqual(self.client.get("/profile/").status_code, 401)
+
+    def test_wrong_password_is_rejected(self):
+        response = self.client.post("/login/user/", {"username": "asha", "password": "nope"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_cached_user_has_no_password_hash(self):
+        key = self.login()
+        generation, token = token_cache.shared.get(token_cache.shared_key(key))
+        self.assertNotIn("password", token.user.__dict__)
+        self.assertNotIn("password", token_cache.get(key).user.__dict__)
+        # Deferred, so it still loads when needed.
+        self.assertTrue(token_cache.get(key).user.check_password("s3cret-pw"))
+
+    def test_saving_a_trimmed_user_keeps_the_password(self):
+        key = self.login()
+        user = token_cache.get(key).user
+        user.first_name = "Renamed"
+        user.save()
+        self.assertTrue(User.objects.get(pk=self.user.pk).check_password("s3cret-pw"))
+
+    def test_profile_change_reaches_the_cache(self):
+        key = self.login()
+        token_cache.get(key)
+        self.user.is_active = False
+        self.user.save()
+        token_cache.clear_local()
+        self.assertFalse(token_cache.get(key).user.is_active)
+
+    def test_stale_set_after_invalidation_is_ignored(self):
+        token = Token.objects.create(user=self.user)
+        generation = token_cache.generation(self.user.pk)
+        stale = Token.objects.select_related("user").get(pk=token.pk)
+        invalidate_users([self.user.pk])
+        # A load that started before the invalidation lands after it.
+        token_cache.set(token.key, stale, generation=generation)
+        token_cache.clear_local()
+        misses = token_cache.misses
+        token_cache.get(token.key)
+        self.assertEqual(token_cache.misses, misses + 1)
+
+    def test_invalidate_users_for_bulk_writes(self):
+        user_cache.get(self.user.pk)
+        User.objects.filter(pk=self.user.pk).update(city="Madurai")
+        invalidate_users([self.user.pk])
+        user_cache.clear_local()
+        self.assertEqual(user_cache.get(self.user.pk).city, "Madurai")
+
+    def test_lost_generation_does_not_revive_stale_entries(self):
+        token = Token.objects.create(user=self.user)
+        token_cache.get(token.key)
+        User.objects.filter(pk=self.user.pk).update(city="Madurai")
+        invalidate_users([self.user.pk])
+        # Culled or expired: the old entry's generation must not match again.
+        token_cache.shared.delete(generation_key(self.user.pk))
+        token_cache.shared.set(token_cache.shared_key(token.key), (0, token), 300)
+        token_cache.clear_local()
+        self.assertEqual(token_cache.get(token.key).user.city, "Madurai")
+
+    def test_deleted_token_stops_resolving(self):
+        token = Token.objects.create(user=self.user)
+        key = token.key
+        token_cache.get(key)
+        token.delete()
+        self.assertIsNone(token_cache.get(key))
+        self.assertIsNotNone(token_cache.shared.get(generation_key(self.user.pk)))
+
+    def test_signed_token_login_and_revoke(self):
+        key = self.login(token_type="signed")
+        self.assertTrue(signed_tokens.is_signed(key))
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {key}")
+        self.assertEqual(self.client.get("/profile/").status_code, 200)
+        self.assertEqual(self.client.post("/logout/").status_code, 200)
+        self.assertEqual(self.client.get("/profile/").status_code, 401)
+
+    def test_revoke_wins_over_a_late_cache_fill(self):
+        key = signed_tokens.issue(self.user)
+        signed_tokens.revoke_all(self.user)
+        # A verify that read the old generation before the revoke only adds it.
+        cache = caches[signed_tokens.get_setting("CACHE_ALIAS")]
+        cache.add(signed_tokens._generation_key(self.user.pk), self.user.token_generation - 1, 300)
+        with self.assertRaises(signed_tokens.SignedTokenError):
+            signed_tokens.verify(key)
+
+    def test_tampered_signed_token_is_rejected(self):
+        key = signed_tokens.issue(self.user)
+        with self.assertRaises(signed_tokens.SignedTokenError):
+            signed_tokens.verify(key[:-2] + ("AA" if not key.endswith("AA") else "BB"))
+
+    @override_settings(CACHES=LOCMEM_CACHES, DEBUG=False)
+    def test_process_local_cache_fails_the_system_check(self):
+        errors = check_shared_caches(None)
+        self.assertTrue(errors)
+        self.assertEqual({error.id for error in errors}, {"api.E001"})
+
+    @override_settings(CACHES=DATABASE_CACHES, DEBUG=False)
+    def test_database_cache_is_only_accepted_with_debug(self):
+        self.assertEqual({error.id for error in check_shared_caches(None)}, {"api.E001"})
+        with self.settings(DEBUG=True):
+            self.assertEqual(check_shared_caches(None), [])
+
+
+@override_settings(LOGIN_LOG_BUFFER={"MAX_BATCH": 3, "FLUSH_INTERVAL": 60})
+class LoginRecorderTests(CacheIsolationMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user("asha", "asha@example.com", "pw", role="Student")
+        self.recorder = LoginLogRecorder()
+        # Flush on demand only, never from a timer thread.
+        patcher = mock.patch.object(self.recorder, "_schedule")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_events_wait_for_a_flush(self):
+        self.recorder.record(self.user, user_agent="PC / Linux / Firefox 120.0", update_last_login=True)
+        self.assertFalse(LoginLog.objects.exists())
+        self.assertEqual(self.recorder.stats()["buffered"], 1)
+
+        self.recorder.flush()
+        log = LoginLog.objects.get()
+        self.assertEqual((log.user_id, log.user_agent), (self.user.pk, "PC / Linux / Firefox 120.0"))
+        self.assertEqual(User.objects.get(pk=self.user.pk).last_login, log.timestamp)
+        self.assertEqual(self.recorder.stats(), {"buffered": 0, "flushed": 1, "dropped": 0})
+
+    def test_flush_refreshes_cached_users(self):
+        user_cache.get(self.user.pk)
+        self.recorder.record(self.user, update_last_login=True)
+        self.recorder.flush()
+        user_cache.clear_local()
+        self.assertEqual(user_cache.get(self.user.pk).last_login, LoginLog.objects.get().timestamp)
+
+    def test_a_full_batch_flushes_itself(self):
+        for _ in range(3):
+            self.recorder.record(self.user)
+        self.assertEqual(LoginLog.objects.count(), 3)
+        self.assertEqual(self.recorder.stats()["buffered"], 0)
+
+    def test_latest_login_wins(self):
+        now = timezone.now()
+        self.recorder.record(self.user, update_last_login=True, timestamp=now)
+        self.recorder.record(self.user, update_last_login=True, timestamp=now - timedelta(minutes=5))
+        self.recorder.flush()
+        self.assertEqual(User.objects.get(pk=self.user.pk).last_login, now)
+
+    @override_settings(LOGIN_LOG_BUFFER={"ENABLED": False})
+    def test_disabled_buffer_writes_immediately(self):
+        self.recorder.record(self.user)
+        self.assertEqual(LoginLog.objects.count(), 1)
+
+    @override_settings(LOGIN_LOG_BUFFER={"MAX_BUFFER": 1, "FLUSH_INTERVAL": 60})
+    def test_a_full_buffer_drops_events(self):
+        with self.assertLogs("api.login_recorder", "WARNING"):
+            self.recorder.record(self.user)
+            self.recorder.record(self.user)
+        self.recorder.flush()
+        self.assertEqual(LoginLog.objects.count(), 1)
+        self.assertEqual(self.recorder.stats()["dropped"], 1)
+
+    def test_events_of_deleted_users_are_dropped(self):
+        ghost = User.objects.create_user("ghost", "ghost@example.com", "pw", role="Student")
+        self.recorder.record(self.user)
+        self.recorder.record(ghost)
+        ghost_id = ghost.pk
+        ghost.delete()
+        real_bulk_create = LoginLog.objects.bulk_create
+
+        def bulk_create(logs, **kwargs):
+            # SQLite defers foreign key checks to the commit; fail the way PostgreSQL does.
+            if any(log.user_id == ghost_id for log in logs):
+                raise IntegrityError("violates foreign key constraint")
+            return real_bulk_create(logs, **kwargs)
+
+        with mock.patch.object(LoginLog.objects, "bulk_create", bulk_create):
+            self.recorder.flush()
+        self.assertEqual(list(LoginLog.objects.values_list("user_id", flat=True)), [self.user.pk])
+        self.assertEqual(self.recorder.stats()["dropped"], 1)
+
+
+@override_settings(LOGIN_LOG_BUFFER={"ENABLED": False})
+class LoginServiceTests(CacheIsolationMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.student = User.objects.create_user("asha", "asha@example.com", "pw", role="Student")
+        self.staff = User.objects.create_user("ravi", "ravi@example.com", "pw", role="Staff")
+        self.admin = User.objects.create_superuser("root", "root@example.com", "pw")
+
+    def test_role_gates(self):
+        allowed = {self.student: {"user"}, self.staff: {"user", "staff"}, self.admin: {"user", "staff", "admin"}}
+        for user, roles in allowed.items():
+            for role in ("user", "staff", "admin"):
+                with self.subTest(user=user.username, role=role):
+                    if role in roles:
+                        self.assertEqual(login_service.login(user.username, "pw", role=role)[0], user)
+                    else:
+                        with self.assertRaises(login_service.LoginError):
+                            login_service.login(user.username, "pw", role=role)
+
+    def test_email_or_username(self):
+        self.assertEqual(login_service.login("asha@example.com", "pw")[0], self.student)
+        self.assertEqual(login_service.login("asha", "pw")[0], self.student)
+        with self.assertRaises(login_service.LoginError):
+            login_service.login("nobody", "pw")
+
+    def test_inactive_user_is_rejected(self):
+        self.student.is_active = False
+        self.student.save()
+        with self.assertRaises(login_service.LoginError):
+            login_service.login("asha", "pw")
+
+    def test_token_is_reused(self):
+        first = login_service.login("asha", "pw")[1]
+        self.assertEqual(login_service.login("asha", "pw")[1], first)
+        self.assertEqual(Token.objects.filter(user=self.student).count(), 1)
+
+    def test_views_apply_their_gate(self):
+        response = APIClient().post("/login/staff/", {"username": "asha", "password": "pw"})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, {"error": "Invalid credentials or not staff"})
+        self.assertEqual(APIClient().post("/login/staff/", {"username": "ravi", "password": "pw"}).status_code, 200)
+        self.assertEqual(APIClient().post("/login/admin/", {"username": "ravi", "password": "pw"}).status_code, 400)
+        self.assertEqual(APIClient().post("/login/admin/", {"username": "root", "password": "pw"}).status_code, 200)
+
+
+####################################
+# Login history and user agents
+####################################
+
+class LoginHistoryPaginationTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("asha", "asha@example.com", "pw")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        now = timezone.now()
+        LoginLog.objects.bulk_create([LoginLog(user=self.user, timestamp=now - timedelta(hours=i)) for i in range(7)])
+
+    def test_pages_cover_every_login_once(self):
+        seen, cursor = [], None
+        while True:
+            params = {"page_size": 3, **({"cursor": cursor} if cursor else {})}
+            response = self.client.get("/login-history/", params)
+            self.assertEqual(response.status_code, 200)
+            seen += [entry["timestamp"] for entry in response.data["results"]]
+            cursor = response.data["next"]
+            if not cursor:
+                break
+        self.assertEqual(len(seen), 7)
+        self.assertEqual(len(set(seen)), 7)
+
+    def test_malformed_cursors_are_rejected(self):
+        cursors = [
+            "not base64 at all!",
+            encode_cursor([]),
+            encode_cursor(["weekly"]),
+            encode_cursor(["raw", "2024-01-01T00:00:00"]),
+            encode_cursor(["raw", "yesterday", 1]),
+            encode_cursor(["raw", "2024-01-01T00:00:00", "1"]),
+            encode_cursor(["daily", "2024-13-45", 1]),
+            encode_cursor(["daily", 20240101, 1]),
+            encode_cursor(["raw", "2024-01-01T00:00:00", 1, 2]),
+        ]
+        for cursor in cursors:
+            with self.subTest(cursor=cursor):
+                response = self.client.get("/login-history/", {"cursor": cursor})
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.data, {"error": "Invalid cursor."})
+
+
+class UserAgentTests(TestCase):
+    CHROME = (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/120.0.0.0 Safari/537.36"
+    )
+
+    def setUp(self):
+        user_agents._parse_cached.cache_clear()
+        self.addCleanup(user_agents._parse_cached.cache_clear)
+
+    def test_repeat_strings_are_parsed_once(self):
+        first = user_agents.parse_user_agent(self.CHROME)
+        self.assertIs(user_agents.parse_user_agent(self.CHROME.encode()), first)
+        stats = user_agents.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["hit_rate"]), (1, 1, 0.5))
+
+    def test_long_strings_are_not_cached(self):
+        user_agents.parse_user_agent(self.CHROME + " x" * user_agents.get_setting("MAX_LENGTH"))
+        self.assertEqual(user_agents.stats()["size"], 0)
+
+    def test_summary(self):
+        self.assertEqual(
+            user_agents.summarize(user_agents.parse_user_agent(self.CHROME)), "PC / Windows 10 / Chrome 120.0.0"
+        )
+        self.assertEqual(user_agents.summarize(user_agents.parse_user_agent("")), "")
+
+    def test_middleware_parses_on_first_use(self):
+        request = RequestFactory().get("/", HTTP_USER_AGENT=self.CHROME)
+        with mock.patch("api.middleware.get_user_agent", wraps=user_agents.get_user_agent) as get_user_agent:
+            UserAgentMiddleware(lambda request: None)(request)
+            get_user_agent.assert_not_called()
+            self.assertTrue(request.user_agent.is_pc)
+            self.assertEqual(request.user_agent.browser.family, "Chrome")
+        get_user_agent.assert_called_once_with(request)
+
+
+####################################
+# Signup, approval and mail
+####################################
+
+class SignupOTPTests(CacheIsolationMixin, TestCase):
+
+    def test_code_verifies_once_issued(self):
+        code = otp.issue("New@Example.com")
+        self.assertTrue(otp.verify("new@example.com", code))
+        otp.consume("new@example.com")
+        self.assertFalse(otp.verify("new@example.com", code))
+
+    def test_wrong_guesses_burn_the_code(self):
+        code = otp.issue("new@example.com")
+        wrong = "000000" if code != "000000" else "111111"
+        for _ in range(otp.get_setting("MAX_ATTEMPTS")):
+            self.assertFalse(otp.verify("new@example.com", wrong))
+        self.assertFalse(otp.verify("new@example.com", code))
+
+    def test_new_code_replaces_the_old_one(self):
+        first = otp.issue("new@example.com")
+        second = otp.issue("new@example.com")
+        self.assertTrue(otp.verify("new@example.com", second))
+        if first != second:
+            self.assertFalse(otp.verify("new@example.com", first))
+
+    @override_settings(CACHES=LOCMEM_CACHES)
+    def test_process_local_cache_uses_the_database(self):
+        code = otp.issue("new@example.com")
+        self.assertTrue(SignupOTP.objects.filter(email="new@example.com").exists())
+        self.assertTrue(otp.verify("new@example.com", code))
+
+    def test_unreachable_cache_falls_back_to_the_database(self):
+        with mock.patch.object(otp, "_cache", side_effect=ConnectionError("cache down")), \
+                self.assertLogs("api.otp", "WARNING"):
+            code = otp.issue("new@example.com")
+            self.assertTrue(otp.verify("new@example.com", code))
+        self.assertTrue(SignupOTP.objects.filter(email="new@example.com").exists())
+
+    def test_endpoint_sends_mail_and_throttles_per_address(self):
+        client = APIClient()
+        statuses = [client.post("/signup-otp/", {"email": "new@example.com"}).status_code for _ in range(6)]
+        self.assertEqual(statuses, [200] * 5 + [429])
+        self.assertEqual(OutboundEmail.objects.filter(to=["new@example.com"]).count(), 5)
+        self.assertEqual(client.post("/signup-otp/", {"email": "other@example.com"}).status_code, 200)
+
+
+class MailOutboxTests(TestCase):
+
+    def test_enqueue_only_queues(self):
+        email = enqueue_mail("Hi", "Body", ["a@example.com"])
+        self.assertEqual(email.status, OutboundEmail.STATUS_PENDING)
+        self.assertEqual(mail.outbox, [])
+
+    def test_enqueue_many_inserts_every_message(self):
+        enqueue_many([("One", "1", ["a@example.com"]), ("Two", "2", ["b@example.com"])], from_email="x@example.com")
+        self.assertEqual(
+            sorted(OutboundEmail.objects.values_list("subject", "from_email")),
+            [("One", "x@example.com"), ("Two", "x@example.com")],
+        )
+
+    def test_send_batch_delivers_due_messages(self):
+        enqueue_mail("Hi", "Body", ["a@example.com"])
+        enqueue_mail("Later", "Body", ["b@example.com"])
+        OutboundEmail.objects.filter(subject="Later").update(next_attempt_at=timezone.now() + timedelta(hours=1))
+
+        self.assertEqual(send_batch(), (1, 0))
+        self.assertEqual([message.subject for message in mail.outbox], ["Hi"])
+        sent = OutboundEmail.objects.get(subject="Hi")
+        self.assertEqual(sent.status, OutboundEmail.STATUS_SENT)
+        self.assertEqual(sent.attempts, 1)
+        self.assertIsNotNone(sent.sent_at)
+        self.assertEqual(sent.body, "")
+
+    def test_failed_send_is_retried_with_backoff(self):
+        email = enqueue_mail("Hi", "Body", ["a@example.com"])
+        with mock.patch("django.core.mail.backends.locmem.EmailBackend.send_messages",
+                        side_effect=SMTPException("down")), self.assertLogs("api.mail", "WARNING"):
+            self.assertEqual(send_batch(), (0, 1))
+        email.refresh_from_db()
+        self.assertEqual(email.status, OutboundEmail.STATUS_PENDING)
+        self.assertEqual(email.attempts, 1)
+        self.assertIn("SMTPException", email.last_error)
+        self.assertGreater(email.next_attempt_at, timezone.now() + timedelta(seconds=50))
+        # Not due yet, so the next batch leaves it alone.
+        self.assertEqual(send_batch(), (0, 0))
+
+    @override_settings(EMAIL_OUTBOX={"MAX_ATTEMPTS": 2})
+    def test_gives_up_after_max_attempts(self):
+        email = enqueue_mail("Hi", "Body", ["a@example.com"])
+        with mock.patch("django.core.mail.backends.locmem.EmailBackend.send_messages",
+                        side_effect=SMTPException("down")), self.assertLogs("api.mail", "WARNING"):
+            send_batch()
+            OutboundEmail.objects.filter(pk=email.pk).update(next_attempt_at=timezone.now())
+            send_batch()
+        email.refresh_from_db()
+        self.assertEqual(email.status, OutboundEmail.STATUS_FAILED)
+        self.assertEqual(email.attempts, 2)
+        self.assertEqual(email.body, "")
+
+    def test_claimed_messages_are_hidden_from_other_workers(self):
+        email = enqueue_mail("Hi", "Body", ["a@example.com"])
+        self.assertEqual(claim_batch(10), [email])
+        self.assertEqual(send_batch(), (0, 0))
+        email.refresh_from_db()
+        self.assertEqual((email.status, email.attempts), (OutboundEmail.STATUS_PENDING, 1))
+        self.assertGreater(email.next_attempt_at, timezone.now() + timedelta(minutes=5))
+
+    def test_purge_deletes_old_finished_messages(self):
+        for status in (OutboundEmail.STATUS_SENT, OutboundEmail.STATUS_FAILED, OutboundEmail.STATUS_PENDING):
+            OutboundEmail.objects.create(subject=status, body="", to=["a@example.com"], status=status)
+        recent = OutboundEmail.objects.create(
+            subject="recent", body="", to=["a@example.com"], status=OutboundEmail.STATUS_SENT
+        )
+        OutboundEmail.objects.exclude(pk=recent.pk).update(created_at=timezone.now() - timedelta(days=31))
+
+        out = io.StringIO()
+        call_command("purge_outbox", stdout=out)
+        self.assertIn("Deleted 2", out.getvalue())
+        self.assertEqual(
+            sorted(OutboundEmail.objects.values_list("subject", flat=True)), ["pending", "recent"]
+        )
+
+    def test_backoff_doubles_up_to_the_cap(self):
+        self.assertEqual([backoff(n) for n in (1, 2, 3)], [60, 120, 240])
+        self.assertEqual(backoff(20), 3600)
+
+    def test_outbox_status_endpoint(self):
+        enqueue_mail("Hi", "Body", ["a@example.com"])
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user("member", "member@example.com", "pw", role="Student"))
+        self.assertEqual(client.get("/email-outbox/").status_code, 403)
+
+        client.force_authenticate(User.objects.create_superuser("root", "root@example.com", "pw"))
+        response = client.get("/email-outbox/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["counts"], {"pending": 1, "sent": 0, "failed": 0})
+        self.assertIsNotNone(response.data["oldest_pending"])
+
+
+class SignupApprovalTests(TestCase):
+    def pending(self, username, email):
+        return PendingSignup.objects.create(username=username, email=email, password="pending-pw")
+
+    def test_approve_creates_users_and_queues_mail(self):
+        self.pending("one", "one@example.com")
+        users, conflicts = signups.approve(PendingSignup.objects.all())
+        self.assertEqual(conflicts, {})
+        self.assertTrue(User.objects.get(username="one").check_password("pending-pw"))
+        self.assertFalse(PendingSignup.objects.exists())
+        self.assertEqual(OutboundEmail.objects.count(), 1)
+
+    def test_duplicates_within_the_batch_are_conflicts(self):
+        first = self.pending("one", "same@example.com")
+        second = self.pending("two", "same@example.com")
+        users, conflicts = signups.approve([second, first])
+        self.assertEqual([user.username for user in users], ["one"])
+        self.assertEqual(list(conflicts), [second.pk])
+        self.assertTrue(PendingSignup.objects.filter(pk=second.pk).exists())
+
+    def test_existing_user_is_a_conflict(self):
+        User.objects.create_user("taken", "taken@example.com", "pw")
+        pending = self.pending("fresh", "taken@example.com")
+        users, conflicts = signups.approve([pending])
+        self.assertEqual(users, [])
+        self.assertEqual(conflicts, {pending.pk: "Email already taken."})
+
+    def test_bulk_endpoint_reports_conflicts(self):
+        self.pending("one", "same@example.com")
+        self.pending("two", "same@example.com")
+        client = APIClient()
+        client.force_authenticate(User.objects.create_superuser("root", "root@example.com", "pw"))
+        response = client.post(
+            "/Approve-signup/bulk/", {"action": "approve", "emails": ["same@example.com"]}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["approved"], 1)
+        self.assertEqual(len(response.data["conflicts"]), 1)
+
+
+class PendingSignupQueueTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_superuser("root", "root@example.com", "pw"))
+        now = timezone.now()
+        for i in range(5):
+            pending = PendingSignup.objects.create(
+                username=f"new{i}", email=f"new{i}@example.com", password="pending-pw",
+                role="Student" if i % 2 else "Staff", college_name="KCE",
+            )
+            PendingSignup.objects.filter(pk=pending.pk).update(created_at=now - timedelta(days=5 - i))
+
+    def page_through(self, **params):
+        usernames, cursor = [], None
+        while True:
+            response = self.client.get("/Approve-signup/queue/", {**params, **({"cursor": cursor} if cursor else {})})
+            self.assertEqual(response.status_code, 200)
+            usernames += [row["username"] for row in response.data["results"]]
+            cursor = response.data["next"]
+            if not cursor:
+                return usernames
+
+    def test_pages_are_oldest_first_and_compact(self):
+        self.assertEqual(self.page_through(page_size=2), [f"new{i}" for i in range(5)])
+        row = self.client.get("/Approve-signup/queue/").data["results"][0]
+        self.assertEqual(set(row), set(PendingSignupListSerializer.Meta.fields))
+
+    def test_filters(self):
+        self.assertEqual(self.page_through(role="staff"), ["new0", "new2", "new4"])
+        after = (timezone.now() - timedelta(days=2, hours=12)).date().isoformat()
+        self.assertEqual(self.page_through(created_after=after), ["new3", "new4"])
+        response = self.client.get("/Approve-signup/queue/", {"created_after": "last week"})
+        self.assertEqual((response.status_code, response.data), (400, {"error": "Invalid created_after."}))
+
+    @override_settings(LIST_PAGINATION={"PAGE_SIZE": 3, "MAX_PAGE_SIZE": 4})
+    def test_page_sizes_come_from_settings(self):
+        self.assertEqual(len(self.client.get("/Approve-signup/queue/").data["results"]), 3)
+        self.assertEqual(len(self.client.get("/Approve-signup/queue/", {"page_size": 100}).data["results"]), 4)
+
+    def test_detail_never_includes_the_password(self):
+        pending = PendingSignup.objects.get(username="new0")
+        response = self.client.get(f"/Approve-signup/{pending.pk}/")
+        self.assertEqual(response.data["username"], "new0")
+        self.assertNotIn("password", response.data)
+        self.assertEqual(self.client.get("/Approve-signup/0/").status_code, 404)
+
+    def test_requires_an_admin(self):
+        member = APIClient()
+        member.force_authenticate(User.objects.create_user("member", "member@example.com", "pw", role="Student"))
+        self.assertEqual(member.get("/Approve-signup/queue/").status_code, 403)
+
+
+####################################
+# Imports
+####################################
+
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+class UserImportTests(CacheIsolationMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_superuser("root", "root@example.com", "pw"))
+
+    def upload(self, rows):
+        return self.client.post("/users/bulk-import/", {"file": sheet(rows)})
+
+    def test_requires_an_admin(self):
+        self.assertEqual(APIClient().post("/users/bulk-import/", {"file": sheet([sheet_row(0)])}).status_code, 401)
+        member = APIClient()
+        member.force_authenticate(User.objects.create_user("member", "member@example.com", "pw", role="Student"))
+        self.assertEqual(member.post("/users/bulk-import/", {"file": sheet([sheet_row(0)])}).status_code, 403)
+
+    def test_creates_users_and_reports_bad_rows(self):
+        rows = [sheet_row(i) for i in range(4)]
+        rows[1]["email"] = "not-an-email"
+        rows[2]["email"] = rows[0]["email"]
+        rows[3]["date_of_birth"] = "someday"
+        response = self.upload(rows)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["success_count"], 1)
+        self.assertEqual(len(response.data["errors"]), 3)
+        user = User.objects.get(email="sheet0@example.com")
+        self.assertEqual((user.username, user.city), ("sheet0", "Coimbatore"))
+        self.assertFalse(user.is_staff)
+
+    def test_missing_columns_are_rejected(self):
+        rows = [{key: value for key, value in sheet_row(0).items() if key != "email"}]
+        response = self.upload(rows)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("email", response.data["error"])
+
+    def test_xlsx_upload(self):
+        rows = [sheet_row(i) for i in range(3)]
+        book = workbook([list(rows[0])] + [list(row.values()) for row in rows])
+        response = self.client.post("/users/bulk-import/", {"file": SimpleUploadedFile("users.xlsx", book.read())})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["success_count"], 3)
+        self.assertEqual(User.objects.get(email="sheet2@example.com").zip_code, "641021")
+
+    def test_reupload_skips_unchanged_rows_and_keeps_passwords(self):
+        self.upload([sheet_row(0), sheet_row(1)])
+        password = User.objects.get(email="sheet1@example.com").password
+
+        response = self.upload([sheet_row(0), sheet_row(1, city="Chennai", date_of_birth="3/4/1991")])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data["unchanged_count"], response.data["updated_count"]), (1, 1))
+        user = User.objects.get(email="sheet1@example.com")
+        self.assertEqual(user.city, "Chennai")
+        self.assertEqual(user.password, password)
+
+    def test_reupload_does_not_touch_users_it_did_not_create(self):
+        User.objects.create_user("outsider", "sheet0@example.com", "pw", city="Salem")
+        response = self.upload([sheet_row(0, city="Chennai")])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(User.objects.get(email="sheet0@example.com").city, "Salem")
+
+    def test_missing_rows_are_counted(self):
+        self.upload([sheet_row(0), sheet_row(1)])
+        response = self.upload([sheet_row(0)])
+        self.assertEqual(response.data["missing_count"], 1)
+
+    def test_tags_are_normalized(self):
+        self.upload([sheet_row(0, **{"Roles Played": "Mentor, mentor,Speaker ", "worked_In": "ACME"})])
+        user = User.objects.get(email="sheet0@example.com")
+        self.assertEqual((user.roles_played, user.Worked_in), (["mentor", "speaker"], ["acme"]))
+
+
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"], USER_IMPORT={"CHUNK_SIZE": 2})
+class MemberSyncTests(TestCase):
+    def members_csv(self, rows):
+        handle, path = tempfile.mkstemp(suffix=".csv")
+        os.close(handle)
+        self.addCleanup(os.remove, path)
+        with open(path, "w", newline="", encoding="utf-8") as csvfile:
+            writer = csv.DictWriter(csvfile, fieldnames=["email_id", "Name", "Date of Birth", "Company"])
+            writer.writeheader()
+            writer.writerows(rows)
+        return path
+
+    def member(self, i, **changes):
+        row = {
+            "email_id": f"Member{i}@Example.com", "Name": f"Member {i}",
+            "Date of Birth": "1990-01-02", "Company": "Acme",
+        }
+        row.update(changes)
+        return row
+
+    def sync(self, rows):
+        created, updated, skipped = importers.sync_members(self.members_csv(rows))[:3]
+        return created, updated, skipped
+
+    def test_creates_then_updates_by_email(self):
+        created, updated, skipped = self.sync([self.member(i) for i in range(3)])
+        self.assertEqual(created, [f"member{i}@example.com" for i in range(3)])
+        user = User.objects.get(email="member0@example.com")
+        self.assertEqual((user.username, user.company), ("member0@example.com", "Acme"))
+        self.assertTrue(user.check_password("1990-01-02"))
+
+        created, updated, skipped = self.sync([self.member(0, Company="Globex")])
+        self.assertEqual((created, updated, skipped), ([], ["member0@example.com"], []))
+        self.assertEqual(User.objects.get(email="member0@example.com").company, "Globex")
+        self.assertEqual(User.objects.filter(email__startswith="member").count(), 3)
+
+    def test_password_is_only_reset_when_the_date_of_birth_changes(self):
+        self.sync([self.member(0)])
+        user = User.objects.get(email="member0@example.com")
+        user.set_password("chosen-pw")
+        user.save()
+
+        self.sync([self.member(0, Company="Globex")])
+        self.assertTrue(User.objects.get(pk=user.pk).check_password("chosen-pw"))
+        self.sync([self.member(0, **{"Date of Birth": "1991-03-04"})])
+        self.assertTrue(User.objects.get(pk=user.pk).check_password("1991-03-04"))
+
+    def test_bad_rows_are_skipped(self):
+        rows = [self.member(0, **{"Date of Birth": "someday"}), self.member(1, email_id=""), self.member(2)]
+        created, updated, skipped = self.sync(rows)
+        self.assertEqual(created, ["member2@example.com"])
+        self.assertEqual(len(skipped), 2)
+        self.assertIn("No email in row", skipped)
+
+    def test_connection_errors_are_not_retried_row_by_row(self):
+        with mock.patch("django.db.models.query.QuerySet.bulk_create", side_effect=OperationalError("gone")), \
+                mock.patch.object(User, "save") as save, self.assertRaises(OperationalError):
+            self.sync([self.member(0), self.member(1)])
+        save.assert_not_called()
+
+    def test_repeated_email_updates_the_user_it_created(self):
+        created, updated, skipped = self.sync([self.member(0), self.member(0, Company="Globex")])
+        self.assertEqual((created, updated), (["member0@example.com"], ["member0@example.com"]))
+        self.assertEqual(User.objects.get(email="member0@example.com").company, "Globex")
+
+
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+class PasswordHashingTests(TestCase):
+
+    def test_pooled_hashes_keep_input_order(self):
+        passwords = [None if i % 5 == 0 else f"pw{i}" for i in range(40)]
+        with ThreadPoolExecutor(2) as executor:
+            hashes = hashing.hash_passwords(passwords, executor=executor)
+        self.assertEqual(len(hashes), 40)
+        for password, encoded in zip(passwords, hashes):
+            if password is None:
+                self.assertFalse(is_password_usable(encoded))
+            else:
+                self.assertTrue(check_password(password, encoded))
+
+    @override_settings(PASSWORD_HASHING={"WORKERS": 4})
+    def test_small_batches_are_hashed_inline(self):
+        with mock.patch.object(hashing, "get_executor") as get_executor:
+            hashes = hashing.hash_passwords(["a", "b"])
+        get_executor.assert_not_called()
+        self.assertTrue(check_password("b", hashes[1]))
+
+    @override_settings(PASSWORD_HASHING={"WORKERS": 1})
+    def test_a_single_core_never_starts_the_pool(self):
+        with mock.patch.object(hashing, "get_executor") as get_executor:
+            hashing.hash_passwords(["pw"] * 40)
+        get_executor.assert_not_called()
+
+    @override_settings(PASSWORD_HASHING={"WORKERS": 2, "INLINE_THRESHOLD": 2})
+    def test_large_batches_use_the_shared_pool(self):
+        with ThreadPoolExecutor(2) as executor, \
+                mock.patch.object(hashing, "get_executor", return_value=executor) as get_executor:
+            hashes = hashing.hash_passwords(["a", "b", "c"])
+        get_executor.assert_called_once_with()
+        self.assertEqual([check_password(password, encoded) for password, encoded in zip("abc", hashes)], [True] * 3)
+
+
+@override_settings(
+    PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"],
+    USER_IMPORT={"CHUNK_SIZE": 2},
+)
+class ImportJobTests(TempMediaRootMixin, TestCase):
+    def run_next(self, fails=False):
+        job = import_jobs.claim_next_job()
+        if fails:
+            with self.assertLogs("api.import_jobs", "WARNING"):
+                import_jobs.run_job(job)
+        else:
+            import_jobs.run_job(job)
+        job.refresh_from_db()
+        return job
+
+    def test_endpoints_require_an_admin(self):
+        self.assertEqual(APIClient().get("/import-jobs/").status_code, 401)
+        member = APIClient()
+        member.force_authenticate(User.objects.create_user("member", "member@example.com", "pw", role="Student"))
+        self.assertEqual(member.get("/import-jobs/").status_code, 403)
+
+    def test_job_runs_to_completion(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create_superuser("root", "root@example.com", "pw"))
+        response = client.post("/import-jobs/", {"file": sheet([sheet_row(i) for i in range(5)]), "kind": "users"})
+        self.assertEqual(response.status_code, 202)
+
+        job = self.run_next()
+        self.assertEqual(job.status, ImportJob.STATUS_DONE)
+        self.assertEqual((job.checkpoint, job.created_count), (5, 5))
+        progress = client.get(f"/import-jobs/{job.pk}/").data
+        self.assertEqual(progress["rows_done"], 5)
+
+    def test_resume_remembers_rows_committed_before_the_crash(self):
+        rows = [sheet_row(i) for i in range(4)]
+        rows[3] = sheet_row(3, email=rows[0]["email"])
+        job = import_jobs.create_job(ImportJob.KIND_USERS, sheet(rows))
+        real = importers.import_user_chunk
+
+        def crash_on_second_chunk(batch, offset, *args):
+            if offset:
+                raise RuntimeError("worker killed")
+            return real(batch, offset, *args)
+
+        with mock.patch.object(importers, "import_user_chunk", crash_on_second_chunk):
+            self.assertEqual(self.run_next(fails=True).checkpoint, 2)
+        ImportJob.objects.filter(pk=job.pk).update(status=ImportJob.STATUS_QUEUED)
+
+        job = self.run_next()
+        self.assertEqual(job.status, ImportJob.STATUS_DONE)
+        self.assertEqual(job.created_count, 3)
+        self.assertEqual(job.errors, [f"Row 4: Email '{rows[0]['email']}' already exists"])
+
+    def test_transient_error_requeues_the_job(self):
+        import_jobs.create_job(ImportJob.KIND_USERS, sheet([sheet_row(i) for i in range(3)]))
+        real = importers.import_user_chunk
+        calls = []
+
+        def flaky(batch, offset, *args):
+            calls.append(offset)
+            if calls.count(offset) == 1 and offset:
+                raise OperationalError("server closed the connection unexpectedly")
+            return real(batch, offset, *args)
+
+        with mock.patch.object(importers, "import_user_chunk", flaky):
+            job = self.run_next(fails=True)
+            self.assertEqual((job.status, job.checkpoint, job.result["retries"]), (ImportJob.STATUS_QUEUED, 2, 1))
+            job = self.run_next()
+        self.assertEqual((job.status, job.created_count), (ImportJob.STATUS_DONE, 3))
+
+    @override_settings(IMPORT_JOBS={"MAX_RETRIES": 0})
+    def test_transient_errors_fail_the_job_after_max_retries(self):
+        import_jobs.create_job(ImportJob.KIND_USERS, sheet([sheet_row(0)]))
+        with mock.patch.object(importers, "import_user_chunk", side_effect=OperationalError("gone")):
+            job = self.run_next(fails=True)
+        self.assertEqual(job.status, ImportJob.STATUS_FAILED)
+
+    def test_missing_columns_fail_the_job(self):
+        rows = [{key: value for key, value in sheet_row(0).items() if key != "email"}]
+        import_jobs.create_job(ImportJob.KIND_USERS, sheet(rows))
+        job = self.run_next(fails=True)
+        self.assertEqual(job.status, ImportJob.STATUS_FAILED)
+        self.assertIn("email", job.last_error)
+
+
+class StreamingIngestTests(TestCase):
+    ROWS = [["username", "zip_code"]] + [[f"u{i}", 641000.0 + i] for i in range(5)]
+
+    def test_xlsx_is_read_in_batches(self):
+        batches = list(ingest.iter_batches(workbook(self.ROWS), "xlsx", 2))
+        self.assertEqual([len(batch) for batch in batches], [2, 2, 1])
+        self.assertEqual(list(batches[0].columns), ["username", "zip_code"])
+        # Integral floats come back as ints, as with pd.read_excel.
+        self.assertEqual(batches[0]["zip_code"].tolist(), [641000, 641001])
+
+    def test_resume_skips_rows_already_read(self):
+        text = pd.DataFrame(self.ROWS[1:], columns=self.ROWS[0]).to_csv(index=False).encode()
+        for extension, upload in (("xlsx", workbook(self.ROWS)), ("csv", io.BytesIO(text))):
+            with self.subTest(extension=extension):
+                batches = list(ingest.iter_batches(upload, extension, 2, skip=3))
+                self.assertEqual([batch["username"].tolist() for batch in batches], [["u3", "u4"]])
+
+    def test_csv_cells_stay_text_in_every_batch(self):
+        upload = io.BytesIO(b"username,zip_code\nu0,\nu1,098765\n")
+        batches = list(ingest.iter_batches(upload, "csv", 1))
+        self.assertEqual(batches[1]["zip_code"].tolist(), ["098765"])
+
+    def test_header_and_row_count_rewind_the_file(self):
+        upload = workbook(self.ROWS)
+        self.assertEqual(ingest.read_header(upload, "xlsx"), ["username", "zip_code"])
+        self.assertEqual(ingest.count_rows(upload, "xlsx"), 5)
+        self.assertEqual(upload.tell(), 0)
+        with self.assertRaises(ingest.IngestError):
+            ingest.read_header(io.BytesIO(b""), "csv")
+
+
+class DuplicateDetectionTests(TestCase):
+    def member(self, username, first_name, last_name, **fields):
+        values = {
+            "first_name": first_name, "last_name": last_name, "date_of_birth": date(1990, 1, 2),
+            "roll_no": "R1", "course": "BE", "course_end_year": "2012", **fields,
+        }
+        return User.objects.create_user(username, f"{username}@example.com", "pw", role="Student", **values)
+
+    def test_name_normalization(self):
+        self.assertEqual([dedupe.soundex(word) for word in ("robert", "rupert", "ashcraft", "")],
+                         ["R163", "R163", "A261", ""])
+        self.assertEqual(dedupe.normalize_name("Dr. Émile  O'Neil"), "emile o neil")
+
+    def test_finds_the_same_person_twice(self):
+        first = self.member("asha1", "Asha", "Kumar")
+        second = self.member("asha2", "Asha", "Kumaar")
+        self.member("ravi", "Ravi", "Shankar", date_of_birth=date(1985, 5, 6), roll_no="R2")
+
+        candidates, stats = dedupe.find_duplicates()
+        self.assertEqual(stats["candidates"], 1)
+        row = next(candidates.itertuples(index=False))
+        self.assertEqual((row.id_a, row.id_b), (first.pk, second.pk))
+        self.assertEqual(dedupe.reasons(row)["keys"], ["roll", "dob_last", "dob_first", "name_year"])
+
+    def test_oversized_blocks_are_skipped(self):
+        for i in range(3):
+            self.member(f"asha{i}", "Asha", "Kumar")
+        pairs, skipped = dedupe.candidate_pairs(dedupe.load_members(), max_block_size=2)
+        self.assertTrue(pairs.empty)
+        self.assertEqual(skipped, len(dedupe.BLOCKING_KEYS))
+
+    def test_review_queue_keeps_decided_pairs(self):
+        self.member("asha1", "Asha", "Kumar")
+        self.member("asha2", "Asha", "Kumaar")
+        candidates, _ = dedupe.find_duplicates()
+        self.assertEqual(dedupe.save_candidates(candidates), {"created": 1, "updated": 0, "removed": 0})
+
+        client = APIClient()
+        client.force_authenticate(User.objects.create_superuser("root", "root@example.com", "pw"))
+        self.assertEqual(len(client.get("/members/duplicates/").data["results"]), 1)
+
+        DuplicateCandidate.objects.update(status=DuplicateCandidate.STATUS_DISMISSED)
+        self.assertEqual(dedupe.save_candidates(candidates), {"created": 0, "updated": 0, "removed": 0})
+        self.assertEqual(DuplicateCandidate.objects.get().status, DuplicateCandidate.STATUS_DISMISSED)
+
+
+@override_settings(PHOTO_IMPORT={"WORKERS": 1})
+class PhotoImportTests(TempMediaRootMixin, CacheIsolationMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.asha = User.objects.create_user("asha", "asha@example.com", "pw", role="Student")
+        self.ravi = User.objects.create_user("ravi", "ravi@example.com", "pw", role="Student", roll_no="R42")
+
+    def test_entries_match_by_email_or_roll_number(self):
+        report = photos.import_photos(zip_archive({
+            "batch/Asha@Example.com.jpg": image_bytes(),
+            "R42.png": image_bytes("PNG"),
+            "nobody@example.com.jpg": image_bytes(),
+            "notes.txt": b"not a photo",
+            "__MACOSX/._R42.png": b"resource fork",
+        }))
+        self.assertEqual(report, {
+            "updated": 2, "unmatched": ["nobody@example.com.jpg"], "ambiguous": [],
+            "skipped": [{"file": "notes.txt", "reason": "not an image"}], "failed": [],
+        })
+        self.asha.refresh_from_db()
+        self.assertEqual(self.asha.profile_photo.name, f"profile_pics/{self.asha.pk}.jpg")
+        with Image.open(self.asha.profile_photo.path) as image:
+            self.assertEqual(image.size, (512, 384))
+
+    def test_bad_ambiguous_and_repeated_entries_are_reported(self):
+        for username in ("twin1", "twin2"):
+            User.objects.create_user(username, f"{username}@example.com", "pw", role="Student", roll_no="R7")
+        report = photos.import_photos(zip_archive({
+            "asha@example.com.jpg": b"garbage",
+            "ravi@example.com.jpg": image_bytes(),
+            "R42.jpg": image_bytes(),
+            "R7.jpg": image_bytes(),
+        }))
+        self.assertEqual(report["updated"], 1)
+        self.assertEqual(report["failed"], [{"file": "asha@example.com.jpg", "error": "not a readable image"}])
+        self.assertEqual(report["skipped"], [{"file": "R42.jpg", "reason": "duplicate photo for this user"}])
+        self.assertEqual(report["ambiguous"], ["R7.jpg"])
+
+    def test_emails_match_whatever_their_case(self):
+        mixed = User.objects.create_user("mixed", "Mixed.Case@example.com", "pw", role="Student")
+        User.objects.create_user("dup1", "dup@example.com", "pw", role="Student")
+        User.objects.create_user("dup2", "DUP@example.com", "pw", role="Student")
+        user_cache.get(mixed.pk)
+        report = photos.import_photos(zip_archive({
+            "mixed.case@example.com.jpg": image_bytes(),
+            "Dup@example.com.jpg": image_bytes(),
+        }))
+        self.assertEqual((report["updated"], report["ambiguous"]), (1, ["Dup@example.com.jpg"]))
+        # bulk_update sends no signals; the import drops the cached user itself.
+        user_cache.clear_local()
+        self.assertEqual(user_cache.get(mixed.pk).profile_photo.name, f"profile_pics/{mixed.pk}.jpg")
+
+    def test_endpoint_requires_an_admin_and_a_zip(self):
+        client = APIClient()
+        client.force_authenticate(self.asha)
+        upload = SimpleUploadedFile("photos.zip", b"not a zip")
+        self.assertEqual(client.post("/users/bulk-photos/", {"file": upload}).status_code, 403)
+
+        client.force_authenticate(User.objects.create_superuser("root", "root@example.com", "pw"))
+        upload = SimpleUploadedFile("photos.zip", b"not a zip")
+        self.assertEqual(client.post("/users/bulk-photos/", {"file": upload}).status_code, 400)
+
+
+####################################
+# Lists: pagination, fields, search
+####################################
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        user = User.objects.create_user("asha", "asha@example.com", "pw")
+        Events.objects.bulk_create([
+            Events(user=user, title=f"Event {i}", venue="Hall", from_date_time=timezone.now()) for i in range(5)
+        ])
+
+    def test_pages_do_not_overlap(self):
+        client = APIClient()
+        first = client.get("/events/", {"page_size": 3}).data
+        second = client.get("/events/", {"page_size": 3, "cursor": first["next"]}).data
+        titles = [event["title"] for event in first["results"] + second["results"]]
+        self.assertEqual(len(titles), 5)
+        self.assertEqual(len(set(titles)), 5)
+        self.assertIsNone(second["next"])
+
+    def test_legacy_request_gets_the_whole_list(self):
+        self.assertEqual(len(APIClient().get("/events/").data), 5)
+
+    def test_malformed_cursors_are_rejected(self):
+        cursors = [
+            "garbage", encode_cursor(["2024-01-01T00:00:00"]), encode_cursor([None, 1]), encode_cursor(["x", 1]),
+        ]
+        for cursor in cursors:
+            with self.subTest(cursor=cursor):
+                self.assertEqual(APIClient().get("/events/", {"cursor": cursor}).status_code, 400)
+
+
+class AlumniDirectoryTests(TestCase):
+    def setUp(self):
+        # Leave out the admin seeded by the post_migrate hook.
+        User.objects.filter(is_superuser=True).delete()
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user("viewer", "viewer@example.com", "pw", role="Student"))
+        for i, first_name in enumerate(["Priya", "Arun", "Meena", "Arun", "Kavin"]):
+            User.objects.create_user(
+                f"member{i}", f"member{i}@example.com", "pw", role="Student", first_name=first_name, last_name=f"L{i}",
+            )
+
+    def page_through(self, **params):
+        usernames, cursor = [], ""
+        while cursor is not None:
+            response = self.client.get("/admin-members/", {**params, "page_size": 2, "cursor": cursor})
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn("count", response.data)
+            usernames += [member["username"] for member in response.data["results"]]
+            cursor = response.data["next"]
+        return usernames
+
+    def test_keyset_pages_follow_the_ordering(self):
+        self.assertEqual(self.page_through(), ["member1", "member3", "member4", "member2", "member0"])
+        self.assertEqual(self.page_through(ordering="-username"), [f"member{i}" for i in range(4, -1, -1)])
+
+    def test_page_numbers_still_count(self):
+        response = self.client.get("/admin-members/", {"page_size": 2})
+        self.assertEqual((response.data["count"], len(response.data["results"])), (5, 2))
+
+    def test_malformed_cursor_is_rejected(self):
+        self.assertEqual(self.client.get("/admin-members/", {"cursor": "garbage"}).status_code, 400)
+
+    def test_view_and_fields_narrow_each_member(self):
+        member = self.client.get("/admin-members/", {"view": "card"}).data["results"][0]
+        self.assertEqual(set(member), set(UserSerializer.Meta.views["card"]))
+        member = self.client.get("/admin-members/", {"fields": "id,username"}).data["results"][0]
+        self.assertEqual(set(member), {"id", "username"})
+        members = self.client.get("/member-profiles/", {"view": "card"}).data
+        self.assertEqual(set(members[0]), set(UserSerializer.Meta.views["card"]))
+
+    def test_unknown_view_or_field_is_rejected(self):
+        for params in ({"view": "everything"}, {"fields": "username,password"}):
+            with self.subTest(params=params):
+                self.assertEqual(self.client.get("/admin-members/", params).status_code, 400)
+
+
+class MemberSearchTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user("viewer", "viewer@example.com", "pw", role="Student"))
+
+    def test_query_is_required(self):
+        response = self.client.get("/members/search/")
+        self.assertEqual((response.status_code, response.data), (400, {"error": "q is required."}))
+
+    @skipIf(connection.vendor == "postgresql", "full-text search is available")
+    def test_other_databases_report_search_unavailable(self):
+        self.assertEqual(self.client.get("/members/search/", {"q": "kumar"}).status_code, 400)
+
+    @skipUnless(connection.vendor == "postgresql", "full-text search needs PostgreSQL")
+    def test_name_matches_rank_first(self):
+        by_name = User.objects.create_user("asha", "asha@example.com", "pw", role="Student", last_name="Kumar")
+        by_company = User.objects.create_user(
+            "ravi", "ravi@example.com", "pw", role="Student", company="Kumar Textiles"
+        )
+        User.objects.create_user("meena", "meena@example.com", "pw", role="Student", company="Acme")
+        response = self.client.get("/members/search/", {"q": "kumar"})
+        self.assertEqual([member["id"] for member in response.data["results"]], [by_name.pk, by_company.pk])
+
+    @skipUnless(connection.vendor == "postgresql", "full-text search needs PostgreSQL")
+    def test_pages_through_tied_ranks_once(self):
+        members = [
+            User.objects.create_user(f"kumar{i}", f"kumar{i}@example.com", "pw", role="Student", last_name="Kumar")
+            for i in range(5)
+        ]
+        ids, cursor = [], None
+        while True:
+            params = {"q": "kumar", "page_size": 2, **({"cursor": cursor} if cursor else {})}
+            response = self.client.get("/members/search/", params)
+            ids += [member["id"] for member in response.data["results"]]
+            cursor = response.data["next"]
+            if not cursor:
+                break
+        self.assertEqual(ids, [member.pk for member in members])
+
+
+class TagFilterTests(TestCase):
+
+    def test_normalize_tags(self):
+        self.assertEqual(normalize_tags(["Python", " python ", "", None, "SQL", 3]), ["python", "sql", 3])
+        self.assertEqual(normalize_tags("Python"), "Python")
+
+    def test_tags_are_normalized_on_save(self):
+        user = User.objects.create_user("asha", "asha@example.com", "pw", role="Student")
+        user.professional_skills = [" Python", "python", "SQL "]
+        user.save()
+        self.assertEqual(User.objects.get(pk=user.pk).professional_skills, ["python", "sql"])
+
+    @skipUnless(connection.vendor == "postgresql", "JSON containment needs PostgreSQL")
+    def test_any_and_all_filters(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user("viewer", "viewer@example.com", "pw", role="Student"))
+        for username, skills in (("both", ["python", "sql"]), ("python", ["python"]), ("go", ["Go"])):
+            User.objects.create_user(
+                username, f"{username}@example.com", "pw", role="Student", professional_skills=skills
+            )
+
+        def usernames(**params):
+            return {member["username"] for member in client.get("/admin-members/", params).data["results"]}
+
+        self.assertEqual(usernames(professional_skills="SQL,go"), {"both", "go"})
+        self.assertEqual(usernames(professional_skills__all="python, SQL"), {"both"})
@@ -0,0 +1,37 @@
+import logging
+
+from rest_framework.throttling import SimpleRateThrottle
+
+from .otp import normalize_email
+
+logger = logging.getLogger(__name__)
+
+
+class FailOpenRateThrottle(SimpleRateThrottle):
+    """Let requests through, rather than erroring, while the cache is down."""
+
+    def allow_request(self, request, view):
+        try:
+            return super().allow_request(request, view)
+        except Exception:
+            logger.warning("Throttle cache unavailable; not throttling %s", self.scope, exc_info=True)
+            return True
+
+
+class SignupOTPEmailThrottle(FailOpenRateThrottle):
+    """Limit how many codes are mailed to one address."""
+    scope = "signup_otp_email"
+
+    def get_cache_key(self, request, view):
+        email = normalize_email(request.data.get("email"))
+        if not email:
+            return None
+        return self.cache_format % {"scope": self.scope, "ident": email}
+
+
+class SignupOTPIPThrottle(FailOpenRateThrottle):
+    """Limit how many codes one client can request across addresses."""
+    scope = "signup_otp_ip"
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {"scope": self.scope, "ident": self.get_ident(request)}
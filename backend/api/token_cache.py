@@ -0,0 +1,294 @@
+"""
+Token Cache
+===========
+Two-tier caches for the objects every authenticated request needs.
+
+Tier 1 is a bounded, short-lived LRU that lives inside each worker process.
+Tier 2 is the shared Django cache, so an object resolved by one worker is
+warm for every other worker. Only a miss on both tiers touches the database.
+
+- ``token_cache`` resolves a DB token key to its ``Token`` (user attached).
+- ``user_cache`` resolves a user id to the user, for signed tokens.
+
+Invalidation happens through signals (see ``api.signals``) whenever a token
+is deleted or a user row is saved. Other workers drop their tier-1 copy when
+its TTL runs out, so ``LOCAL_TTL`` bounds how stale a worker can be.
+
+Tier 2 must be shared by every worker (``api.checks`` refuses a per-process
+backend). Each user has a generation there, replaced by a fresh random value
+on every invalidation, and shared entries carry the generation read before
+they were loaded. An entry whose generation is out of date is a miss, so a
+load that loses a race with an invalidation cannot put a stale entry back.
+A generation that expires or is evicted comes back as a new random value, so
+losing one costs misses, never stale hits.
+Writes that send no signals (``bulk_update``) call ``invalidate_users``.
+
+Cached users never carry the password hash (or the search document): those
+fields are left deferred and load from the database if something reads them.
+"""
+
+import copy
+import hashlib
+import threading
+import uuid
+
+from cachetools import TTLCache
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from rest_framework.authtoken.models import Token
+
+# Left deferred on cached users; reading one costs a query.
+UNCACHED_USER_FIELDS = ("password", "search_document")
+
+DEFAULTS = {
+    "CACHE_ALIAS": "default",
+    "LOCAL_MAXSIZE": 4096,
+    "LOCAL_TTL": 30,
+    "SHARED_TTL": 300,
+    "GENERATION_TTL": 24 * 60 * 60,
+}
+
+
+def get_setting(name):
+    return getattr(settings, "AUTH_TOKEN_CACHE", {}).get(name, DEFAULTS[name])
+
+
+def generation_key(user_id):
+    return f"auth_gen:{user_id}"
+
+
+def trim_user(user):
+    """A copy of ``user`` without ``UNCACHED_USER_FIELDS`` (they become deferred)."""
+    user = copy.copy(user)
+    for name in UNCACHED_USER_FIELDS:
+        user.__dict__.pop(name, None)
+    return user
+
+
+class TwoTierCache:
+    """
+    Base class: subclasses define ``key_prefix``, ``load``, ``owner_id``,
+    ``owner_of`` and ``trim``, and may override ``detach``.
+    """
+
+    key_prefix = None
+
+    def __init__(self):
+        self._local = TTLCache(maxsize=get_setting("LOCAL_MAXSIZE"), ttl=get_setting("LOCAL_TTL"))
+        self._lock = threading.Lock()
+        self.local_hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+
+    @property
+    def shared(self):
+        return caches[get_setting("CACHE_ALIAS")]
+
+    def shared_key(self, key):
+        return f"{self.key_prefix}:{key}"
+
+    def load(self, key):
+        """Fetch the object from the database, or return None."""
+        raise NotImplementedError
+
+    def owner_id(self, key):
+        """The id of the user ``key`` belongs to, or None; may query."""
+        raise NotImplementedError
+
+    def owner_of(self, value):
+        """The id of the user a cached ``value`` belongs to."""
+        raise NotImplementedError
+
+    def trim(self, value):
+        """The copy of ``value`` that is stored."""
+        return value
+
+    def detach(self, value):
+        """Return a copy callers may mutate without touching the cache."""
+        return copy.copy(value)
+
+    def get(self, key):
+        """
+        Return a detached copy of the object for ``key``, or None.
+
+        Callers get their own copy so request-level mutations of
+        ``request.user`` never leak into the cached instance.
+        """
+        with self._lock:
+            value = self._local.get(key)
+            if value is not None:
+                self.local_hits += 1
+                return self.detach(value)
+
+        entry = self.shared.get(self.shared_key(key))
+        if entry is not None:
+            generation, value = entry
+            if generation == self.generation(self.owner_of(value)):
+                with self._lock:
+                    self.shared_hits += 1
+                    self._local[key] = value
+                return self.detach(value)
+
+        with self._lock:
+            self.misses += 1
+        user_id = self.owner_id(key)
+        if user_id is None:
+            return None
+        # Read before loading: an invalidation after this point makes the entry stale.
+        generation = self.generation(user_id)
+        value = self.load(key)
+        if value is None:
+            return None
+        value = self.set(key, value, generation=generation)
+        return self.detach(value)
+
+    def set(self, key, value, generation=None):
+        """
+        Store a trimmed ``value`` in both tiers and return it.
+
+        ``generation`` is the owner's generation read before ``value`` was
+        loaded; by default the current one (for a ``value`` loaded just now).
+        """
+        value = self.trim(value)
+        if generation is None:
+            generation = self.generation(self.owner_of(value))
+        self.shared.set(self.shared_key(key), (generation, value), get_setting("SHARED_TTL"))
+        with self._lock:
+            self._local[key] = value
+        return value
+
+    def invalidate(self, key):
+        """Drop ``key`` from both tiers."""
+        self.invalidate_many([key])
+
+    def invalidate_many(self, keys):
+        self.shared.delete_many([self.shared_key(key) for key in keys])
+        with self._lock:
+            for key in keys:
+                self._local.pop(key, None)
+
+    def generation(self, user_id):
+        key = generation_key(user_id)
+        generation = self.shared.get(key)
+        if generation is None:
+            # Never set, expired or evicted: start a fresh one rather than a
+            # fixed default, so no entry stored before can match it again.
+            self.shared.add(key, uuid.uuid4().hex, get_setting("GENERATION_TTL"))
+            generation = self.shared.get(key) or uuid.uuid4().hex
+        return generation
+
+    def bump_generations(self, user_ids):
+        """Make every shared entry of ``user_ids``, in either cache, stale."""
+        # A fresh value rather than incr: no atomic counter is needed, and no
+        # two invalidations can leave the same value behind.
+        self.shared.set_many(
+            {generation_key(user_id): uuid.uuid4().hex for user_id in user_ids}, get_setting("GENERATION_TTL")
+        )
+
+    def clear_local(self):
+        with self._lock:
+            self._local.clear()
+
+    def stats(self):
+        """Return hit/miss counters for this worker process."""
+        with self._lock:
+            lookups = self.local_hits + self.shared_hits + self.misses
+            return {
+                "local_hits": self.local_hits,
+                "shared_hits": self.shared_hits,
+                "misses": self.misses,
+                "hit_rate": round((lookups - self.misses) / lookups, 4) if lookups else 0.0,
+                "local_size": len(self._local),
+                "local_maxsize": self._local.maxsize,
+            }
+
+
+class TokenCache(TwoTierCache):
+    """Resolve token keys to ``Token`` instances with their user attached."""
+
+    key_prefix = "auth_token"
+
+    def shared_key(self, key):
+        # Hash the raw key so secrets never show up in cache keys.
+        digest = hashlib.sha256(key.encode()).hexdigest()
+        return f"{self.key_prefix}:{digest}"
+
+    def _user_key(self, user_id):
+        return f"{self.key_prefix}_user:{user_id}"
+
+    def load(self, key):
+        deferred = [f"user__{name}" for name in UNCACHED_USER_FIELDS]
+        try:
+            return Token.objects.select_related("user").defer(*deferred).get(key=key)
+        except Token.DoesNotExist:
+            return None
+
+    def owner_id(self, key):
+        return Token.objects.filter(key=key).values_list("user_id", flat=True).first()
+
+    def owner_of(self, token):
+        return token.user_id
+
+    def trim(self, token):
+        token = copy.copy(token)
+        token.user = trim_user(token.user)
+        return token
+
+    def detach(self, token):
+        token = copy.copy(token)
+        token.user = copy.copy(token.user)
+        return token
+
+    def set(self, key, token, generation=None):
+        """Store ``token`` (with its user loaded) and remember it for its user."""
+        token = super().set(key, token, generation=generation)
+        self.shared.set(self._user_key(token.user_id), key, get_setting("SHARED_TTL"))
+        return token
+
+    def invalidate_user(self, user_id):
+        self.invalidate_users([user_id])
+
+    def invalidate_users(self, user_ids):
+        """Make the cached tokens of ``user_ids`` stale and drop the ones we know of."""
+        self.bump_generations(user_ids)
+        user_keys = [self._user_key(user_id) for user_id in user_ids]
+        keys = list(self.shared.get_many(user_keys).values())
+        self.shared.delete_many(user_keys)
+        self.invalidate_many(keys)
+
+
+class UserCache(TwoTierCache):
+    """Resolve user ids to user instances."""
+
+    key_prefix = "auth_user"
+
+    def load(self, user_id):
+        return get_user_model().objects.defer(*UNCACHED_USER_FIELDS).filter(pk=user_id).first()
+
+    def owner_id(self, user_id):
+        return user_id
+
+    def owner_of(self, user):
+        return user.pk
+
+    def trim(self, user):
+        return trim_user(user)
+
+    def invalidate_many(self, user_ids, bump=True):
+        if bump:
+            self.bump_generations(user_ids)
+        super().invalidate_many(user_ids)
+
+
+token_cache = TokenCache()
+user_cache = UserCache()
+
+
+def invalidate_users(user_ids):
+    """Drop the cached tokens and rows of ``user_ids``, e.g. after a ``bulk_update``."""
+    user_ids = list(user_ids)
+    if user_ids:
+        token_cache.invalidate_users(user_ids)
+        # The generations are shared, so token_cache already bumped them.
+        user_cache.invalidate_many(user_ids, bump=False)
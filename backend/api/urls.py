@@ -8,9 +8,14 @@ urlpatterns = [
     path('login/staff/', StaffLoginView.as_view(), name='login_staff'),
     path('login/user/', UserLoginView.as_view(), name='login_user'),
     path('logout/', LogoutView.as_view(), name='logout'),
+    path('cache-stats/', CacheStatsView.as_view(), name='cache-stats'),
+    path('email-outbox/', EmailOutboxStatusView.as_view(), name='email-outbox'),
     path('signup/', SignupView.as_view(), name='signup'),
     path('signup-otp/', SignupOTPView.as_view(), name='signup-otp'),
     path('Approve-signup/', ApproveSignupView.as_view(), name='signup'),
+    path('Approve-signup/bulk/', ApproveSignupBulkView.as_view(), name='signup-bulk'),
+    path('Approve-signup/queue/', PendingSignupQueueView.as_view(), name='signup-queue'),
+    path('Approve-signup/<int:pk>/', PendingSignupDetailView.as_view(), name='signup-detail'),
     path('change-password/', ChangePasswordView.as_view(), name='change_password'),
     path('forgot-password/', ForgotPasswordView.as_view(), name='forgot_password'),
     path('reset-password/', ResetPasswordView.as_view(), name='reset_password'),
@@ -39,6 +44,9 @@ urlpatterns = [
     path('user-location/<int:id>/', UserLocationRetrieveUpdateDestroyAPIView.as_view(), name='user_location_detail'),
     path('user-location/search/', UserLocationsearchAPIView.as_view(), name='user_location_search'),
     path('members/import/', ImportMembersAPIView.as_view(), name='import_members'),
+    path('members/duplicates/', DuplicateCandidateQueueView.as_view(), name='duplicate-candidates'),
+    path('members/duplicates/<int:pk>/', DuplicateCandidateDetailView.as_view(), name='duplicate-candidate-detail'),
+    path('members/search/', MemberSearchView.as_view(), name='member-search'),
     path('businesses/', BusinessDirectoryListCreateView.as_view(), name='business-list-create'),
     path('businesses/<int:pk>/', BusinessDirectoryDetailView.as_view(), name='business-detail'),
     path('businesses/<int:business_id>/images/', BusinessImagesView.as_view(), name='business-images'),
@@ -50,6 +58,9 @@ urlpatterns = [
     path('news/<int:news_id>/images/', NewsImagesView.as_view(), name='news-images'),
     path('news/categories/', NewsCategoriesView.as_view(), name='news-categories'),
     path('users/bulk-import/', UserBulkImportView.as_view(), name='user-bulk-import'),
+    path('users/bulk-photos/', ProfilePhotoBulkImportView.as_view(), name='user-bulk-photos'),
+    path('import-jobs/', ImportJobListCreateView.as_view(), name='import-jobs'),
+    path('import-jobs/<int:pk>/', ImportJobDetailView.as_view(), name='import-job-detail'),
     path('dropdown-filters/', DropdownFiltersView.as_view(), name='dropdown-filters'),
 
 ]
@@ -0,0 +1,70 @@
+"""
+User Agents
+===========
+Memoized user-agent parsing.
+
+``user_agents.parse`` runs the ua-parser regex list on every call, which is
+far more expensive than the rest of a typical request, while our clients
+only send a handful of distinct UA strings. ``parse_user_agent`` keeps a
+bounded LRU keyed by the raw string in each worker process, so the regexes
+only run once per distinct client.
+
+``api.middleware.UserAgentMiddleware`` exposes the result lazily as
+``request.user_agent``; ``LoginLog.user_agent`` stores ``summarize()`` of
+the same object.
+"""
+
+from functools import lru_cache
+
+from django.conf import settings
+from user_agents import parse
+
+DEFAULTS = {
+    "MAXSIZE": 512,
+    # Longer headers are almost always junk or unique; parse them uncached
+    # so they cannot churn the LRU.
+    "MAX_LENGTH": 1024,
+}
+
+
+def get_setting(name):
+    return getattr(settings, "USER_AGENT_CACHE", {}).get(name, DEFAULTS[name])
+
+
+@lru_cache(maxsize=get_setting("MAXSIZE"))
+def _parse_cached(ua_string):
+    return parse(ua_string)
+
+
+def parse_user_agent(ua_string):
+    """Return the parsed ``UserAgent`` for a raw header value."""
+    ua_string = ua_string or ""
+    if isinstance(ua_string, bytes):
+        ua_string = ua_string.decode("utf-8", "ignore")
+    if len(ua_string) > get_setting("MAX_LENGTH"):
+        return parse(ua_string)
+    return _parse_cached(ua_string)
+
+
+def get_user_agent(request):
+    return parse_user_agent(request.META.get("HTTP_USER_AGENT", ""))
+
+
+def summarize(user_agent):
+    """Short form stored on ``LoginLog``, e.g. ``"PC / Windows 10 / Chrome 120.0"``."""
+    if not user_agent or not user_agent.ua_string:
+        return ""
+    return str(user_agent)
+
+
+def stats():
+    """Return hit/miss counters for this worker process."""
+    info = _parse_cached.cache_info()
+    lookups = info.hits + info.misses
+    return {
+        "hits": info.hits,
+        "misses": info.misses,
+        "hit_rate": round(info.hits / lookups, 4) if lookups else 0.0,
+        "size": info.currsize,
+        "maxsize": info.maxsize,
+    }
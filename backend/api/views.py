@@ -14,28 +14,27 @@ The views are organized by feature area:
 """
 
 import os
-import csv
 import json
-import random
-import pandas as pd
+import zipfile
 import django_filters
 from django.db import models
 from datetime import datetime
 from datetime import timedelta
 from django.http import Http404
+from django.core.files.base import ContentFile
 from django.conf import settings
 from django.utils import timezone
 from django.shortcuts import render
 from django.core.cache import cache
 from django.db.models import Q, Count
-from django.core.mail import send_mail
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from django.utils.encoding import force_bytes
-from rest_framework.authtoken.models import Token
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAdminUser,IsAuthenticated
 from rest_framework import status, permissions, generics
-from django.contrib.auth import get_user_model, authenticate
+from django.contrib.auth import get_user_model
 from rest_framework.generics import ListAPIView
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.filters import OrderingFilter, SearchFilter
@@ -43,17 +42,25 @@ from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.parsers import MultiPartParser, FormParser
 from django.utils.http import urlsafe_base64_encode, urlsafe_base64_decode
 from django.contrib.auth.tokens import default_token_generator
+from .token_cache import token_cache, user_cache
+from .pagination import InvalidCursor, KeysetPagination, decode_cursor, encode_cursor, estimate_count, get_page_size
+from .login_recorder import login_recorder
+from .mail import enqueue_mail
+from . import import_jobs, importers, ingest, login_service, otp, photos, search, signed_tokens, signups, user_agents
+from .throttling import SignupOTPEmailThrottle, SignupOTPIPThrottle
 from .models import (
     # User-related models
-    LoginLog, SignupOTP, PendingSignup, user_location,
+    LoginLog, LoginLogDaily, OutboundEmail, PendingSignup, ImportJob, DuplicateCandidate, user_location,
     # Content models
     Events, EventImage, Jobs, JobImage, JobComment, JobReaction,
     Album, AlbumImage, BusinessDirectory, BusinessImage,
-    NewsRoom, NewsImage
+    NewsRoom, NewsImage,
+    normalize_tags,
 )
 from .serializers import (
     # User-related serializers
-    UserSerializer, LoginLogSerializer, PendingSignupSerializer, UserLocationSerializer,
+    UserSerializer, LoginLogSerializer, LoginLogDailySerializer, PendingSignupSerializer, PendingSignupListSerializer, UserLocationSerializer,
+    DuplicateCandidateSerializer,
     # Content serializers
     EventSerializer, JobsSerializer, JobImageSerializer, JobCommentSerializer,
     AlbumSerializer, AlbumImageSerializer, BusinessDirectorySerializer, BusinessImageSerializer,
@@ -71,10 +78,57 @@ class UserLoginHistoryView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request):
-        """Return all login history records for the authenticated user."""
-        logs = LoginLog.objects.filter(user=request.user).order_by('-timestamp')
-        serializer = LoginLogSerializer(logs, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        """
+        Return the authenticated user's login history, newest first.
+
+        Recent logins come from raw ``LoginLog`` rows (type "login"), older
+        ones from the daily rollups written by ``rollup_login_logs`` (type
+        "daily"). Pass ``next`` back as ``?cursor=`` for the following page.
+
+        Returns:
+            ``{"results": [...], "next": cursor or null}``
+        """
+        page_size = get_page_size(request)
+        try:
+            position = decode_cursor(request.query_params["cursor"]) if "cursor" in request.query_params else ["raw"]
+            if not position or position[0] not in ("raw", "daily"):
+                raise InvalidCursor("Invalid cursor.")
+            phase, position = position[0], position[1:]
+            if position:
+                # [sort key, id]: a timestamp for raw logs, a day for rollups
+                key, last_id = position if len(position) == 2 else (None, None)
+                key = (parse_datetime if phase == "raw" else parse_date)(key)
+                if key is None or type(last_id) is not int:
+                    raise InvalidCursor("Invalid cursor.")
+                position = [key, last_id]
+        except (InvalidCursor, TypeError, ValueError):
+            return Response({"error": "Invalid cursor."}, status=status.HTTP_400_BAD_REQUEST)
+
+        results = []
+        if phase == "raw":
+            logs = LoginLog.objects.filter(user=request.user)
+            if position:
+                timestamp, last_id = position
+                logs = logs.filter(Q(timestamp__lte=timestamp) & (Q(timestamp__lt=timestamp) | Q(id__lt=last_id)))
+            logs = list(logs.order_by('-timestamp', '-id')[:page_size])
+            results += [dict(LoginLogSerializer(log).data, type="login") for log in logs]
+            if len(logs) == page_size:
+                next_cursor = encode_cursor(["raw", logs[-1].timestamp, logs[-1].id])
+                return Response({"results": results, "next": next_cursor}, status=status.HTTP_200_OK)
+            # Raw window exhausted: fill the rest of the page from the rollups.
+            phase, position = "daily", []
+
+        remaining = page_size - len(results)
+        rollups = LoginLogDaily.objects.filter(user=request.user)
+        if position:
+            day, last_id = position
+            rollups = rollups.filter(Q(day__lte=day) & (Q(day__lt=day) | Q(id__lt=last_id)))
+        rollups = list(rollups.order_by('-day', '-id')[:remaining])
+        results += [dict(LoginLogDailySerializer(rollup).data, type="daily") for rollup in rollups]
+        next_cursor = None
+        if rollups and len(rollups) == remaining:
+            next_cursor = encode_cursor(["daily", rollups[-1].day, rollups[-1].id])
+        return Response({"results": results, "next": next_cursor}, status=status.HTTP_200_OK)
 
 class ChangeUsernameView(APIView):
     """View for changing a user's username without password verification."""
@@ -134,12 +188,7 @@ class ChangeUsernameView(APIView):
         request.user.save(update_fields=['username'])
         
         # Log the change
-        from django.utils import timezone
-        LoginLog.objects.create(
-            user=request.user,
-            user_agent=request.META.get('HTTP_USER_AGENT', ''),
-            timestamp=timezone.now()
-        )
+        login_recorder.record(request.user, user_agent=user_agents.summarize(request.user_agent))
         
         return Response({
             "success": True,
@@ -149,126 +198,51 @@ class ChangeUsernameView(APIView):
         }, status=status.HTTP_200_OK)
     
 
-class AdminLoginView(APIView):
-    """View for admin authentication."""
-    
+class BaseLoginView(APIView):
+    """Shared username-or-email login; subclasses pick the role gate."""
+    role = "user"
+
     def post(self, request):
         """
-        Authenticate admin users with email or username.
-        
+        Authenticate with email or username.
+
+        Send ``"token_type": "signed"`` to receive a stateless signed token
+        instead of the database-backed one.
+
         Returns:
             Authentication token if successful
         """
-        identifier = request.data.get("username")
-        password = request.data.get("password")
-        user = None
-
-        # Support login by email or username
-        if identifier and ("@" in identifier or "." in identifier):
-            try:
-                user_obj = User.objects.get(email=identifier)
-                user = authenticate(username=user_obj.username, password=password)
-            except User.DoesNotExist:
-                user = None
-        else:
-            user = authenticate(username=identifier, password=password)
+        try:
+            user, token = login_service.login(
+                request.data.get("username"),
+                request.data.get("password"),
+                role=self.role,
+                user_agent=user_agents.summarize(request.user_agent),
+                signed=request.data.get("token_type") == "signed",
+            )
+        except login_service.LoginError as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
 
-        if user and user.is_superuser:
-            token, _ = Token.objects.get_or_create(user=user)
-            LoginLog.objects.create(user=user)
-            return Response({
-                "token": token.key, 
-                "user": user.username, 
-                "role": user.role
-            }, status=status.HTTP_200_OK)
-        
-        return Response(
-            {"error": "Invalid credentials or not admin"}, 
-            status=status.HTTP_400_BAD_REQUEST
-        )
+        return Response({
+            "token": token, 
+            "user": user.username, 
+            "role": user.role
+        }, status=status.HTTP_200_OK)
 
 
-class StaffLoginView(APIView):
-    """View for staff authentication."""
-    
-    def post(self, request):
-        """
-        Authenticate staff users with email or username.
-        
-        Returns:
-            Authentication token if successful
-        """
-        identifier = request.data.get("username")
-        password = request.data.get("password")
-        user = None
+class AdminLoginView(BaseLoginView):
+    """View for admin authentication."""
+    role = "admin"
 
-        # Support login by email or username
-        if identifier and ("@" in identifier or "." in identifier):
-            try:
-                user_obj = User.objects.get(email=identifier)
-                user = authenticate(username=user_obj.username, password=password)
-            except User.DoesNotExist:
-                user = None
-        else:
-            user = authenticate(username=identifier, password=password)
 
-        if user and user.is_staff:
-            token, _ = Token.objects.get_or_create(user=user)
-            LoginLog.objects.create(user=user)
-            return Response({
-                "token": token.key, 
-                "user": user.username, 
-                "role": user.role
-            }, status=status.HTTP_200_OK)
-        
-        return Response(
-            {"error": "Invalid credentials or not staff"}, 
-            status=status.HTTP_400_BAD_REQUEST
-        )
+class StaffLoginView(BaseLoginView):
+    """View for staff authentication."""
+    role = "staff"
 
 
-class UserLoginView(APIView):
+class UserLoginView(BaseLoginView):
     """View for regular user authentication."""
-    
-    def post(self, request):
-        """
-        Authenticate regular users with email or username.
-        
-        Returns:
-            Authentication token if successful
-        """
-        identifier = request.data.get("username")
-        password = request.data.get("password")
-        user = None
-
-        # Support login by email or username
-        if identifier and ("@" in identifier or "." in identifier):
-            try:
-                user_obj = User.objects.get(email=identifier)
-                user = authenticate(username=user_obj.username, password=password)
-            except User.DoesNotExist:
-                user = None
-        else:
-            user = authenticate(username=identifier, password=password)
-
-        if user:
-            token, _ = Token.objects.get_or_create(user=user)
-            # Update last login time
-            user.last_login = timezone.now()
-            user.save(update_fields=["last_login"])
-            # Log the login
-            LoginLog.objects.create(user=user)
-            
-            return Response({
-                "token": token.key, 
-                "user": user.username, 
-                "role": user.role
-            }, status=status.HTTP_200_OK)
-        
-        return Response(
-            {"error": "Invalid credentials"}, 
-            status=status.HTTP_400_BAD_REQUEST
-        )
+    role = "user"
 
 
 class LogoutView(APIView):
@@ -276,11 +250,61 @@ class LogoutView(APIView):
     permission_classes = [permissions.IsAuthenticated]
     
     def post(self, request):
-        """Delete the user's authentication token."""
-        request.user.auth_token.delete()
+        """Delete the user's token, or revoke their signed tokens."""
+        if isinstance(request.auth, signed_tokens.SignedToken):
+            signed_tokens.revoke_all(request.user)
+        else:
+            request.user.auth_token.delete()
         return Response({'status': 'logged out'}, status=status.HTTP_200_OK)
 
 
+class CacheStatsView(APIView):
+    """View for inspecting this worker's in-process cache counters."""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        """Return hit/miss counters for the auth caches, login log buffer and UA parser."""
+        return Response({
+            "auth_tokens": token_cache.stats(),
+            "auth_users": user_cache.stats(),
+            "login_log_buffer": login_recorder.stats(),
+            "user_agents": user_agents.stats(),
+        }, status=status.HTTP_200_OK)
+
+
+class EmailOutboxStatusView(APIView):
+    """View for monitoring the transactional email outbox."""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        """
+        Summarize the outbox.
+
+        Returns:
+            - counts: Number of messages per status
+            - oldest_pending: Creation time of the oldest undelivered message
+            - recent_failures: Latest messages that failed at least once
+        """
+        counts = {value: 0 for value, _ in OutboundEmail.STATUS_CHOICES}
+        counts.update(
+            OutboundEmail.objects.values_list("status").annotate(total=Count("id")).order_by()
+        )
+        oldest_pending = (
+            OutboundEmail.objects.filter(status=OutboundEmail.STATUS_PENDING)
+            .order_by("next_attempt_at").values_list("created_at", flat=True).first()
+        )
+        recent_failures = (
+            OutboundEmail.objects.exclude(last_error="")
+            .order_by("-id")
+            .values("id", "subject", "to", "status", "attempts", "next_attempt_at", "last_error")[:20]
+        )
+        return Response({
+            "counts": counts,
+            "oldest_pending": oldest_pending,
+            "recent_failures": list(recent_failures),
+        }, status=status.HTTP_200_OK)
+
+
 class ForgotPasswordView(APIView):
     """View for initiating password reset."""
     permission_classes = [permissions.AllowAny]
@@ -312,16 +336,10 @@ class ForgotPasswordView(APIView):
         token = default_token_generator.make_token(user)
         reset_link = request.build_absolute_uri(f"/reset-password/?uid={uid}&token={token}")
         
-        # Send email with reset link
+        # Queue email with reset link
         subject = "Reset Your Password"
         message = f"Please click the following link to reset your password:\n{reset_link}"
-        send_mail(
-            subject, 
-            message, 
-            settings.EMAIL_HOST_USER, 
-            [email], 
-            fail_silently=False
-        )
+        enqueue_mail(subject, message, [email], settings.EMAIL_HOST_USER)
         
         return Response(
             {"message": "Password reset link sent to your email."}, 
@@ -373,6 +391,7 @@ class ResetPasswordView(APIView):
             
         user.set_password(new_password)
         user.save()
+        signed_tokens.revoke_all(user)
         return Response(
             {"message": "Password reset successful."}, 
             status=status.HTTP_200_OK
@@ -401,21 +420,25 @@ class ChangePasswordView(APIView):
             
         request.user.set_password(new_password)
         request.user.save()
-        return Response(
-            {'status': 'Password changed successfully'}, 
-            status=status.HTTP_200_OK
-        )
+        signed_tokens.revoke_all(request.user)
+
+        response_data = {'status': 'Password changed successfully'}
+        if isinstance(request.auth, signed_tokens.SignedToken):
+            # The old signed token was just revoked; hand back a fresh one.
+            response_data['token'] = signed_tokens.issue(request.user)
+        return Response(response_data, status=status.HTTP_200_OK)
 
 
 class SignupOTPView(APIView):
     """View for sending signup OTP."""
+    throttle_classes = [SignupOTPEmailThrottle, SignupOTPIPThrottle]
     
     def post(self, request, format=None):
         """
         Send a one-time password to the provided email for signup verification.
         
         Returns:
-            Success message if OTP was sent
+            Success message if OTP was sent, 429 if the email or client is throttled
         """
         email = request.data.get("email")
         if not email:
@@ -424,17 +447,15 @@ class SignupOTPView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
             
-        # Generate 6-digit OTP
-        code = str(random.randint(100000, 999999))
-        SignupOTP.objects.create(email=email, code=code)
+        # Generate 6-digit OTP (replaces any earlier code for this email)
+        code = otp.issue(email)
         
-        # Send email with OTP
-        send_mail(
+        # Queue email with OTP
+        enqueue_mail(
             'Your Signup OTP',
-            f'Your OTP for signup is {code}. OTP is valid for 5 minutes.',
-            settings.EMAIL_HOST_USER,
+            f'Your OTP for signup is {code}. OTP is valid for {otp.ttl_minutes()} minutes.',
             [email],
-            fail_silently=False,
+            settings.EMAIL_HOST_USER,
         )
         
         return Response(
@@ -446,12 +467,10 @@ class SignupOTPView(APIView):
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from django.utils import timezone
-from datetime import timedelta
 from django.db import models
 from django.contrib.auth import get_user_model
 
-from api.models import PendingSignup, SignupOTP  # Adjust if your model paths differ
+from api.models import PendingSignup  # Adjust if your model paths differ
 
 User = get_user_model()
 
@@ -467,7 +486,7 @@ class SignupView(APIView):
             Success message if signup request was submitted
         """
         email = request.data.get("email")
-        otp = request.data.get("otp")
+        code = request.data.get("otp")
         username = request.data.get("username", email)
 
         # Get all model field names excluding specific ones
@@ -481,8 +500,8 @@ class SignupView(APIView):
         missing = [field for field in required_fields if not request.data.get(field)]
 
         # Validate required fields
-        if not email or not otp or missing:
-            error_msg = "Email and OTP required." if not email or not otp else f"Missing fields: {', '.join(missing)}"
+        if not email or not code or missing:
+            error_msg = "Email and OTP required." if not email or not code else f"Missing fields: {', '.join(missing)}"
             return Response({"error": error_msg}, status=status.HTTP_400_BAD_REQUEST)
 
         # Check if email or username already exists
@@ -493,10 +512,7 @@ class SignupView(APIView):
             return Response({"error": "Username already taken."}, status=status.HTTP_400_BAD_REQUEST)
 
         # Verify OTP
-        otp_entry = SignupOTP.objects.filter(email=email, code=otp).order_by('-created_at').first()
-        if not otp_entry or (timezone.now() - otp_entry.created_at > timedelta(minutes=30)):
-            if otp_entry:
-                otp_entry.delete()
+        if not otp.verify(email, code):
             return Response({"error": "Invalid or expired OTP."}, status=status.HTTP_400_BAD_REQUEST)
 
         # Prepare data for pending signup with type-safe conversions
@@ -530,7 +546,7 @@ class SignupView(APIView):
         )
 
         # Delete the used OTP
-        otp_entry.delete()
+        otp.consume(email)
 
         return Response(
             {"message": "Signup request submitted. Await admin approval."},
@@ -562,58 +578,9 @@ class ApproveSignupView(APIView):
         except PendingSignup.DoesNotExist:
             return Response({"error": "Pending signup not found"}, status=status.HTTP_404_NOT_FOUND)
 
-        # Prepare user data from pending signup
-        user_data = {}
-        for field in [f for f in User._meta.fields if f.name not in ("id", "last_login", "date_joined", "password")]:
-            value = getattr(pending, field.name, "")
-
-            # Handle None and empty values for date fields
-            if value is None:
-                value = ""
-            if isinstance(field, (models.DateField, models.DateTimeField)) and value == "":
-                value = None
-
-            # Ensure boolean fields are True/False, not empty string
-            if isinstance(field, models.BooleanField):
-                if value in [True, False]:
-                    user_data[field.name] = value
-                elif str(value).lower() == "true":
-                    user_data[field.name] = True
-                elif str(value).lower() == "false":
-                    user_data[field.name] = False
-                else:
-                    user_data[field.name] = False  # Default to False if empty or invalid
-            else:
-                user_data[field.name] = value
-
-        # Set core user data
-        user_data['username'] = pending.username
-        user_data['email'] = pending.email
-        user_data['is_superuser'] = False
-        user_data['is_active'] = True
-        user_data['is_staff'] = (pending.role.lower() == "staff")
-
-        # Create the user account
-        user = User.objects.create_user(**user_data)
-        user.set_password(pending.password)
-        user.save()
-
-        # Mark pending signup as approved
-        pending.is_approved = True
-        pending.approved_at = timezone.now()
-        pending.save()
-        
-        # Notify user via email
-        send_mail(
-            'Your Account Has Been Approved',
-            f'Your account has been approved.\nUsername: {pending.username}',
-            settings.EMAIL_HOST_USER,
-            [pending.email],
-            fail_silently=False,
-        )
-        
-        # Clean up pending signup
-        pending.delete()
+        users, conflicts = signups.approve([pending], from_email=settings.EMAIL_HOST_USER)
+        if conflicts:
+            return Response({"error": conflicts[pending.pk]}, status=status.HTTP_400_BAD_REQUEST)
         
         return Response({"message": "User approved"}, status=status.HTTP_200_OK)
     
@@ -633,20 +600,130 @@ class ApproveSignupView(APIView):
         except PendingSignup.DoesNotExist:
             return Response({"error": "Pending signup not found"}, status=status.HTTP_404_NOT_FOUND)
             
-        # Notify user via email
-        send_mail(
-            'Signup Request Denied',
-            'Your signup request has been denied by the administrator.',
-            settings.EMAIL_HOST_USER,
-            [pending.email],
-            fail_silently=False,
-        )
-        
-        # Delete pending signup
-        pending.delete()
+        # Delete pending signup and notify user via email
+        signups.deny([pending], from_email=settings.EMAIL_HOST_USER)
         
         return Response({"message": "Pending signup request deleted"}, status=status.HTTP_200_OK)
 
+class PendingSignupQueueView(APIView):
+    """View for paging through the signup approval queue."""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        """
+        List unapproved signups, oldest first, in compact form.
+
+        Filters: ``role``, ``college_name`` (substring), ``created_after`` and
+        ``created_before`` (ISO date or datetime). Pass ``next`` back as
+        ``?cursor=`` for the following page.
+
+        Returns:
+            ``{"results": [...], "next": cursor or null}``
+        """
+        page_size = get_page_size(request)
+        pending = PendingSignup.objects.filter(is_approved=False)
+
+        params = request.query_params
+        if params.get("role"):
+            pending = pending.filter(role__iexact=params["role"])
+        if params.get("college_name"):
+            pending = pending.filter(college_name__icontains=params["college_name"])
+        for param, lookup in (("created_after", "created_at__gte"), ("created_before", "created_at__lt")):
+            if params.get(param):
+                try:
+                    value = parse_datetime(params[param])
+                    if value is None:
+                        day = parse_date(params[param])
+                        value = datetime.combine(day, datetime.min.time()) if day else None
+                except ValueError:
+                    value = None
+                if value is None:
+                    return Response({"error": f"Invalid {param}."}, status=status.HTTP_400_BAD_REQUEST)
+                if timezone.is_naive(value):
+                    value = timezone.make_aware(value)
+                pending = pending.filter(**{lookup: value})
+
+        if "cursor" in params:
+            try:
+                created_at, last_id = decode_cursor(params["cursor"])
+                created_at = parse_datetime(created_at)
+            except (InvalidCursor, TypeError, ValueError):
+                created_at = None
+            if created_at is None:
+                return Response({"error": "Invalid cursor."}, status=status.HTTP_400_BAD_REQUEST)
+            pending = pending.filter(
+                Q(created_at__gte=created_at) & (Q(created_at__gt=created_at) | Q(id__gt=last_id))
+            )
+
+        fields = PendingSignupListSerializer.Meta.fields
+        rows = list(pending.only(*fields).order_by('created_at', 'id')[:page_size])
+        next_cursor = None
+        if len(rows) == page_size:
+            next_cursor = encode_cursor([rows[-1].created_at, rows[-1].id])
+        return Response({
+            "results": PendingSignupListSerializer(rows, many=True).data,
+            "next": next_cursor,
+        }, status=status.HTTP_200_OK)
+
+
+class PendingSignupDetailView(APIView):
+    """View for one pending signup request."""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, pk):
+        """Return the full pending signup, without its password."""
+        try:
+            pending = PendingSignup.objects.defer('password').get(pk=pk, is_approved=False)
+        except PendingSignup.DoesNotExist:
+            return Response({"error": "Pending signup not found"}, status=status.HTTP_404_NOT_FOUND)
+        return Response(PendingSignupSerializer(pending).data, status=status.HTTP_200_OK)
+
+
+class ApproveSignupBulkView(APIView):
+    """View for approving or denying many pending signups at once."""
+    permission_classes = [IsAdminUser]
+
+    def post(self, request, format=None):
+        """
+        Approve or deny pending signups by email and/or id in one transaction.
+
+        Body: ``{"action": "approve" | "deny", "emails": [...], "ids": [...]}``
+
+        Returns:
+            - approved / denied: Number of signups processed
+            - not_found: Requested emails and ids with no pending signup
+            - conflicts: Emails left pending because the username or email is taken
+        """
+        action = request.data.get("action")
+        emails = request.data.get("emails") or []
+        ids = request.data.get("ids") or []
+        if action not in ("approve", "deny"):
+            return Response({"error": "action must be 'approve' or 'deny'"}, status=status.HTTP_400_BAD_REQUEST)
+        if not isinstance(emails, list) or not isinstance(ids, list) or not (emails or ids):
+            return Response({"error": "Provide a list of emails or ids"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            ids = [int(pk) for pk in ids]
+        except (TypeError, ValueError):
+            return Response({"error": "ids must be integers"}, status=status.HTTP_400_BAD_REQUEST)
+
+        pendings = list(signups.pending_queryset(emails=emails, ids=ids))
+        found_emails = {p.email for p in pendings}
+        found_ids = {p.pk for p in pendings}
+        not_found = [e for e in emails if e not in found_emails] + [pk for pk in ids if pk not in found_ids]
+
+        if action == "deny":
+            denied = signups.deny(pendings, from_email=settings.EMAIL_HOST_USER)
+            return Response({"denied": denied, "not_found": not_found}, status=status.HTTP_200_OK)
+
+        users, conflicts = signups.approve(pendings, from_email=settings.EMAIL_HOST_USER)
+        return Response({
+            "approved": len(users),
+            "not_found": not_found,
+            "conflicts": [
+                {"email": p.email, "error": conflicts[p.pk]} for p in pendings if p.pk in conflicts
+            ],
+        }, status=status.HTTP_200_OK)
+
 class UserStatisticsView(APIView):
     """View for retrieving total users and new users statistics."""
     permission_classes = [permissions.AllowAny]
@@ -740,9 +817,16 @@ class BirthdayListView(APIView):
     # permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request):
-        """Get users whose birthdays are within the next 15 days."""
+        """
+        Get users whose birthdays are within the next 15 days.
+
+        ``?view=card|list|full`` or ``?fields=`` narrows each user.
+        """
         today = timezone.now().date()
-        users_with_birthdays = User.objects.exclude(date_of_birth__isnull=True)
+        fields = UserSerializer.fields_from_request(request)
+        users_with_birthdays = UserSerializer.project(
+            User.objects.exclude(date_of_birth__isnull=True), fields, extra=['date_of_birth'],
+        )
 
         upcoming_birthdays = []
         for user in users_with_birthdays:
@@ -780,7 +864,7 @@ class BirthdayListView(APIView):
         upcoming_birthdays.sort(key=lambda x: x['days_until_birthday'])
 
         users_ordered = [item['user'] for item in upcoming_birthdays]
-        serializer = UserSerializer(users_ordered, many=True)
+        serializer = UserSerializer(users_ordered, many=True, fields=fields)
 
         response_data = []
         for i, user_data in enumerate(serializer.data):
@@ -816,19 +900,76 @@ class LatestMembersView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request):
-        """Get the 10 most recent Alumni members."""
-        latest_members = User.objects.all().order_by('passed_out_year')[:10]
-        serializer = UserSerializer(latest_members, many=True)
+        """
+        Get the 10 most recent Alumni members.
+
+        ``?view=card|list|full`` or ``?fields=`` narrows each member.
+        """
+        fields = UserSerializer.fields_from_request(request)
+        latest_members = UserSerializer.project(User.objects.all(), fields).order_by('passed_out_year')[:10]
+        serializer = UserSerializer(latest_members, many=True, fields=fields)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 class AlumniPagination(PageNumberPagination):
     page_size = 100
     page_size_query_param = 'page_size'
     max_page_size = 1000
-    
+
+
+class AlumniCursorPagination(KeysetPagination):
+    """
+    Keyset pages for the alumni directory, seeking on whatever ordering
+    ``AlumniOrderingFilter`` applied. No COUNT: ``?estimate=true`` adds the
+    planner's ``estimated_count`` instead.
+    """
+    page_size = AlumniPagination.page_size
+    max_page_size = AlumniPagination.max_page_size
+
+    def get_page(self, queryset, request):
+        self.ordering = tuple(queryset.query.order_by)
+        self.estimated_count = None
+        if request.query_params.get('estimate', '').lower() == 'true':
+            self.estimated_count = estimate_count(queryset)
+        return super().get_page(queryset, request)
+
+    def get_paginated_response(self, data):
+        body = {"results": data, "next": self.next_cursor}
+        if self.estimated_count is not None:
+            body["estimated_count"] = self.estimated_count
+        return Response(body)
+
+
+class AlumniOrderingFilter(OrderingFilter):
+    """
+    Accepts only the keys of ``view.orderings`` (optionally ``-`` prefixed)
+    and expands each to its full, unique, index-backed ordering.
+    """
+
+    def get_ordering(self, request, queryset, view):
+        term = request.query_params.get(self.ordering_param, '').split(',')[0].strip()
+        fields = view.orderings.get(term.lstrip('-'))
+        if fields is None:
+            return list(view.ordering)
+        if term.startswith('-'):
+            return [field[1:] if field.startswith('-') else '-' + field for field in fields]
+        return list(fields)
+
+
 class AlumniAdminFilter(django_filters.FilterSet):
-    roles_played = django_filters.CharFilter(method='filter_roles_played')
-    Worked_in = django_filters.CharFilter(method='filter_Worked_in')
+    """
+    The tag lists take comma-separated values matched as whole entries,
+    ignoring case: ``?professional_skills=python,sql`` finds members with
+    either skill, ``?professional_skills__all=python,sql`` those with both.
+    Both are ``@>`` containment tests on a GIN ``jsonb_path_ops`` index.
+    """
+    professional_skills = django_filters.CharFilter(method='filter_any_tag')
+    professional_skills__all = django_filters.CharFilter(field_name='professional_skills', method='filter_all_tags')
+    industries_worked_in = django_filters.CharFilter(method='filter_any_tag')
+    industries_worked_in__all = django_filters.CharFilter(field_name='industries_worked_in', method='filter_all_tags')
+    roles_played = django_filters.CharFilter(method='filter_any_tag')
+    roles_played__all = django_filters.CharFilter(field_name='roles_played', method='filter_all_tags')
+    Worked_in = django_filters.CharFilter(method='filter_any_tag')
+    Worked_in__all = django_filters.CharFilter(field_name='Worked_in', method='filter_all_tags')
 
     class Meta:
         model = User
@@ -841,35 +982,120 @@ class AlumniAdminFilter(django_filters.FilterSet):
             # 'is_staff', 'is_active', 'is_superuser', 'chapter'
         ]
 
-    def filter_roles_played(self, queryset, name, value):
-        return queryset.filter(roles_played__icontains=value)
-
-    def filter_Worked_in(self, queryset, name, value):
-        return queryset.filter(Worked_in__icontains=value)
+    def filter_any_tag(self, queryset, name, value):
+        tags = normalize_tags(value.split(','))
+        if not tags:
+            return queryset
+        match = Q()
+        for tag in tags:
+            match |= Q(**{f'{name}__contains': [tag]})
+        return queryset.filter(match)
+
+    def filter_all_tags(self, queryset, name, value):
+        tags = normalize_tags(value.split(','))
+        if not tags:
+            return queryset
+        return queryset.filter(**{f'{name}__contains': tags})
 
 class AlumniAdminFilterView(ListAPIView):
     """
     Admin view for filtering alumni in all possible ways.
     Supports filtering, search, ordering, and pagination.
+
+    Pagination is by page number (``?page=``, with a full count) unless
+    ``?cursor=`` is given: an empty cursor starts keyset pagination and
+    each page's ``next`` continues it.
     """
     queryset = User.objects.all()
     serializer_class = UserSerializer
     permission_classes = [IsAuthenticated]
     pagination_class = AlumniPagination
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, SearchFilter, AlumniOrderingFilter]
     filterset_class = AlumniAdminFilter
 
     search_fields = [
         'username', 'first_name', 'last_name' #, 'current_work',
         # 'roles_played', 'Worked_in', 'college_name', 'phone', 'Address', 'city'
     ]
-    ordering_fields = '__all__'
-    ordering = ['first_name', 'last_name', 'username', 'college_name']
+    # ?ordering= key -> full ordering. Each ends in a unique column and has a
+    # matching index (see CustomUser.Meta); username is unique, so the old
+    # trailing college_name never changed the order.
+    orderings = {
+        'first_name': ('first_name', 'last_name', 'username'),
+        'last_name': ('last_name', 'first_name', 'username'),
+        'username': ('username',),
+        'email': ('email',),
+        'date_joined': ('date_joined', 'id'),
+    }
+    ordering_fields = list(orderings)
+    ordering = ['first_name', 'last_name', 'username']
+    selected_fields = None  # set per request by get_queryset
+
+    def get_serializer(self, *args, **kwargs):
+        kwargs.setdefault('fields', self.selected_fields)
+        return super().get_serializer(*args, **kwargs)
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            if 'cursor' in self.request.query_params:
+                self._paginator = AlumniCursorPagination()
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
 
     def get_queryset(self):
-        queryset = super().get_queryset()
+        """
+        Every user but the caller. ``?view=card|list|full`` or ``?fields=``
+        narrows both the output and the columns loaded.
+        """
+        self.selected_fields = UserSerializer.fields_from_request(self.request)
+        # Keyset pages read the sort key back from each row.
+        sort_fields = {field for ordering in self.orderings.values() for field in ordering}
+        queryset = UserSerializer.project(super().get_queryset(), self.selected_fields, extra=sort_fields)
         queryset = queryset.exclude(id=self.request.user.id)
         return queryset
+
+
+class MemberSearchPagination(KeysetPagination):
+    ordering = ('-rank', 'id')
+
+    def is_legacy_request(self, request):
+        return False
+
+
+class MemberSearchView(ListAPIView):
+    """
+    Ranked full-text search over members' names, work, skills and places.
+
+    ``?q=`` takes web search syntax (words, "phrases", or, -word). Accepts
+    the same filters as ``AlumniAdminFilterView`` and ``?view=``/``?fields=``
+    (default ``list``). Results are keyset-paginated, best match first.
+
+    Returns:
+        ``{"results", "next"}``
+    """
+    serializer_class = UserSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = MemberSearchPagination
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = AlumniAdminFilter
+
+    def get_queryset(self):
+        text = self.request.query_params.get('q', '').strip()
+        if not text:
+            raise ValidationError({"error": "q is required."})
+        if not search.is_supported():
+            raise ValidationError({"error": "Member search is not available on this database."})
+        self.selected_fields = UserSerializer.fields_from_request(self.request, default_view='list')
+        queryset = UserSerializer.project(User.objects.exclude(id=self.request.user.id), self.selected_fields)
+        return search.search_members(queryset, text)
+
+    def get_serializer(self, *args, **kwargs):
+        kwargs.setdefault('fields', getattr(self, 'selected_fields', None))
+        return super().get_serializer(*args, **kwargs)
+
+
 #####################################
 #           EVENT VIEWS             #
 #####################################
@@ -880,8 +1106,18 @@ class EventView(APIView):
     permission_classes = [permissions.AllowAny]
     
     def get(self, request):
-        """Get all events, ordered by upload date."""
+        """
+        Get events, newest first.
+
+        Returns:
+            A page ``{"results", "next"}`` when ``?cursor=`` or
+            ``?page_size=`` is given, else every event (compatibility mode)
+        """
         events = Events.objects.all().order_by('-uploaded_on')
+        paginator = KeysetPagination(('-uploaded_on', '-id'))
+        page = paginator.paginate_queryset(events, request)
+        if page is not None:
+            return paginator.get_paginated_response(EventSerializer(page, many=True).data)
         serializer = EventSerializer(events, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
         
@@ -985,8 +1221,18 @@ class JobListCreateView(APIView):
     parser_classes = (MultiPartParser, FormParser)
     
     def get(self, request):
-        """Get all jobs, ordered by post date."""
+        """
+        Get jobs, newest first.
+
+        Returns:
+            A page ``{"results", "next"}`` when ``?cursor=`` or
+            ``?page_size=`` is given, else every job (compatibility mode)
+        """
         jobs = Jobs.objects.all().order_by('-posted_on')
+        paginator = KeysetPagination(('-posted_on', '-id'))
+        page = paginator.paginate_queryset(jobs, request)
+        if page is not None:
+            return paginator.get_paginated_response(JobsSerializer(page, many=True).data)
         serializer = JobsSerializer(jobs, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
         
@@ -1264,8 +1510,18 @@ class AlbumDetailView(APIView):
     parser_classes = (MultiPartParser, FormParser)
     
     def get(self, request):
-        """Get all albums, ordered by ID (most recent first)."""
+        """
+        Get albums, most recent first.
+
+        Returns:
+            A page ``{"results", "next"}`` when ``?cursor=`` or
+            ``?page_size=`` is given, else every album (compatibility mode)
+        """
         albums = Album.objects.all().order_by("-id")
+        paginator = KeysetPagination(("-id",))
+        page = paginator.paginate_queryset(albums, request)
+        if page is not None:
+            return paginator.get_paginated_response(AlbumSerializer(page, many=True).data)
         serializer = AlbumSerializer(albums, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
     
@@ -1439,10 +1695,14 @@ class HomePageDataView(APIView):
         - Chapter information
         - Featured news
         
+        ``?view=card|list|full`` or ``?fields=`` narrows the members and
+        batch mates.
+
         Returns:
             Aggregated data for home page display
         """
         now = timezone.now()
+        user_fields = UserSerializer.fields_from_request(request)
         today = now.date()
         
         # Upcoming Events
@@ -1454,18 +1714,19 @@ class HomePageDataView(APIView):
         album_images_serializer = AlbumSerializer(latest_album_images, many=True)
         
         # Latest Members
-        users_with_photos = User.objects.filter(profile_photo__isnull=False).exclude(profile_photo='').order_by('-id')[:3]
+        users_with_photos = UserSerializer.project(User.objects.filter(profile_photo__isnull=False), user_fields)
+        users_with_photos = users_with_photos.exclude(profile_photo='').order_by('-id')[:3]
         # latest_members = list(users_with_photos)
-        members_serializer = UserSerializer(users_with_photos, many=True)
+        members_serializer = UserSerializer(users_with_photos, many=True, fields=user_fields)
         batch_mates_serializer = None
         if request.user.is_authenticated:
         # Batch Mates - Get users from same passed_out_year as current user
             batch_mates = []
             if request.user.passed_out_year:
-                batch_mates = User.objects.filter(
+                batch_mates = UserSerializer.project(User.objects.filter(
                     passed_out_year=request.user.passed_out_year
-                ).exclude(id=request.user.id).order_by('first_name')[:10]
-            batch_mates_serializer = UserSerializer(batch_mates, many=True)
+                ), user_fields).exclude(id=request.user.id).order_by('first_name')[:10]
+            batch_mates_serializer = UserSerializer(batch_mates, many=True, fields=user_fields)
             
         batch_mates_data = batch_mates_serializer.data if batch_mates_serializer else []
         # Chapters - Get all unique chapters and count of users in each
@@ -1499,13 +1760,30 @@ class MyPostsView(APIView):
     permission_classes = [permissions.IsAuthenticated]
     
     def get(self, request):
-        """Get all jobs and events created by the authenticated user."""
-        # Get user's jobs
+        """
+        Get the jobs and events created by the authenticated user.
+
+        The two lists page independently, through ``?jobs_cursor=`` and
+        ``?events_cursor=``; ``?page_size=`` applies to both.
+
+        Returns:
+            ``{"jobs", "events"}``, each a page ``{"results", "next"}`` when
+            paginating, else two full lists (compatibility mode)
+        """
         jobs = Jobs.objects.filter(user=request.user).order_by('-posted_on')
-        jobs_serializer = JobsSerializer(jobs, many=True)
-        
-        # Get user's events
         events = Events.objects.filter(user=request.user).order_by('-uploaded_on')
+
+        jobs_paginator = KeysetPagination(('-posted_on', '-id'), cursor_query_param='jobs_cursor')
+        events_paginator = KeysetPagination(('-uploaded_on', '-id'), cursor_query_param='events_cursor')
+        if not (jobs_paginator.is_legacy_request(request) and events_paginator.is_legacy_request(request)):
+            job_page = jobs_paginator.get_page(jobs, request)
+            event_page = events_paginator.get_page(events, request)
+            return Response({
+                "jobs": {"results": JobsSerializer(job_page, many=True).data, "next": jobs_paginator.next_cursor},
+                "events": {"results": EventSerializer(event_page, many=True).data, "next": events_paginator.next_cursor},
+            }, status=status.HTTP_200_OK)
+
+        jobs_serializer = JobsSerializer(jobs, many=True)
         events_serializer = EventSerializer(events, many=True)
         
         # Return combined data
@@ -1523,129 +1801,28 @@ class ImportMembersAPIView(APIView):
         Import registered members from members.csv into the CustomUser model.
         
         Uses email as username and date of birth as password. Maps all available 
-        fields from the CSV to the CustomUser model.
+        fields from the CSV to the CustomUser model. Existing users (matched by
+        email) are updated; their password is only reset when the date of
+        birth changed. Rows identical to the last sync are not written.
         
         Returns:
             Statistics about the import operation
         """
-        User = get_user_model()
         csv_path = os.path.join(settings.BASE_DIR, 'members.csv')
-        created, updated, skipped = [], [], []
-        
-        with open(csv_path, newline='', encoding='utf-8') as csvfile:
-            reader = csv.DictReader(csvfile)
-            for row in reader:
-                # Extract core data
-                email = row.get('email_id', '').strip().lower()
-                if not email:
-                    skipped.append("No email in row")
-                    continue
-                
-                username = email
-                dob = row.get('Date of Birth', '').strip()
-                password = dob if dob else 'defaultpassword'
-                
-                # Prepare user data mapping
-                user_data = {
-                    "username": username,
-                    "email": email,
-                    "salutation": row.get('Salutation', '').strip(),
-                    "first_name": row.get('Name', '').strip(),
-                    "gender": row.get('Gender', '').strip(),
-                    "date_of_birth": row.get('Date of Birth', '').strip() or None,
-                    "label": row.get('Label', '').strip(),
-                    "secondary_email": row.get('Secondary Email', '').strip(),
-                    "registered": row.get('Registered', '').strip(),
-                    "registered_on": row.get('Registered On', '').strip(),
-                    "approved_on": row.get('Approved On', '').strip(),
-                    "profile_updated_on": row.get('Profile Updated On', '').strip(),
-                    "profile_type": row.get('Profile Type', '').strip(),
-                    "roll_no": row.get('Roll No', '').strip(),
-                    "institution_name": row.get('Institution Name', '').strip(),
-                    "course": row.get('Course', '').strip(),
-                    "stream": row.get('Stream', '').strip(),
-                    "course_start_year": row.get('Course Start Year', '').strip(),
-                    "course_end_year": row.get('Course End Year', '').strip(),
-                    "employee_id": row.get('Employee ID', '').strip(),
-                    "faculty_job_title": row.get('Faculty: Job Title', '').strip(),
-                    "faculty_institute": row.get('Faculty: Institute', '').strip(),
-                    "faculty_department": row.get('Faculty: Department', '').strip(),
-                    "faculty_start_year": row.get('Faculty: Start Year', '').strip(),
-                    "faculty_start_month": row.get('Faculty: Start Month', '').strip(),
-                    "faculty_end_year": row.get('Faculty: End Year', '').strip(),
-                    "faculty_end_month": row.get('Faculty: End Month', '').strip(),
-                    "mobile_phone_no": row.get('Mobile Phone No.', '').strip(),
-                    "home_phone_no": row.get('Home Phone No.', '').strip(),
-                    "office_phone_no": row.get('Office Phone No.', '').strip(),
-                    "current_location": row.get('Current Location', '').strip(),
-                    "home_town": row.get('Home Town', '').strip(),
-                    "correspondence_address": row.get('Correspondence Address', '').strip(),
-                    "correspondence_city": row.get('Correspondence City', '').strip(),
-                    "correspondence_state": row.get('Correspondence State', '').strip(),
-                    "correspondence_country": row.get('Correspondence Country', '').strip(),
-                    "correspondence_pincode": row.get('Correspondence Pincode', '').strip(),
-                    "company": row.get('Company', '').strip(),
-                    "position": row.get('Position', '').strip(),
-                    "member_roles": row.get('Member Roles', '').strip(),
-                    "educational_course": row.get('Educational Course', '').strip(),
-                    "educational_institute": row.get('Educational Institute', '').strip(),
-                    "start_year": row.get('Start Year', '').strip(),
-                    "end_year": row.get('End Year', '').strip(),
-                    "facebook_link": row.get('Facebook Link', '').strip(),
-                    "linkedin_link": row.get('LinkedIn Link', '').strip(),
-                    "website_link": row.get('Website Link', '').strip(),
-                    "work_experience": float(row.get('Work Experience(in years)', '0').strip() or 0),
-                    "chapter": row.get('chapter', '').strip(),
-                }
-                
-                # Process JSON fields
-                for field, csv_field in [
-                    ('professional_skills', 'Professional Skills'),
-                    ('industries_worked_in', 'Industries Worked In'),
-                    ('roles_played', 'Roles Played')
-                ]:
-                    val = row.get(csv_field, '').strip()
-                    user_data[field] = [v.strip() for v in val.split(',')] if val else []
-
-                # Social links as JSON
-                user_data['social_links'] = {
-                    "Facebook": row.get('Facebook Link', '').strip(),
-                    "LinkedIn": row.get('LinkedIn Link', '').strip(),
-                    "Twitter": row.get('Twitter Link', '').strip(),
-                    "Website": row.get('Website Link', '').strip(),
-                }
-
-                # Set role and is_staff for faculty
-                profile_type = row.get('Profile Type', '').strip().lower()
-                label = row.get('Label', '').strip().lower()
-                if profile_type == 'faculty' or label == 'faculty':
-                    user_data['role'] = 'Staff'
-                    user_data['is_staff'] = True
-
-                try:
-                    # Update existing user
-                    user = User.objects.get(email=email)
-                    for k, v in user_data.items():
-                        setattr(user, k, v)
-                    if password:
-                        user.set_password(password)
-                    user.save()
-                    updated.append(email)
-                except User.DoesNotExist:
-                    # Create new user
-                    user = User(**user_data)
-                    user.set_password(password)
-                    user.save()
-                    created.append(email)
-                except Exception as e:
-                    skipped.append(f"{email} ({str(e)})")
+        # Chunked upsert by email; see api.importers.sync_members.
+        created, updated, skipped, unchanged, missing = importers.sync_members(csv_path)
 
         # Return import statistics
         return Response({
             "created": created,
             "updated": updated,
             "skipped": skipped,
-            "message": f"{len(created)} users created, {len(updated)} updated, {len(skipped)} skipped."
+            "unchanged_count": unchanged,
+            "missing_count": missing,
+            "message": (
+                f"{len(created)} users created, {len(updated)} updated, {unchanged} unchanged, "
+                f"{len(skipped)} skipped, {missing} missing from the file."
+            )
         }, status=status.HTTP_201_CREATED)
 
 
@@ -1653,14 +1830,29 @@ class ImportMembersAPIView(APIView):
 #       USER LOCATION VIEWS         #
 #####################################
 
+class UserLocationPagination(KeysetPagination):
+    ordering = ('id',)
+
+
 class UserLocationListCreateAPIView(generics.ListCreateAPIView):
     """View for listing and creating user location entries."""
     serializer_class = UserLocationSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = UserLocationPagination
     
     def get_queryset(self):
-        """Get all user locations."""
-        return user_location.objects.all()
+        """
+        Get all user locations. ``?view=card|list|full`` or ``?fields=``
+        narrows the nested ``user_details`` and the user columns loaded.
+        """
+        fields = UserSerializer.fields_from_request(self.request)
+        users = UserSerializer.project(User.objects.all(), fields)
+        return user_location.objects.order_by('id').prefetch_related(models.Prefetch('user', queryset=users))
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['user_fields'] = UserSerializer.fields_from_request(self.request)
+        return context
     
     def perform_create(self, serializer):
         """Save the current user as the owner of the location."""
@@ -1684,20 +1876,17 @@ class UserLocationsearchAPIView(generics.ListAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        """Search for locations by user name."""
-        name = self.request.query_params.get("name", "")
+        """Search for locations by user name, best fuzzy match first."""
+        name = self.request.query_params.get("name", "").strip()
         if name:
-            return user_location.objects.filter(
-                Q(user__first_name__icontains=name) |
-                Q(user__last_name__icontains=name) |
-                Q(user__username__icontains=name)
-            )
+            fields = [f"user__{field}" for field in search.NAME_FIELDS]
+            return search.fuzzy_search(user_location.objects.all(), name, fields=fields)
         return user_location.objects.none()
 
     def list(self, _request, *_args, **_kwargs):
         """Return user locations as simple values."""
         queryset = self.get_queryset()
-        results = list(queryset.values())
+        results = list(queryset.values(*(field.attname for field in user_location._meta.concrete_fields)))
         return Response(results, status=status.HTTP_200_OK)
 
 
@@ -1711,8 +1900,18 @@ class BusinessDirectoryListCreateView(APIView):
     parser_classes = (MultiPartParser, FormParser)
     
     def get(self, request):
-        """List all active businesses."""
+        """
+        List active businesses, newest first.
+
+        Returns:
+            A page ``{"results", "next"}`` when ``?cursor=`` or
+            ``?page_size=`` is given, else every business (compatibility mode)
+        """
         businesses = BusinessDirectory.objects.filter(is_active=True).order_by('-created_at')
+        paginator = KeysetPagination(('-created_at', '-id'))
+        page = paginator.paginate_queryset(businesses, request)
+        if page is not None:
+            return paginator.get_paginated_response(BusinessDirectorySerializer(page, many=True).data)
         serializer = BusinessDirectorySerializer(businesses, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
     
@@ -1959,7 +2158,14 @@ class NewsRoomListCreateView(APIView):
     parser_classes = (MultiPartParser, FormParser)
     
     def get(self, request):
-        """List all published news articles, optionally filtered by category"""
+        """
+        List published news articles, newest first, optionally filtered by
+        category.
+
+        Returns:
+            A page ``{"results", "next"}`` when ``?cursor=`` or
+            ``?page_size=`` is given, else every article (compatibility mode)
+        """
         queryset = NewsRoom.objects.filter(status='published')
         
         # Filter by category if specified
@@ -1971,7 +2177,11 @@ class NewsRoomListCreateView(APIView):
         featured = request.query_params.get('featured')
         if featured and featured.lower() == 'true':
             queryset = queryset.filter(featured=True)
-        
+
+        paginator = KeysetPagination(('-published_on', '-id'))
+        page = paginator.paginate_queryset(queryset, request)
+        if page is not None:
+            return paginator.get_paginated_response(NewsRoomSerializer(page, many=True).data)
         serializer = NewsRoomSerializer(queryset, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)   
     def post(self, request):
@@ -2120,24 +2330,28 @@ class NewsCategoriesView(APIView):
 class UserBulkImportView(APIView):
     """
     POST: Import users from Excel/CSV file and set their password to their date of birth.
+
+    Admins only: a re-upload rewrites the profiles of users an earlier upload created.
     """
-    permission_classes = [permissions.AllowAny]
-    permission_classes = [permissions.AllowAny]
+    permission_classes = [IsAdminUser]
     parser_classes = (MultiPartParser, FormParser)
 
     def post(self, request):
-        import pandas as pd
-        from datetime import datetime
+        """
+        Stream the sheet in batches (``api.ingest``) through the columnar engine in ``api.importers``.
 
-    def post(self, request):
-        import pandas as pd
-        from datetime import datetime
-        User = get_user_model()
+        Returns:
+            - success_count: Number of users created
+            - updated_count: Users created by an earlier upload whose row changed
+            - unchanged_count: Rows identical to the last upload (not written)
+            - missing_count: Previously imported rows absent from this sheet
+            - total_rows: Number of rows in the sheet
+            - errors: One "Row N: ..." message per rejected row
+        """
         file_obj = request.FILES.get('file')
         if not file_obj:
             return Response({"error": "No file provided."}, status=status.HTTP_400_BAD_REQUEST)
 
-
         file_extension = file_obj.name.split('.')[-1].lower()
         if file_extension not in ['xlsx', 'xls', 'csv']:
             return Response(
@@ -2145,121 +2359,206 @@ class UserBulkImportView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-
         try:
-            if file_extension in ['xlsx', 'xls']:
-                df = pd.read_excel(file_obj)
-            else:
-                df = pd.read_csv(file_obj)
-
-            expected_columns = [
-                'username', 'email', 'first_name', 'last_name', 'salutation', 'gender', 'date_of_birth',
-                'current_work', 'Roles Played', 'experience', 'chapter', 'college_name', 'phone', 'Address',
-                'city', 'State', 'Country', 'zip_code', 'role', 'Course End Year', 'worked_In'
-            ]
-
-            expected_columns = [
-                'username', 'email', 'first_name', 'last_name', 'salutation', 'gender', 'date_of_birth',
-                'current_work', 'Roles Played', 'experience', 'chapter', 'college_name', 'phone', 'Address',
-                'city', 'State', 'Country', 'zip_code', 'role', 'Course End Year', 'worked_In'
-            ]
-            missing_columns = [col for col in expected_columns if col not in df.columns]
+            missing_columns = importers.missing_columns(ingest.read_header(file_obj, file_extension))
             if missing_columns:
                 return Response(
                     {"error": f"Missing required columns: {', '.join(missing_columns)}"},
                     status=status.HTTP_400_BAD_REQUEST
                 )
 
-            success_count = 0
-            error_details = []
-
-            for idx, row in df.iterrows():
-                try:
-                    email = str(row['email']).strip().lower() if pd.notna(row['email']) else None
-                    if not email or '@' not in email:
-                        error_details.append(f"Row {idx+1}: Invalid or missing email")
-                        continue
-
-                    username = str(row['username']).strip() if pd.notna(row['username']) else email.split('@')[0]
-                    first_name = str(row['first_name']).strip() if pd.notna(row['first_name']) else ""
-                    last_name = str(row['last_name']).strip() if pd.notna(row['last_name']) else ""
-                    salutation = str(row['salutation']).strip() if pd.notna(row['salutation']) else ""
-                    gender = str(row['gender']).strip() if pd.notna(row['gender']) else ""
-                    date_of_birth = row['date_of_birth'] if pd.notna(row['date_of_birth']) else None
-
-                    # Parse date_of_birth and set as password
-                    if date_of_birth:
-                        try:
-                            if isinstance(date_of_birth, str):
-                                try:
-                                    dob_date = datetime.strptime(date_of_birth, "%m/%d/%Y")
-                                except ValueError:
-                                    dob_date = datetime.strptime(date_of_birth, "%m/%d/%y")
-                            else:
-                                dob_date = pd.to_datetime(date_of_birth)
-                            password = dob_date.strftime("%Y%m%d")
-                            dob_formatted = dob_date.strftime("%Y-%m-%d")
-                        except Exception:
-                            error_details.append(f"Row {idx+1}: Invalid date_of_birth format: {date_of_birth}")
-                            continue
-                    else:
-                        password = "defaultpassword123"
-                        dob_formatted = None
-
-                    if User.objects.filter(email=email).exists():
-                        error_details.append(f"Row {idx+1}: Email '{email}' already exists")
-                        continue
-
-                    role = str(row['role']).strip() if pd.notna(row['role']) else ""
-                    is_staff = True if role.lower() == "staff" else False
-
-                    # Map fields
-                    user_data = {
-                        'username': username,
-                        'email': email,
-                        'first_name': first_name,
-                        'last_name': last_name,
-                        'last_name': last_name,
-                        'salutation': salutation,
-                        'gender': gender,
-                        'date_of_birth': dob_formatted,
-                        'current_work': str(row['current_work']).strip() if pd.notna(row['current_work']) else "",
-                        'roles_played': [r.strip() for r in str(row['Roles Played']).split(',')] if pd.notna(row['Roles Played']) and row['Roles Played'] else [],
-                        'experience': float(row['experience']) if pd.notna(row['experience']) else 0,
-                        'chapter': str(row['chapter']).strip() if pd.notna(row['chapter']) else "",
-                        'college_name': str(row['college_name']).strip() if pd.notna(row['college_name']) else "",
-                        'phone': str(row['phone']).strip() if pd.notna(row['phone']) else "",
-                        'Address': str(row['Address']).strip() if pd.notna(row['Address']) else "",
-                        'city': str(row['city']).strip() if pd.notna(row['city']) else "",
-                        'state': str(row['State']).strip() if pd.notna(row['State']) else "",
-                        'country': str(row['Country']).strip() if pd.notna(row['Country']) else "",
-                        'zip_code': str(row['zip_code']).strip() if pd.notna(row['zip_code']) else "",
-                        'role': role,
-                        'course_end_year': str(row['Course End Year']).strip() if pd.notna(row['Course End Year']) else "",
-                        'Worked_in': [w.strip() for w in str(row['worked_In']).split(',')] if pd.notna(row['worked_In']) and row['worked_In'] else [],
-                        'is_staff': is_staff,
-                    }
-
-                    User.objects.create_user(
-                        **user_data,
-                        password=password,
-                    )
-                    success_count += 1
-                    print(f"Uploaded user {success_count}: {username}")  # <-- Print to terminal
-                except Exception as e:
-                    error_details.append(f"Row {idx+1}: {str(e)}")
+            summary = importers.import_users(
+                ingest.iter_batches(file_obj, file_extension, importers.get_setting("CHUNK_SIZE"))
+            )
 
             response_data = {
-                "success_count": success_count,
-                "total_rows": len(df),
-                "errors": error_details
+                "success_count": summary["created"],
+                "updated_count": summary["updated"],
+                "unchanged_count": summary["unchanged"],
+                "missing_count": summary["missing"],
+                "total_rows": summary["total_rows"],
+                "errors": summary["errors"]
             }
-            if success_count > 0:
+            if summary["created"] > 0:
                 return Response(response_data, status=status.HTTP_201_CREATED)
+            elif summary["updated"] or summary["unchanged"]:
+                return Response(response_data, status=status.HTTP_200_OK)
             else:
                 return Response(response_data, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
             return Response(
                 {"error": f"Failed to process file: {str(e)}"},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
\ No newline at end of file
+            )
+
+class ProfilePhotoBulkImportView(APIView):
+    """View for setting many profile photos from one zip archive."""
+    permission_classes = [IsAdminUser]
+    parser_classes = (MultiPartParser, FormParser)
+
+    def post(self, request):
+        """
+        Match each archive entry to a user by file name (``<email>.jpg`` or
+        ``<roll_no>.png``), resize it and store it as the user's profile photo.
+
+        Returns:
+            - updated: Users given a new photo
+            - unmatched: Entries naming no known email or roll number
+            - ambiguous: Entries whose roll number belongs to several users
+            - skipped / failed: Entries that are not images or could not be decoded
+        """
+        file_obj = request.FILES.get('file')
+        if not file_obj:
+            return Response({"error": "No file provided."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            report = photos.import_photos(file_obj)
+        except zipfile.BadZipFile:
+            return Response({"error": "Invalid file format. Only zip archives are accepted."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        return Response(report, status=status.HTTP_200_OK)
+
+
+class ImportJobListCreateView(APIView):
+    """View for queueing background imports and listing recent ones."""
+    permission_classes = [IsAdminUser]
+    parser_classes = (MultiPartParser, FormParser)
+
+    def get(self, request):
+        """List the 50 most recent import jobs with their progress."""
+        jobs = ImportJob.objects.order_by('-created_at', '-id')[:50]
+        return Response([import_jobs.progress(job) for job in jobs], status=status.HTTP_200_OK)
+
+    def post(self, request):
+        """
+        Store the upload and queue it for ``manage.py run_import_jobs``.
+
+        Form fields:
+            - kind: "users" (same sheet as users/bulk-import) or "members"
+              (members.csv layout; defaults to the server's members.csv)
+            - file: the sheet
+
+        Returns:
+            202 with the job id and its status URL
+        """
+        kind = request.data.get('kind', ImportJob.KIND_USERS)
+        if kind not in dict(ImportJob.KIND_CHOICES):
+            return Response({"error": "kind must be 'users' or 'members'."}, status=status.HTTP_400_BAD_REQUEST)
+
+        file_obj = request.FILES.get('file')
+        if file_obj is None and kind == ImportJob.KIND_MEMBERS:
+            csv_path = os.path.join(settings.BASE_DIR, 'members.csv')
+            if os.path.exists(csv_path):
+                with open(csv_path, 'rb') as fh:
+                    file_obj = ContentFile(fh.read(), name='members.csv')
+        if file_obj is None:
+            return Response({"error": "No file provided."}, status=status.HTTP_400_BAD_REQUEST)
+
+        allowed = ['xlsx', 'xls', 'csv'] if kind == ImportJob.KIND_USERS else ['csv']
+        if file_obj.name.split('.')[-1].lower() not in allowed:
+            return Response(
+                {"error": f"Invalid file format. Accepted: {', '.join(allowed)}."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        job = import_jobs.create_job(kind, file_obj, request.user)
+        return Response({
+            "job_id": job.pk,
+            "status": job.status,
+            "status_url": request.build_absolute_uri(f"/import-jobs/{job.pk}/"),
+        }, status=status.HTTP_202_ACCEPTED)
+
+
+class ImportJobDetailView(APIView):
+    """View for polling one background import."""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, pk):
+        """
+        Returns:
+            Rows done, counts, errors so far and rows/second for the current run
+        """
+        try:
+            job = ImportJob.objects.get(pk=pk)
+        except ImportJob.DoesNotExist:
+            return Response({"error": "Import job not found"}, status=status.HTTP_404_NOT_FOUND)
+        return Response(import_jobs.progress(job), status=status.HTTP_200_OK)
+
+
+class DuplicateCandidateQueueView(APIView):
+    """View for the duplicate-member review queue filled by find_duplicate_members."""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        """
+        List candidate pairs, most likely duplicates first.
+
+        Filters: ``status`` (default ``pending``) and ``min_score``. Pass
+        ``next`` back as ``?cursor=`` for the following page.
+
+        Returns:
+            ``{"results": [...], "next": cursor or null}``, each result holding
+            both users, the score and the reasons behind it
+        """
+        page_size = get_page_size(request)
+        params = request.query_params
+        state = params.get("status", DuplicateCandidate.STATUS_PENDING)
+        if state not in dict(DuplicateCandidate.STATUS_CHOICES):
+            return Response({"error": "Invalid status."}, status=status.HTTP_400_BAD_REQUEST)
+        candidates = DuplicateCandidate.objects.filter(status=state)
+
+        if params.get("min_score"):
+            try:
+                candidates = candidates.filter(score__gte=float(params["min_score"]))
+            except ValueError:
+                return Response({"error": "Invalid min_score."}, status=status.HTTP_400_BAD_REQUEST)
+
+        if "cursor" in params:
+            try:
+                score, last_id = decode_cursor(params["cursor"])
+                score, last_id = float(score), int(last_id)
+            except (InvalidCursor, TypeError, ValueError):
+                return Response({"error": "Invalid cursor."}, status=status.HTTP_400_BAD_REQUEST)
+            candidates = candidates.filter(Q(score__lte=score) & (Q(score__lt=score) | Q(id__gt=last_id)))
+
+        rows = list(candidates.select_related('user_a', 'user_b').order_by('-score', 'id')[:page_size])
+        next_cursor = None
+        if len(rows) == page_size:
+            next_cursor = encode_cursor([rows[-1].score, rows[-1].id])
+        return Response({
+            "results": DuplicateCandidateSerializer(rows, many=True).data,
+            "next": next_cursor,
+        }, status=status.HTTP_200_OK)
+
+
+class DuplicateCandidateDetailView(APIView):
+    """View for reviewing one candidate pair."""
+    permission_classes = [IsAdminUser]
+
+    def get_object(self, pk):
+        try:
+            return DuplicateCandidate.objects.select_related('user_a', 'user_b').get(pk=pk)
+        except DuplicateCandidate.DoesNotExist:
+            raise Http404
+
+    def get(self, request, pk):
+        candidate = self.get_object(pk)
+        return Response(DuplicateCandidateSerializer(candidate).data, status=status.HTTP_200_OK)
+
+    def patch(self, request, pk):
+        """
+        Record a decision: ``{"status": "confirmed" | "dismissed" | "pending"}``.
+
+        Decided pairs are kept by later runs of find_duplicate_members, so a
+        dismissed pair does not come back. Merging the accounts is left to
+        the admin.
+        """
+        candidate = self.get_object(pk)
+        decision = request.data.get("status")
+        if decision not in dict(DuplicateCandidate.STATUS_CHOICES):
+            return Response({"error": "status must be 'confirmed', 'dismissed' or 'pending'"},
+                            status=status.HTTP_400_BAD_REQUEST)
+        candidate.status = decision
+        candidate.reviewed_by = request.user if decision != DuplicateCandidate.STATUS_PENDING else None
+        candidate.reviewed_at = timezone.now() if decision != DuplicateCandidate.STATUS_PENDING else None
+        candidate.save(update_fields=['status', 'reviewed_by', 'reviewed_at', 'updated_at'])
+        return Response(DuplicateCandidateSerializer(candidate).data, status=status.HTTP_200_OK)
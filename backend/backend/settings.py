@@ -41,6 +41,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'api',
     'chat',
     'corsheaders',
@@ -58,7 +59,7 @@ APPEND_SLASH=False
 
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',  # should be at the top
-    'django_user_agents.middleware.UserAgentMiddleware',
+    'api.middleware.UserAgentMiddleware',  # lazy, memoized request.user_agent
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -73,7 +74,94 @@ REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'api.authentication.CustomTokenAuthentication',
     ],
+    'DEFAULT_THROTTLE_RATES': {
+        'signup_otp_email': '5/hour',   # codes mailed to one address
+        'signup_otp_ip': '30/hour',     # codes requested by one client
+    },
+}
+
+# Two-tier token -> user cache used by CustomTokenAuthentication and the chat
+# socket middleware. LOCAL_TTL bounds how long another worker may serve a
+# token after logout, so keep it short.
+AUTH_TOKEN_CACHE = {
+    'CACHE_ALIAS': 'default',
+    'LOCAL_MAXSIZE': 4096,
+    'LOCAL_TTL': 30,     # seconds, per-process LRU
+    'SHARED_TTL': 300,   # seconds, shared Django cache
+    'GENERATION_TTL': 86400,  # seconds; keep well above SHARED_TTL
+}
+
+# Opt-in stateless tokens (send token_type=signed to a login endpoint).
+# They are verified without a database hit and revoked by bumping
+# CustomUser.token_generation, whose current value is read from the cache.
+SIGNED_AUTH_TOKENS = {
+    'ENABLED': True,
+    'MAX_AGE': 60 * 60 * 24 * 30,   # seconds
+    'CACHE_ALIAS': 'default',
+    'GENERATION_TTL': 300,          # seconds a cached revocation counter is trusted
+}
+
+# Per-process LRU of parsed User-Agent headers (see api.user_agents).
+USER_AGENT_CACHE = {
+    'MAXSIZE': 512,
+    'MAX_LENGTH': 1024,  # longer headers are parsed without caching
+}
+
+# Signup OTPs live in the cache with a native TTL (see api.otp).
+SIGNUP_OTP = {
+    'CACHE_ALIAS': 'default',
+    'TTL': 30 * 60,       # seconds a code stays valid
+    'MAX_ATTEMPTS': 5,    # wrong guesses before the code is burned
+}
+
+# Background imports (see api.import_jobs). A running job whose heartbeat is
+# older than STALE_AFTER seconds is resumed by the next worker.
+IMPORT_JOBS = {
+    'STALE_AFTER': 30 * 60,
+    'MAX_STORED_ERRORS': 1000,
+    'MAX_RETRIES': 5,       # transient database errors requeue the job
+}
+
+# Bulk profile photos from a zip archive (see api.photos).
+PHOTO_IMPORT = {
+    'MAX_SIZE': 512,          # longest side of the stored JPEG, in pixels
+    'BATCH_SIZE': 64,         # entries matched and resized together
+    'WORKERS': None,          # None: one per available core
+}
 
+# Duplicate-member detection (see api.dedupe and find_duplicate_members).
+DEDUPE = {
+    'THRESHOLD': 0.8,         # minimum score for the review queue
+    'MAX_BLOCK_SIZE': 200,    # larger blocking groups are skipped
+}
+
+# Keyset pagination on list endpoints (see api.pagination). With COMPAT on, a
+# request without ?cursor= or ?page_size= still gets the full legacy list.
+LIST_PAGINATION = {
+    'COMPAT': True,
+    'PAGE_SIZE': 50,
+    'MAX_PAGE_SIZE': 200,
+}
+
+# Full-text member search (see api.search and rebuild_search_documents).
+MEMBER_SEARCH = {
+    'CONFIG': 'simple',       # text search configuration; 'simple' does not stem names
+    'FUZZY_LIMIT': 40,        # rows per contact / location lookup
+}
+
+# Process pool for bulk make_password calls (see api.hashing).
+PASSWORD_HASHING = {
+    'WORKERS': None,          # None: one per available core
+    'INLINE_THRESHOLD': 32,   # smaller batches are hashed in-process
+}
+
+# Write-behind buffer for LoginLog rows (see api.login_recorder). Set ENABLED
+# to False to write each event synchronously.
+LOGIN_LOG_BUFFER = {
+    'ENABLED': True,
+    'MAX_BATCH': 200,      # flush once this many events are buffered
+    'FLUSH_INTERVAL': 5,   # seconds; a timer flushes quieter periods
+    'MAX_BUFFER': 10000,   # hard cap if the database is unreachable
 }
 
 ROOT_URLCONF = 'backend.urls'
@@ -206,3 +294,40 @@ EMAIL_USE_TLS = True
 EMAIL_HOST_USER = os.getenv("EMAIL_HOST_USER", "sarweshwardeivasihamani@gmail.com")  
 EMAIL_HOST_PASSWORD = os.getenv("EMAIL_HOST_PASSWORD", "uppu upkj mkfx xhwu")  
 DEFAULT_FROM_EMAIL = EMAIL_HOST_USER
+
+# Requests only queue mail; `manage.py send_outbox` delivers it (see api.mail).
+# Point EMAIL_BACKEND at the locmem or filebased backend in tests and dev.
+EMAIL_OUTBOX = {
+    'BATCH_SIZE': 50,
+    'MAX_ATTEMPTS': 6,
+    'BACKOFF_BASE': 60,     # seconds before the first retry, doubled each time
+    'BACKOFF_MAX': 3600,
+    'CLAIM_TIMEOUT': 600,   # seconds a claimed batch is hidden from other workers
+    'RETENTION_DAYS': 30,   # `manage.py purge_outbox` deletes older finished rows
+}
+
+# Shared cache. Point REDIS_URL at the same Redis for every worker. It must be
+# shared: the token cache, signup codes and throttles rely on it, and
+# api.checks rejects a per-process backend. Without REDIS_URL the cache lives
+# in a database table (created by the api migrations), which api.checks only
+# accepts with DEBUG on. That table culls entries once MAX_ENTRIES is reached,
+# so it is sized well above what development needs.
+REDIS_URL = os.getenv("REDIS_URL")
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+            "LOCATION": "django_cache",
+            "OPTIONS": {
+                "MAX_ENTRIES": 100000,
+                "CULL_FREQUENCY": 10,   # cull a tenth of the entries when full
+            },
+        }
+    }
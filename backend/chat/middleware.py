@@ -2,16 +2,22 @@ import urllib.parse
 from channels.db import database_sync_to_async
 from channels.auth import AuthMiddlewareStack
 from django.contrib.auth.models import AnonymousUser
-from rest_framework.authtoken.models import Token
+from api import signed_tokens
+from api.authentication import resolve_signed_token
+from api.token_cache import token_cache
 
 def get_user_from_token_sync(token_key):
-    try:
-        token = Token.objects.get(key=token_key)
-        # Force evaluation of the user (e.g. access primary key)
-        _ = token.user.pk
-        return token.user
-    except Token.DoesNotExist:
+    if signed_tokens.is_signed(token_key):
+        try:
+            user, _ = resolve_signed_token(token_key)
+            return user
+        except signed_tokens.SignedTokenError:
+            return AnonymousUser()
+    # Shares the REST token cache, so reconnect storms rarely reach the database.
+    token = token_cache.get(token_key)
+    if token is None or not token.user.is_active:
         return AnonymousUser()
+    return token.user
 
 class TokenAuthMiddleware:
     """
@@ -33,4 +39,4 @@ class TokenAuthMiddleware:
 
 def TokenAuthMiddlewareStack(inner):
     # Wrap the inner app with AuthMiddlewareStack, then add TokenAuthMiddleware.
-    return TokenAuthMiddleware(AuthMiddlewareStack(inner))
\ No newline at end of file
+    return TokenAuthMiddleware(AuthMiddlewareStack(inner))
@@ -20,5 +20,11 @@ class Message(models.Model):
     content = models.TextField()
     timestamp = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # Room history is read oldest first, seeking on (timestamp, id).
+            models.Index(fields=['chat_room', 'timestamp', 'id'], name='message_room_ts_idx'),
+        ]
+
     def __str__(self):  # corrected __str__
         return f"Message from {self.sender.username}: {self.content[:20]}"
\ No newline at end of file
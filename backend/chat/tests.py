@@ -1,3 +1,91 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
 from django.test import TestCase
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from api import signed_tokens
+from api.token_cache import token_cache, user_cache
+
+from .middleware import get_user_from_token_sync
+from .models import ChatRoom, Message
+
+
+User = get_user_model()
+
+
+class TokenMiddlewareTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        token_cache.clear_local()
+        user_cache.clear_local()
+        self.addCleanup(token_cache.clear_local)
+        self.addCleanup(user_cache.clear_local)
+        self.user = User.objects.create_user("asha", "asha@example.com", "pw", role="Student")
+
+    def test_database_token(self):
+        token = Token.objects.create(user=self.user)
+        self.assertEqual(get_user_from_token_sync(token.key), self.user)
+
+    def test_unknown_or_deleted_token(self):
+        token = Token.objects.create(user=self.user)
+        key = token.key
+        get_user_from_token_sync(key)
+        token.delete()
+        self.assertIsInstance(get_user_from_token_sync(key), AnonymousUser)
+        self.assertIsInstance(get_user_from_token_sync("no-such-token"), AnonymousUser)
+
+    def test_inactive_user(self):
+        token = Token.objects.create(user=self.user)
+        self.user.is_active = False
+        self.user.save()
+        self.assertIsInstance(get_user_from_token_sync(token.key), AnonymousUser)
+
+    def test_signed_token_and_revocation(self):
+        key = signed_tokens.issue(self.user)
+        self.assertEqual(get_user_from_token_sync(key), self.user)
+        signed_tokens.revoke_all(self.user)
+        self.assertIsInstance(get_user_from_token_sync(key), AnonymousUser)
+
+
+class MessagePaginationTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("asha", "asha@example.com", "pw", role="Student")
+        other = User.objects.create_user("ravi", "ravi@example.com", "pw", role="Student")
+        self.room = ChatRoom.objects.create()
+        self.room.users.add(self.user, other)
+        for i in range(5):
+            Message.objects.create(chat_room=self.room, sender=self.user, content=f"message {i}")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = f"/chat/rooms/{self.room.id}/messages/"
+
+    def test_pages_are_oldest_first_and_do_not_overlap(self):
+        first = self.client.get(self.url, {"page_size": 3}).data
+        second = self.client.get(self.url, {"page_size": 3, "cursor": first["next"]}).data
+        contents = [message["text"] for message in first["results"] + second["results"]]
+        self.assertEqual(contents, [f"message {i}" for i in range(5)])
+        self.assertIsNone(second["next"])
+
+    def test_legacy_request_gets_the_whole_history(self):
+        self.assertEqual(len(self.client.get(self.url).data), 5)
+
+    def test_malformed_cursor_is_rejected(self):
+        self.assertEqual(self.client.get(self.url, {"cursor": "garbage"}).status_code, 400)
+
+
+class ContactSearchTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("asha", "asha@example.com", "pw", role="Student")
+        User.objects.create_user("ashwin", "ashwin@example.com", "pw", role="Student", first_name="Ashwin")
+        User.objects.create_user("ravi", "ravi@example.com", "pw", role="Student")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_matches_names_and_excludes_the_caller(self):
+        usernames = [user["username"] for user in self.client.get("/chat/search/", {"q": "ash"}).data]
+        self.assertEqual(usernames, ["ashwin"])
+
+    def test_requires_authentication(self):
+        self.assertEqual(APIClient().get("/chat/search/", {"q": "ash"}).status_code, 401)
@@ -2,7 +2,8 @@ from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 from django.contrib.auth import get_user_model
 from django.shortcuts import get_object_or_404
-from django.db.models import Q, Case, When, IntegerField
+from api import search
+from api.pagination import KeysetPagination
 from .models import ChatRoom, Message
 from .serializers import ChatRoomSerializer, MessageSerializer, UserSerializer
 
@@ -69,13 +70,20 @@ class ChatRoomListCreateAPIView(generics.ListCreateAPIView):
         return Response({"detail": "Chat room deleted successfully."},
                         status=status.HTTP_200_OK)
 
+class MessagePagination(KeysetPagination):
+    # Oldest first, as the room history is displayed.
+    ordering = ("timestamp", "id")
+
+
 class MessageListCreateAPIView(generics.ListCreateAPIView):
     """
-    GET: List messages for a specific chat room.
+    GET: List messages for a specific chat room, oldest first. Pages with
+    ?cursor= / ?page_size=; without either, returns the whole history.
     POST: Create a new message in a specific chat room.
     """
     serializer_class = MessageSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = MessagePagination
 
     def get_queryset(self):
         room_id = self.kwargs.get("room_id")
@@ -92,6 +100,9 @@ class MessageListCreateAPIView(generics.ListCreateAPIView):
 
     def get(self, request, *args, **kwargs):
         queryset = self.get_queryset()
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(self.get_serializer(page, many=True).data)
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
 
@@ -127,31 +138,7 @@ class ContactSearchAPIView(generics.ListAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
+        """The best fuzzy name matches for ``?q=``, ranked, in one query."""
         query = self.request.query_params.get("q", "")
-        qs = User.objects.filter(
-            Q(username__icontains=query) |
-            Q(first_name__icontains=query) |
-            Q(last_name__icontains=query)
-        ).exclude(id=self.request.user.id)
-        if qs.count() > 40:
-            # Order by relevance: username match > first_name match > last_name match > id
-            qs = qs.annotate(
-                username_match=Case(
-                    When(username__iexact=query, then=1),
-                    default=0,
-                    output_field=IntegerField(),
-                ),
-                first_name_match=Case(
-                    When(first_name__iexact=query, then=1),
-                    default=0,
-                    output_field=IntegerField(),
-                ),
-                last_name_match=Case(
-                    When(last_name__iexact=query, then=1),
-                    default=0,
-                    output_field=IntegerField(),
-                ),
-            ).order_by(
-                '-username_match', '-first_name_match', '-last_name_match', 'id'
-            )[:40]
-        return qs
\ No newline at end of file
+        users = User.objects.exclude(id=self.request.user.id).only(*UserSerializer.Meta.fields)
+        return search.fuzzy_search(users, query)
\ No newline at end of file